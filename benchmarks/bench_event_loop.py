@@ -0,0 +1,54 @@
+"""
+Event loop responsiveness benchmark.
+Converts large help pages, as concurrent help tool calls do, while the loop lag monitor measures how long
+the event loop is blocked, with the transforms in the event loop and in the thread and process worker pools.
+
+Usage:
+    python -m benchmarks.bench_event_loop [--sections 3000] [--pages 4]
+"""
+import argparse
+import asyncio
+import time
+
+import tools.workers
+from benchmarks import fixtures
+from formatters.help import format_help_page
+from tools.instrumentation import metrics
+from tools.workers import monitor_loop_lag, offload, shutdown_workers
+
+
+async def convert_pages(html: str, pages: int) -> float:
+    monitor = asyncio.create_task(monitor_loop_lag(0.005))
+    start = time.perf_counter()
+    await asyncio.gather(*(offload(format_help_page, html, {"base_url": "https://help/page.html"}, size=len(html))
+                           for _ in range(pages)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.01)  # Last lag measurement
+    monitor.cancel()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_event_loop")
+    parser.add_argument("--sections", type=int, default=3000, help="Sections of each help page (default: 3000)")
+    parser.add_argument("--pages", type=int, default=4, help="Pages converted at the same time (default: 4)")
+    args = parser.parse_args()
+
+    html = fixtures.make_help_page("page", args.sections)
+    print(f"{args.pages} pages of {len(html) / 1024 / 1024:.1f} MB")
+    print(f"{'worker pool':<12} {'elapsed (ms)':>13} {'lag p99 (ms)':>13} {'lag max (ms)':>13}")
+    worker_pool = tools.workers.WORKER_POOL
+    try:
+        for kind in ("none", "thread", "process"):
+            tools.workers.WORKER_POOL = kind
+            metrics.reset()
+            elapsed = asyncio.run(convert_pages(html, args.pages))
+            lag = metrics.loop_lag.summary(scale=1000)
+            print(f"{kind:<12} {elapsed * 1000:>13.0f} {lag['p99']:>13.1f} {lag['max']:>13.1f}")
+            shutdown_workers()
+    finally:
+        tools.workers.WORKER_POOL = worker_pool
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Formatters benchmark.
+Measures every formatter over large fixtures, with the default (lax) and the strict validation.
+
+Usage:
+    python -m benchmarks.bench_formatters [--rows 10000] [--repeat 5]
+"""
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+import tools.utils
+from benchmarks import fixtures
+from formatters.account import format_accounts
+from formatters.execution import format_executions, format_executions_detailed, format_executions_status
+from formatters.project import format_projects
+from formatters.test import format_tests
+from formatters.user import format_users
+from formatters.workspace import format_workspaces, format_workspaces_detailed, format_workspaces_locations
+
+
+def formatter_cases(rows: int) -> List[Tuple[str, Callable, list, dict]]:
+    workspaces = fixtures.make_workspaces(rows)
+    return [
+        ("format_users", format_users, fixtures.make_users(rows), None),
+        ("format_accounts", format_accounts, fixtures.make_accounts(rows), None),
+        ("format_workspaces", format_workspaces, workspaces, None),
+        ("format_workspaces_detailed", format_workspaces_detailed, workspaces, None),
+        ("format_workspaces_locations", format_workspaces_locations,
+         fixtures.make_workspaces(1, locations=rows), {"purpose": "load"}),
+        ("format_projects", format_projects, fixtures.make_projects(rows), None),
+        ("format_tests", format_tests, fixtures.make_tests(rows), None),
+        ("format_executions", format_executions, fixtures.make_executions(rows), None),
+        ("format_executions_detailed", format_executions_detailed, fixtures.make_executions(rows), None),
+        ("format_executions_status", format_executions_status, fixtures.make_execution_statuses(rows), None),
+    ]
+
+
+def measure(formatter: Callable, rows: list, params: dict, repeat: int, strict: bool) -> float:
+    tools.utils.STRICT_VALIDATION = strict
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        formatter(rows, params)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_formatters")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per fixture (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per case, best is reported (default: 5)")
+    args = parser.parse_args()
+
+    strict_default = tools.utils.STRICT_VALIDATION
+    print(f"{'formatter':<30} {'lax (ms)':>10} {'rows/s':>10} {'strict (ms)':>12} {'rows/s':>10}")
+    try:
+        for name, formatter, rows, params in formatter_cases(args.rows):
+            lax_time = measure(formatter, rows, params, args.repeat, strict=False)
+            strict_time = measure(formatter, rows, params, args.repeat, strict=True)
+            print(f"{name:<30} {lax_time * 1000:>10.2f} {args.rows / lax_time:>10.0f} "
+                  f"{strict_time * 1000:>12.2f} {args.rows / strict_time:>10.0f}")
+    finally:
+        tools.utils.STRICT_VALIDATION = strict_default
+
+
+if __name__ == "__main__":
+    main()
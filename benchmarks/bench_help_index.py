@@ -0,0 +1,102 @@
+"""
+Help index benchmark.
+Measures the build time and the memory of the help index over the help.blazemeter.com table of contents,
+and of the previous index (flattened tree with a copy of every node and three dicts keyed by strings).
+Without network access use --synthetic to build a table of contents with the given amount of pages.
+
+Usage:
+    python -m benchmarks.bench_help_index [--repeat 5] [--synthetic 20000]
+"""
+import argparse
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks import fixtures
+from config.blazemeter import HELP_INDEX_URL, HELP_TOC_URL
+from tools.help_index import HelpIndex, split_help_path
+from tools.help_utils import convert_js_to_py_dict
+
+
+def fetch_toc() -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    with httpx.Client(timeout=60, follow_redirects=True) as client:
+        index = convert_js_to_py_dict(client.get(HELP_INDEX_URL).raise_for_status().text)
+        chunks = [convert_js_to_py_dict(client.get(
+            f"{HELP_TOC_URL}{index.get('prefix', 'azure_toc_public_Chunk')}{i}.js").raise_for_status().text)
+            for i in range(index.get("numchunks", 2))]
+    return index, chunks
+
+
+def build_previous_index(tree: Dict[str, Any], chunks: List[Dict[str, Any]]) -> Tuple[dict, dict, dict]:
+    # The index as it was built before HelpIndex, to compare against
+    flat = {}
+    stack = list(tree.get("n", []))
+    while stack:
+        node = stack.pop()
+        children = node.get("n", [])
+        node_copy = deepcopy(node)
+        node_id = node_copy.pop("i", None)
+        node_copy.pop("n", None)
+        node_copy.pop("c", None)
+        flat[node_id] = {**node_copy, "n": [child["i"] for child in children]}
+        stack.extend(children)
+
+    help_tree, items_index, index_nodes = {}, {}, {}
+    for chunk in chunks:
+        for url, content in chunk.items():
+            path = url.replace("/content/", "").replace(".html", "")
+            if path == "___" or path.startswith("signup"):
+                continue
+            tree_id = content.get("i", [""])[0]
+            category, subcategory, help_id = split_help_path(path)
+            help_tree.setdefault(category, {}).setdefault(subcategory, []).append(
+                {"title": content.get("t", [""])[0], "help_id": help_id, "help_tree_id": tree_id})
+            items_index[f"{category}:{subcategory}:{help_id}"] = tree_id
+            if tree_id not in index_nodes:
+                index_nodes[tree_id] = {"category": category, "subcategory": subcategory, "help_id": help_id,
+                                        "sub_nodes": flat.get(tree_id, {}).get("n", [])}
+    return help_tree, items_index, index_nodes
+
+
+def measure(builder: Callable, tree: Dict[str, Any], chunks: List[Dict[str, Any]],
+            repeat: int) -> Tuple[float, int, int]:
+    """Best build time, peak memory while building and memory retained by the index."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        builder(tree, chunks)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    index = builder(tree, chunks)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+    return best, peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_help_index")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per case, best is reported (default: 5)")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Pages of a synthetic table of contents, instead of the help.blazemeter.com one")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        index, chunks = fixtures.make_help_toc(args.synthetic)
+        source = f"synthetic ({args.synthetic} pages)"
+    else:
+        index, chunks = fetch_toc()
+        source = HELP_INDEX_URL
+    tree = index.get("tree", {})
+    print(f"Table of contents: {source}, {sum(len(chunk) for chunk in chunks)} entries")
+    print(f"{'index':<20} {'build (ms)':>12} {'peak (KiB)':>12} {'retained (KiB)':>15}")
+    for name, builder in (("previous", build_previous_index), ("HelpIndex", HelpIndex.build)):
+        build_time, peak, retained = measure(builder, tree, chunks, args.repeat)
+        print(f"{name:<20} {build_time * 1000:>12.2f} {peak / 1024:>12.0f} {retained / 1024:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Tools load benchmark.
+Drives every MCP tool action through FastMCP against the local BlazeMeter API stand-in,
+and reports the latency percentiles and throughput of each action.
+The help tool is not included, it depends on help.blazemeter.com.
+
+Usage:
+    python -m benchmarks.bench_tools [--concurrency 8] [--iterations 20] [--latency 0.05] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+import tools.utils
+from benchmarks.mock_api import MockBlazeMeterApi, MockServerThread, settings_arguments, settings_from_arguments
+from config.blazemeter import TOOLS_PREFIX
+from config.token import BzmToken
+from server import register_tools
+
+ACCOUNT_ID = 1
+WORKSPACE_ID = 101
+PROJECT_ID = 10101
+TEST_ID = 10101001
+EXECUTION_ID = 10101001001
+
+
+def tool_actions(asset_path: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    return [
+        (f"{TOOLS_PREFIX}_user", "read", {}),
+        (f"{TOOLS_PREFIX}_user", "snapshot", {"max_depth": 3, "refresh": True}),
+        (f"{TOOLS_PREFIX}_account", "list", {}),
+        (f"{TOOLS_PREFIX}_account", "read", {"account_id": ACCOUNT_ID}),
+        (f"{TOOLS_PREFIX}_workspaces", "list", {"account_id": ACCOUNT_ID}),
+        (f"{TOOLS_PREFIX}_workspaces", "read", {"workspace_id": WORKSPACE_ID}),
+        (f"{TOOLS_PREFIX}_workspaces", "read_locations", {"workspace_id": WORKSPACE_ID}),
+        (f"{TOOLS_PREFIX}_workspaces", "read_locations", {"workspace_id": WORKSPACE_ID, "min_threads_per_engine": 300,
+                                                          "min_engines": 20, "private_only": True}),
+        (f"{TOOLS_PREFIX}_project", "list", {"workspace_id": WORKSPACE_ID}),
+        (f"{TOOLS_PREFIX}_project", "read", {"project_id": PROJECT_ID}),
+        (f"{TOOLS_PREFIX}_project", "read_many", {"project_id_list": [PROJECT_ID, PROJECT_ID + 1]}),
+        (f"{TOOLS_PREFIX}_tests", "list", {"project_id": PROJECT_ID}),
+        (f"{TOOLS_PREFIX}_tests", "read", {"test_id": TEST_ID}),
+        (f"{TOOLS_PREFIX}_tests", "read_many", {"test_id_list": [TEST_ID + i for i in range(5)]}),
+        (f"{TOOLS_PREFIX}_tests", "create", {"test_name": "Benchmark", "project_id": PROJECT_ID}),
+        (f"{TOOLS_PREFIX}_tests", "configure_load", {"test_id": TEST_ID, "concurrency": 50, "hold-for": "5m"}),
+        (f"{TOOLS_PREFIX}_tests", "configure_locations", {"test_id": TEST_ID, "locations": ["us-east1-a=100"]}),
+        (f"{TOOLS_PREFIX}_tests", "configure_bulk", {"project_id": PROJECT_ID, "concurrency": 50}),
+        (f"{TOOLS_PREFIX}_tests", "upload_assets", {"test_id": TEST_ID, "file_paths": [asset_path]}),
+        (f"{TOOLS_PREFIX}_execution", "start", {"test_id": TEST_ID}),
+        (f"{TOOLS_PREFIX}_execution", "start_plan", {"test_id_list": [TEST_ID + i for i in range(3)]}),
+        (f"{TOOLS_PREFIX}_execution", "list", {"test_id": TEST_ID}),
+        (f"{TOOLS_PREFIX}_execution", "read", {"execution_id": EXECUTION_ID}),
+        (f"{TOOLS_PREFIX}_execution", "read_many", {"execution_id_list": [EXECUTION_ID + i for i in range(5)]}),
+        (f"{TOOLS_PREFIX}_execution", "read_summary", {"execution_id": EXECUTION_ID}),
+        (f"{TOOLS_PREFIX}_execution", "read_errors", {"execution_id": EXECUTION_ID}),
+        (f"{TOOLS_PREFIX}_execution", "analyze_errors", {"execution_id": EXECUTION_ID}),
+        (f"{TOOLS_PREFIX}_execution", "read_request_stats", {"execution_id": EXECUTION_ID}),
+        (f"{TOOLS_PREFIX}_execution", "read_timeline", {"execution_id": EXECUTION_ID, "max_points": 100}),
+        (f"{TOOLS_PREFIX}_execution", "trend", {"test_id": TEST_ID}),
+        (f"{TOOLS_PREFIX}_execution", "read_all_reports", {"execution_id": EXECUTION_ID}),
+    ]
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def has_error(response: Any) -> bool:
+    # FastMCP returns the unstructured and structured content for tools with output schema
+    if isinstance(response, tuple):
+        response = response[1]
+    return isinstance(response, dict) and bool(response.get("error"))
+
+
+async def run_load(mcp: FastMCP, actions: List[Tuple[str, str, Dict[str, Any]]], concurrency: int,
+                   iterations: int) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(iterations):
+        for action in actions:
+            queue.put_nowait(action)
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async def worker():
+        while not queue.empty():
+            tool_name, action, args = queue.get_nowait()
+            key = f"{tool_name}.{action}"
+            start = time.perf_counter()
+            try:
+                response = await mcp.call_tool(tool_name, {"action": action, "args": args})
+                if has_error(response):
+                    errors[key] += 1
+            except Exception:
+                errors[key] += 1
+            latencies[key].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> None:
+    print(f"{'action':<42} {'calls':>6} {'errors':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    all_latencies = []
+    for key, values in latencies.items():
+        values.sort()
+        all_latencies.extend(values)
+        print(f"{key:<42} {len(values):>6} {errors.get(key, 0):>6} {percentile(values, 50) * 1000:>9.1f} "
+              f"{percentile(values, 95) * 1000:>9.1f} {percentile(values, 99) * 1000:>9.1f}")
+    all_latencies.sort()
+    total_errors = sum(errors.values())
+    print(f"{'total':<42} {len(all_latencies):>6} {total_errors:>6} {percentile(all_latencies, 50) * 1000:>9.1f} "
+          f"{percentile(all_latencies, 95) * 1000:>9.1f} {percentile(all_latencies, 99) * 1000:>9.1f}")
+    print(f"\nElapsed: {elapsed:.2f}s, throughput: {len(all_latencies) / elapsed:.1f} calls/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_tools")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent tool calls (default: 8)")
+    parser.add_argument("--iterations", type=int, default=10, help="Rounds over every tool action (default: 10)")
+    settings_arguments(parser)
+    args = parser.parse_args()
+
+    api = MockBlazeMeterApi(settings_from_arguments(args))
+    with MockServerThread(api) as server, tempfile.TemporaryDirectory() as temp_dir:
+        tools.utils.BZM_API_BASE_URL = server.base_url
+        asset_path = Path(temp_dir) / "benchmark.jmx"
+        asset_path.write_text("<jmeterTestPlan/>", encoding="utf-8")
+
+        mcp = FastMCP("blazemeter-mcp-benchmark", log_level="CRITICAL")
+        register_tools(mcp, BzmToken("benchmark", "benchmark"))
+
+        latencies, errors, elapsed = asyncio.run(
+            run_load(mcp, tool_actions(str(asset_path)), args.concurrency, args.iterations))
+        report(latencies, errors, elapsed)
+        print(f"Upstream requests: {api.requests_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Synthetic BlazeMeter API payloads used by the benchmarks.
+Each generator returns raw API rows (as returned in the 'result' attribute of the API response).
+"""
+from typing import Any, Dict, List, Tuple
+
+BASE_TIMESTAMP = 1735689600  # 2025-01-01T00:00:00Z
+
+
+def make_users(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "displayName": f"User {i}",
+            "firstName": "User",
+            "lastName": f"{i}",
+            "email": f"user{i}@example.com",
+            "access": BASE_TIMESTAMP + i,
+            "login": BASE_TIMESTAMP + i,
+            "created": BASE_TIMESTAMP,
+            "updated": BASE_TIMESTAMP + i,
+            "timezone": 0,
+            "enabled": True,
+            "defaultProjectId": 1,
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_accounts(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"Account {i}",
+            "description": f"Account number {i}",
+            "aiConsent": True,
+            "created": BASE_TIMESTAMP,
+            "updated": BASE_TIMESTAMP + i,
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_locations(rows: int) -> List[Dict[str, Any]]:
+    locations = []
+    for i in range(rows):
+        location_id = f"harbor-{i}" if i % 4 == 0 else f"us-east{i}-a"
+        locations.append({
+            "id": location_id,
+            "title": f"Location {i}",
+            "purposes": {"load": True, "functional": i % 2 == 0, "serviceMock": i % 3 == 0},
+            "limits": {
+                "concurrency": 1000 * (i % 10 + 1),
+                "engines": 10 * (i % 5 + 1),
+                "duration": 120,
+                "threadsPerEngine": 100 * (i % 5 + 1),
+            },
+        })
+    return locations
+
+
+def make_workspaces(rows: int, locations: int = 50) -> List[Dict[str, Any]]:
+    workspace_locations = make_locations(locations)
+    return [
+        {
+            "id": i,
+            "name": f"Workspace {i}",
+            "accountId": 1,
+            "created": BASE_TIMESTAMP,
+            "updated": BASE_TIMESTAMP + i,
+            "enabled": True,
+            "owner": {"id": 1, "email": "user1@example.com"},
+            "allowance": {"amount": 1000, "type": "vuh"},
+            "membersCount": 5,
+            "locations": workspace_locations,
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_projects(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"Project {i}",
+            "description": f"Project number {i}",
+            "created": BASE_TIMESTAMP,
+            "updated": BASE_TIMESTAMP + i,
+            "workspaceId": 1,
+            "testsCount": 0,
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_tests(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"Test {i}",
+            "description": "",
+            "created": BASE_TIMESTAMP,
+            "updated": BASE_TIMESTAMP + i,
+            "projectId": 1,
+            "configuration": {
+                "type": "taurus",
+                "filename": "DemoTest.jmx",
+                "testMode": "script",
+                "scriptType": "jmeter",
+            },
+            "overrideExecutions": [
+                {"concurrency": 20, "holdFor": "1m", "rampUp": "1m", "steps": 1, "executor": "jmeter",
+                 "locations": {"us-east1-b": 20}, "locationsPercents": {"us-east1-b": 100}}
+            ],
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_executions(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"Execution {i}",
+            "projectId": 1,
+            "testId": 1,
+            "created": BASE_TIMESTAMP + i * 60,
+            "updated": BASE_TIMESTAMP + i * 60 + 30,
+            "ended": BASE_TIMESTAMP + i * 60 + 30,
+            "reportStatus": "pass",
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_execution_statuses(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "executionStep": "ENDED",
+            "statuses": {"pending": 0, "booting": 0, "downloading": 0, "ready": 0, "ended": 100},
+        }
+        for _ in range(rows)
+    ]
+
+
+HELP_CATEGORIES = ["guide", "apidocs", "release-notes", "functional"]
+
+
+def make_help_toc(pages: int, chunks: int = 4, fanout: int = 6) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Help table of contents like help.blazemeter.com: the index, with the tree of nodes, and the chunks
+    with the pages of each node ('/content/<category>[/<subcategory>]/<page>.html').
+    """
+    nodes = [{"i": i, "c": 0, "n": []} for i in range(pages)]
+    for i in range(1, pages):
+        parent = nodes[(i - 1) // fanout]
+        parent["n"].append(nodes[i])
+        parent["c"] += 1
+    chunk_items: List[Dict[str, Any]] = [{} for _ in range(chunks)]
+    for i in range(pages):
+        category = HELP_CATEGORIES[i % len(HELP_CATEGORIES)]
+        subcategory = f"section-{i % 7}/" if i % 3 else ""
+        chunk_items[i % chunks][f"/content/{category}/{subcategory}page-{i}.html"] = {"i": [i], "t": [f"Page {i}"]}
+    # Entries excluded from the help
+    chunk_items[0]["/content/___.html"] = {"i": [0], "t": ["Home"]}
+    chunk_items[-1]["signup"] = {"i": [0], "t": ["Sign up"]}
+    index = {"numchunks": chunks, "prefix": "azure_toc_public_Chunk", "tree": {"n": [nodes[0]] if nodes else []}}
+    return index, chunk_items
+
+
+def make_help_page(name: str, sections: int) -> str:
+    """Help page like help.blazemeter.com, with a parameters table in each section."""
+    parts = []
+    for section in range(1, sections + 1):
+        rows = "".join(f"<tr><td>param_{section}_{row}</td><td>Parameter {row} of section {section}</td></tr>"
+                       for row in range(1, 4))
+        parts.append(
+            f"<h2>Section {section}</h2><p>Description of the section {section} of {name}.</p>"
+            f"<h3>Parameters of section {section}</h3>"
+            f"<table><thead><tr><th>Name</th><th>Description</th></tr></thead><tbody>{rows}</tbody></table>")
+    return (f"<html><head><title>{name}</title></head><body><div role=\"main\"><h1>{name}</h1>"
+            f"<p>Introduction of {name}.</p>{''.join(parts)}</div></body></html>")
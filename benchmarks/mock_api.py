@@ -0,0 +1,482 @@
+"""
+Local BlazeMeter API stand-in for offline benchmarks and tests.
+
+Serves the subset of the BlazeMeter API v4 used by the tools, with configurable latency,
+error injection and payload sizes, and help pages and table of contents like help.blazemeter.com under /docs. The entities hierarchy is generated on demand from the ids:
+    account: a  ->  workspace: a * 100 + w  ->  project: workspace * 100 + p
+    test: project * 1000 + t  ->  execution (master): test * 1000 + m
+
+Usage:
+    python -m benchmarks.mock_api [--port 8081] [--latency 0.05] [--error-rate 0.01] [--rows 50]
+    BZM_MCP_API_BASE_URL=http://127.0.0.1:8081/api/v4 python main.py --mcp
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from benchmarks.fixtures import BASE_TIMESTAMP, make_help_page, make_help_toc, make_locations
+
+API_PREFIX = "/api/v4"
+HELP_PREFIX = "/docs"
+NO_AI_CONSENT_ACCOUNT_ID = 2  # Account used to exercise the AI consent validation
+
+
+@dataclass
+class MockSettings:
+    latency: float = 0.0  # Base latency added to every response, in seconds
+    latency_jitter: float = 0.0  # Random extra latency, in seconds
+    error_rate: float = 0.0  # Probability of answering with error_status
+    error_status: int = 500
+    accounts: int = 2  # Amount of accounts of the user
+    rows: int = 10  # Amount of children of each entity (workspaces, projects, tests and executions)
+    locations: int = 20  # Amount of locations of each workspace
+    report_rows: int = 50  # Amount of labels of the reports
+    timeline_points: int = 360  # Points of each label in the timeline report, one every 10 seconds
+    boot_time: float = 0.0  # Seconds until the engines of a delayed start execution are ready
+    help_sections: int = 5  # Sections of each help page
+    help_pages: int = 60  # Pages in the help table of contents
+
+
+class MockBlazeMeterApi:
+
+    def __init__(self, settings: Optional[MockSettings] = None):
+        self.settings = settings or MockSettings()
+        self.tests: Dict[int, Dict[str, Any]] = {}  # Created or modified tests
+        self.masters: Dict[int, Dict[str, Any]] = {}  # Started executions
+        self.boots: Dict[int, float] = {}  # Delayed start executions waiting for release -> boot start time
+        self.requests_count = 0
+        self.app = Starlette(routes=self._routes())
+
+    def _routes(self) -> List[Route]:
+        routes = [
+            ("/user", self.read_user, ["GET"]),
+            ("/accounts", self.list_accounts, ["GET"]),
+            ("/accounts/{entity_id:int}", self.read_account, ["GET"]),
+            ("/workspaces", self.list_workspaces, ["GET"]),
+            ("/workspaces/{entity_id:int}", self.read_workspace, ["GET"]),
+            ("/projects", self.list_projects, ["GET"]),
+            ("/projects/{entity_id:int}", self.read_project, ["GET"]),
+            ("/tests", self.list_tests, ["GET"]),
+            ("/tests", self.create_test, ["POST"]),
+            ("/tests/{entity_id:int}", self.read_test, ["GET"]),
+            ("/tests/{entity_id:int}", self.update_test, ["PATCH"]),
+            ("/tests/{entity_id:int}/files", self.upload_file, ["POST"]),
+            ("/tests/{entity_id:int}/start", self.start_test, ["POST"]),
+            ("/masters", self.list_masters, ["GET"]),
+            ("/masters/{entity_id:int}", self.read_master, ["GET"]),
+            ("/masters/{entity_id:int}/status", self.read_master_status, ["GET"]),
+            ("/masters/{entity_id:int}/force-start", self.force_start_master, ["POST"]),
+            ("/masters/{entity_id:int}/reports/default/summary", self.read_summary, ["GET"]),
+            ("/masters/{entity_id:int}/reports/errorsreport/data", self.read_errors_report, ["GET"]),
+            ("/masters/{entity_id:int}/reports/aggregatereport/data", self.read_aggregate_report, ["GET"]),
+            ("/masters/{entity_id:int}/reports/timeline/kpis", self.read_timeline_report, ["GET"]),
+        ]
+        help_routes = [
+            ("/Data/Tocs/{name}", self.read_help_toc, ["GET"]),
+            ("/{path:path}", self.read_help_page, ["GET"]),
+        ]
+        return ([Route(f"{API_PREFIX}{path}", self._endpoint(handler), methods=methods)
+                 for path, handler, methods in routes]
+                + [Route(f"{HELP_PREFIX}{path}", self._endpoint(handler), methods=methods)
+                   for path, handler, methods in help_routes])
+
+    def _endpoint(self, handler):
+        async def endpoint(request: Request) -> JSONResponse:
+            self.requests_count += 1
+            delay = self.settings.latency + random.uniform(0, self.settings.latency_jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.settings.error_rate and random.random() < self.settings.error_rate:
+                return self._error(self.settings.error_status, "Injected error")
+            return await handler(request, **request.path_params)
+
+        return endpoint
+
+    # Responses
+
+    @staticmethod
+    def _response(result: Any, total: Optional[int] = None, request: Optional[Request] = None) -> JSONResponse:
+        body = {"api_version": 4, "error": None, "result": result}
+        if total is not None:
+            body["total"] = total
+            body["skip"] = int(request.query_params.get("skip", 0))
+            body["limit"] = int(request.query_params.get("limit", total))
+        return JSONResponse(body)
+
+    def _entity_response(self, request: Request, entity: Dict[str, Any]) -> Response:
+        # Tests and projects support conditional requests, the other entities don't have validators
+        response = self._response(entity)
+        etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+    @staticmethod
+    def _error(status_code: int, message: str) -> JSONResponse:
+        return JSONResponse({"api_version": 4, "error": {"code": status_code, "message": message}, "result": None},
+                            status_code=status_code)
+
+    def _page(self, request: Request, parent_id: int, factor: int, builder, newest_first: bool = False) -> JSONResponse:
+        skip = int(request.query_params.get("skip", 0))
+        limit = int(request.query_params.get("limit", self.settings.rows))
+        children_ids = [parent_id * factor + i for i in range(1, self.settings.rows + 1)]
+        if newest_first:  # Children are updated in ids order
+            children_ids.reverse()
+        page = [builder(child_id) for child_id in children_ids[skip:skip + limit]]
+        return self._response(page, total=len(children_ids), request=request)
+
+    def _exists(self, entity_id: int, factor: int) -> bool:
+        return 1 <= entity_id % factor <= self.settings.rows
+
+    # Entities
+
+    @staticmethod
+    def _user() -> Dict[str, Any]:
+        return {
+            "id": 1, "displayName": "Mock User", "firstName": "Mock", "lastName": "User",
+            "email": "mock.user@example.com", "access": BASE_TIMESTAMP, "login": BASE_TIMESTAMP,
+            "created": BASE_TIMESTAMP, "updated": BASE_TIMESTAMP, "timezone": 0, "enabled": True,
+            "defaultProjectId": 10101,
+            "defaultProject": {"id": 10101, "accountId": 1, "workspaceId": 101},
+        }
+
+    @staticmethod
+    def _account(account_id: int) -> Dict[str, Any]:
+        return {
+            "id": account_id, "name": f"Account {account_id}", "description": "",
+            "aiConsent": account_id != NO_AI_CONSENT_ACCOUNT_ID,
+            "created": BASE_TIMESTAMP, "updated": BASE_TIMESTAMP + account_id,
+        }
+
+    def _workspace(self, workspace_id: int) -> Dict[str, Any]:
+        return {
+            "id": workspace_id, "name": f"Workspace {workspace_id}", "accountId": workspace_id // 100,
+            "created": BASE_TIMESTAMP, "updated": BASE_TIMESTAMP + workspace_id, "enabled": True,
+            "owner": {"id": 1, "email": "mock.user@example.com"},
+            "allowance": {"amount": 1000, "type": "vuh"}, "membersCount": 1,
+            "locations": make_locations(self.settings.locations),
+        }
+
+    def _project(self, project_id: int) -> Dict[str, Any]:
+        return {
+            "id": project_id, "name": f"Project {project_id}", "description": "",
+            "created": BASE_TIMESTAMP, "updated": BASE_TIMESTAMP + project_id,
+            "workspaceId": project_id // 100, "testsCount": self.settings.rows,
+        }
+
+    def _test(self, test_id: int) -> Dict[str, Any]:
+        if test_id in self.tests:
+            return self.tests[test_id]
+        return {
+            "id": test_id, "name": f"Test {test_id}", "description": "",
+            "created": BASE_TIMESTAMP, "updated": BASE_TIMESTAMP + test_id, "projectId": test_id // 1000,
+            "configuration": {"type": "taurus", "filename": "DemoTest.jmx", "testMode": "script",
+                              "scriptType": "jmeter"},
+            "overrideExecutions": [{"concurrency": 20, "holdFor": "1m", "executor": "jmeter",
+                                    "locations": {"us-east1-a": 20}, "locationsPercents": {"us-east1-a": 100}}],
+        }
+
+    def _master(self, master_id: int) -> Dict[str, Any]:
+        if master_id in self.masters:
+            return self.masters[master_id]
+        started = BASE_TIMESTAMP + master_id % 1000 * 3600
+        return {
+            "id": master_id, "name": f"Execution {master_id}", "testId": master_id // 1000,
+            "projectId": master_id // 1000000, "created": started, "updated": started + 600,
+            "ended": started + 600, "reportStatus": "pass",
+        }
+
+    # Handlers
+
+    async def read_user(self, request: Request) -> JSONResponse:
+        return self._response(self._user())
+
+    async def list_accounts(self, request: Request) -> JSONResponse:
+        accounts = [self._account(account_id) for account_id in range(1, self.settings.accounts + 1)]
+        skip = int(request.query_params.get("skip", 0))
+        limit = int(request.query_params.get("limit", len(accounts)))
+        return self._response(accounts[skip:skip + limit], total=len(accounts), request=request)
+
+    async def read_account(self, request: Request, entity_id: int) -> JSONResponse:
+        if not 1 <= entity_id <= self.settings.accounts:
+            return self._error(404, f"Account {entity_id} not found")
+        return self._response(self._account(entity_id))
+
+    async def list_workspaces(self, request: Request) -> JSONResponse:
+        return self._page(request, int(request.query_params["accountId"]), 100, self._workspace)
+
+    async def read_workspace(self, request: Request, entity_id: int) -> JSONResponse:
+        if not self._exists(entity_id, 100):
+            return self._error(404, f"Workspace {entity_id} not found")
+        return self._response(self._workspace(entity_id))
+
+    async def list_projects(self, request: Request) -> JSONResponse:
+        return self._page(request, int(request.query_params["workspaceId"]), 100, self._project)
+
+    async def read_project(self, request: Request, entity_id: int) -> JSONResponse:
+        if not self._exists(entity_id, 100):
+            return self._error(404, f"Project {entity_id} not found")
+        return self._entity_response(request, self._project(entity_id))
+
+    async def list_tests(self, request: Request) -> JSONResponse:
+        return self._page(request, int(request.query_params["projectId"]), 1000, self._test)
+
+    async def read_test(self, request: Request, entity_id: int) -> JSONResponse:
+        if entity_id not in self.tests and not self._exists(entity_id, 1000):
+            return self._error(404, f"Test {entity_id} not found")
+        return self._entity_response(request, self._test(entity_id))
+
+    async def create_test(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        project_id = body["projectId"]
+        test_id = project_id * 1000 + self.settings.rows + len(self.tests) + 1
+        self.tests[test_id] = {
+            **self._test(test_id), "name": body["name"], "configuration": body.get("configuration", {}),
+            "overrideExecutions": [],
+        }
+        return self._response(self.tests[test_id])
+
+    async def update_test(self, request: Request, entity_id: int) -> JSONResponse:
+        body = await request.json()
+        test = dict(self._test(entity_id))
+        if "overrideExecutions" in body:
+            test["overrideExecutions"] = body["overrideExecutions"] or []
+        if "configuration" in body:
+            test["configuration"] = {**test["configuration"], **body["configuration"]}
+        test["updated"] = int(time.time())
+        self.tests[entity_id] = test
+        return self._response(test)
+
+    async def upload_file(self, request: Request, entity_id: int) -> JSONResponse:
+        form = await request.form()
+        upload = form["file"]
+        content = await upload.read()
+        return self._response({"fileName": upload.filename, "size": len(content)})
+
+    async def start_test(self, request: Request, entity_id: int) -> JSONResponse:
+        master_id = entity_id * 1000 + self.settings.rows + len(self.masters) + 1
+        now = int(time.time())
+        self.masters[master_id] = {
+            "id": master_id, "name": f"Execution {master_id}", "testId": entity_id,
+            "projectId": entity_id // 1000, "created": now, "updated": now, "ended": None,
+        }
+        if request.query_params.get("delayedStart", "false").lower() == "true":
+            self.boots[master_id] = time.monotonic()
+        return self._response(self.masters[master_id])
+
+    async def list_masters(self, request: Request) -> JSONResponse:
+        return self._page(request, int(request.query_params["testId"]), 1000, self._master,
+                          newest_first=request.query_params.get("sort[]") == "-updated")
+
+    async def read_master(self, request: Request, entity_id: int) -> JSONResponse:
+        if entity_id not in self.masters and not self._exists(entity_id, 1000):
+            return self._error(404, f"Master {entity_id} not found")
+        return self._response(self._master(entity_id))
+
+    async def read_master_status(self, request: Request, entity_id: int) -> JSONResponse:
+        ended = self._master(entity_id).get("ended") is not None
+        if entity_id in self.boots:
+            elapsed = time.monotonic() - self.boots[entity_id]
+            ready = min(100, int(elapsed / self.settings.boot_time * 100)) if self.settings.boot_time else 100
+            return self._response({
+                "executionStep": "READY" if ready == 100 else "BOOTING",
+                "statuses": {"pending": 0, "booting": 100 - ready, "downloading": 0, "ready": ready, "ended": 0},
+            })
+        return self._response({
+            "executionStep": "ENDED" if ended else "RUNNING",
+            "statuses": {"pending": 0, "booting": 0, "downloading": 0,
+                         "ready": 0 if ended else 100, "ended": 100 if ended else 0},
+        })
+
+    async def force_start_master(self, request: Request, entity_id: int) -> JSONResponse:
+        if entity_id not in self.boots:
+            return self._error(409, f"Master {entity_id} is not waiting for a delayed start")
+        del self.boots[entity_id]
+        return self._response(self._master(entity_id))
+
+    async def read_summary(self, request: Request, entity_id: int) -> JSONResponse:
+        random_generator = random.Random(entity_id)
+        avg = 200 + random_generator.uniform(-50, 50)
+        hits = 10000 + random_generator.randint(0, 1000)
+        return self._response({
+            "summary": [{
+                "id": "ALL", "first": BASE_TIMESTAMP, "last": BASE_TIMESTAMP + 600, "duration": 600,
+                "hits": hits, "failed": random_generator.randint(0, 100), "hits_avg": hits / 600,
+                "avg": avg, "min": avg / 4, "max": avg * 5, "tp90": avg * 1.5, "tp95": avg * 1.8,
+                "tp99": avg * 2.5, "std": avg / 3, "bytes": hits * 1024,
+            }],
+            "maxUsers": 20,
+        })
+
+    async def read_errors_report(self, request: Request, entity_id: int) -> JSONResponse:
+        report = []
+        for label in range(self.settings.report_rows):
+            report.append({
+                "labelId": f"label-{label}",
+                "name": f"GET /api/items/{label}",
+                "errors": [
+                    {"m": f"Not Found /api/items/{label}?session={label * 7919}", "rc": "404", "count": label + 1},
+                    {"m": "Internal Server Error", "rc": "500", "count": 1},
+                ],
+                "assertions": [
+                    {"name": "Response Assertion", "failureMessage": f"Expected 200 got 404 at {BASE_TIMESTAMP + label}",
+                     "failures": label + 1},
+                ],
+                "failedEmbeddedResources": [],
+            })
+        return self._response(report, total=len(report), request=request)
+
+    async def read_aggregate_report(self, request: Request, entity_id: int) -> JSONResponse:
+        report = []
+        for label in range(self.settings.report_rows):
+            avg = 100.0 + label
+            report.append({
+                "labelId": f"label-{label}", "labelName": f"GET /api/items/{label}", "samples": 1000 + label,
+                "avgResponseTime": avg, "avgLatency": avg / 2, "geoMeanResponseTime": avg, "stDev": avg / 4,
+                "duration": 600, "minResponseTime": avg / 4, "maxResponseTime": avg * 4,
+                "medianResponseTime": avg, "90line": avg * 1.5, "95line": avg * 1.8, "99line": avg * 2.5,
+                "avgThroughput": (1000 + label) / 600, "errorsCount": label, "errorsRate": label / 10,
+                "concurrency": 20,
+            })
+        return self._response(report, total=len(report), request=request)
+
+    async def read_timeline_report(self, request: Request, entity_id: int) -> JSONResponse:
+        random_generator = random.Random(entity_id)
+        # The points start when the master started
+        started = BASE_TIMESTAMP + entity_id % 1000 * 3600
+        report = []
+        for label_id, label_name in [("ALL", "ALL"), ("label-0", "GET /api/items/0"), ("label-1", "GET /api/items/1")]:
+            points = []
+            for point in range(self.settings.timeline_points):
+                users = min(20, point + 1)
+                # Slow degradation with noise and a spike in the middle, like a soak test
+                response_time = 100 + point * 0.1 + random_generator.uniform(-10, 10)
+                if point == self.settings.timeline_points // 2:
+                    response_time *= 10
+                points.append({"ts": started + point * 10, "na": users, "n": users * 10,
+                               "avg_rt": round(response_time, 2), "ec": random_generator.randint(0, 2)})
+            report.append({"labelId": label_id, "labelName": label_name, "kpis": points})
+        return self._response(report)
+
+    async def read_help_toc(self, request: Request, name: str) -> Response:
+        # Table of contents files like help.blazemeter.com, javascript modules with the index or a chunk
+        index, chunks = make_help_toc(self.settings.help_pages)
+        if name == "azure_toc_public.js":
+            content = index
+        elif name.startswith(index["prefix"]) and name[len(index["prefix"]):-3].isdigit():
+            chunk = int(name[len(index["prefix"]):-3])
+            if chunk >= len(chunks):
+                return Response("Page not found", status_code=404)
+            content = chunks[chunk]
+        else:
+            return Response("Page not found", status_code=404)
+        return Response(f"define({json.dumps(content)});", media_type="application/javascript")
+
+    async def read_help_page(self, request: Request, path: str) -> Response:
+        if "missing" in path:
+            return Response("Page not found", status_code=404)
+        name = path.rsplit("/", 1)[-1].replace(".html", "")
+        content = make_help_page(name, self.settings.help_sections)
+        etag = f'"{hashlib.sha1(content.encode("utf-8")).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content, media_type="text/html", headers={"ETag": etag})
+
+
+class MockServerThread:
+    """Runs the mock API with uvicorn in a background thread, for tests and benchmarks."""
+
+    def __init__(self, api: MockBlazeMeterApi, host: str = "127.0.0.1", port: int = 0):
+        self.api = api
+        self.host = host
+        self.port = port or self._free_port(host)
+        self.server = uvicorn.Server(uvicorn.Config(api.app, host=self.host, port=self.port, log_level="error"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @staticmethod
+    def _free_port(host: str) -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    @property
+    def help_base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{HELP_PREFIX}"
+
+    def __enter__(self) -> "MockServerThread":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("Mock BlazeMeter API did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+def settings_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = MockSettings()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Base latency in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=defaults.latency_jitter,
+                        help="Random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Probability of an injected error response (0 to 1)")
+    parser.add_argument("--error-status", type=int, default=defaults.error_status,
+                        help="HTTP status of the injected errors")
+    parser.add_argument("--accounts", type=int, default=defaults.accounts, help="Amount of accounts")
+    parser.add_argument("--rows", type=int, default=defaults.rows, help="Amount of children of each entity")
+    parser.add_argument("--locations", type=int, default=defaults.locations, help="Locations per workspace")
+    parser.add_argument("--report-rows", type=int, default=defaults.report_rows, help="Labels in the reports")
+    parser.add_argument("--boot-time", type=float, default=defaults.boot_time,
+                        help="Seconds until a delayed start execution is ready")
+
+
+def settings_from_arguments(args: argparse.Namespace) -> MockSettings:
+    return MockSettings(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        accounts=args.accounts,
+        rows=args.rows,
+        locations=args.locations,
+        report_rows=args.report_rows,
+        boot_time=args.boot_time,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="mock_api")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    settings_arguments(parser)
+    args = parser.parse_args()
+
+    api = MockBlazeMeterApi(settings_from_arguments(args))
+    print(f"Mock BlazeMeter API on http://{args.host}:{args.port}{API_PREFIX}")
+    uvicorn.run(api.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
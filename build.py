@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Build script for creating PyInstaller binary."""
+import asyncio
 import os
 import platform
 import tomllib
@@ -9,6 +10,7 @@ from pathlib import Path
 import PyInstaller.__main__
 
 sep = os.pathsep
+HELP_BUNDLE = "help_bundle.bin"
 
 def build_version_file():
     pyproject = Path(__file__).parent / "pyproject.toml"
@@ -56,6 +58,17 @@ VSVersionInfo(
         f.write(TEMPLATE.strip())
 
 
+def build_help_bundle():
+    """Snapshot help.blazemeter.com into the offline help bundle shipped with the binary."""
+    from tools.help_bundle import snapshot_help
+    try:
+        pages = asyncio.run(snapshot_help(HELP_BUNDLE))
+        print(f"Help bundle built with {pages} pages")
+    except Exception as e:
+        # Without it the binary reads the help online, as before
+        print(f"Help bundle not built: {e!r}")
+
+
 def build():
     """Build the binary using PyInstaller."""
     system = platform.system().lower()
@@ -74,12 +87,16 @@ def build():
     name = f'bzm-mcp-{system}-{arch}{suffix}'
 
     icon = 'app.ics' if system == 'macos' else 'app.ico'
-    
+
+    datas = [f'--add-data=pyproject.toml{sep}.']
+    if Path(HELP_BUNDLE).exists():
+        datas.append(f'--add-data={HELP_BUNDLE}{sep}.')
+
     PyInstaller.__main__.run([
         'main.py',
         '--onefile',
         '--version-file=version_info.txt',
-        f'--add-data=pyproject.toml{sep}.',
+        *datas,
         f'--name={name}',
         f'--icon={icon}',
         '--clean',
@@ -89,4 +106,5 @@ def build():
 
 if __name__ == "__main__":
     build_version_file()
+    build_help_bundle()
     build()
@@ -1,4 +1,7 @@
-BZM_API_BASE_URL: str = "https://a.blazemeter.com/api/v4"
+import os
+
+# Can be overridden to target a BlazeMeter API stand-in (see benchmarks/mock_api.py)
+BZM_API_BASE_URL: str = os.getenv("BZM_MCP_API_BASE_URL", "https://a.blazemeter.com/api/v4")
 BZM_BASE_URL: str = "https://a.blazemeter.com/"
 TOOLS_PREFIX: str = "blazemeter"
 
@@ -9,6 +12,13 @@ SUPPORT_MESSAGE: str = "If you think this is a bug, please contact BlazeMeter su
 HELP_TOC_URL = "https://help.blazemeter.com/docs/Data/Tocs/"
 HELP_INDEX_URL = f"{HELP_TOC_URL}azure_toc_public.js"
 HELP_BASE_CONTENT_URL = "https://help.blazemeter.com/docs"
+# Help pages read at the same time by a single tool call
+HELP_MAX_CONCURRENCY: int = 4
+# Converted help pages, with their sections index, kept in memory for the following reads
+HELP_PAGE_CACHE_MAX_ENTRIES: int = 64
+# Offline help bundle built by tools/help_bundle.py and shipped with the binary, empty to disable it
+HELP_BUNDLE_PATH: str = os.getenv("BZM_MCP_HELP_BUNDLE", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "help_bundle.bin"))
 
 USER_ENDPOINT: str = "/user"
 ACCOUNTS_ENDPOINT: str = "/accounts"
@@ -16,3 +26,39 @@ PROJECTS_ENDPOINT: str = "/projects"
 WORKSPACES_ENDPOINT: str = "/workspaces"
 TESTS_ENDPOINT: str = "/tests"
 EXECUTIONS_ENDPOINT: str = "/masters"
+
+# Limits for actions operating on many elements in a single tool call
+MAX_BATCH_SIZE: int = 50
+MAX_BATCH_CONCURRENCY: int = 8
+MAX_BULK_TESTS: int = 500
+
+# Start plans: engines status polling interval and maximum boot time, in seconds. The boot time
+# of a call is kept below the usual MCP client request timeouts, release_plan continues waiting
+START_PLAN_POLL_INTERVAL: float = 5.0
+START_PLAN_BOOT_TIMEOUT: float = 45.0
+
+# Directory of the caches persisted between runs, empty to disable them
+CACHE_DIR: str = os.getenv("BZM_MCP_CACHE_DIR", os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "bzm-mcp"))
+# Size limit of the compressed reports of ended executions kept on disk, 0 to disable it
+RESULT_CACHE_MAX_BYTES: int = int(os.getenv("BZM_MCP_RESULT_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Seconds the entity reads (user, accounts, workspaces, projects, tests) are kept on disk for the
+# next sessions, 0 to disable it
+ENTITY_CACHE_TTL_SECONDS: int = int(os.getenv("BZM_MCP_ENTITY_CACHE_TTL", "300"))
+
+# SQLite database file of the local results store of ended executions. Disabled by default.
+RESULTS_DB_PATH: str = os.getenv("BZM_MCP_RESULTS_DB", "")
+
+# Worker pool of the CPU bound transforms: 'thread', 'process' (run in parallel, inputs and outputs are pickled)
+# or 'none' to run them in the event loop
+WORKER_POOL: str = os.getenv("BZM_MCP_WORKER_POOL", "thread").lower()
+WORKER_POOL_SIZE: int = int(os.getenv("BZM_MCP_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Transforms of smaller inputs run in the event loop, handing them to a worker costs more
+OFFLOAD_MIN_BYTES: int = int(os.getenv("BZM_MCP_OFFLOAD_MIN_KB", "64")) * 1024
+OFFLOAD_MIN_ROWS: int = int(os.getenv("BZM_MCP_OFFLOAD_MIN_ROWS", "2000"))
+# Seconds between the event loop lag measurements, 0 to disable them
+LOOP_LAG_INTERVAL: float = float(os.getenv("BZM_MCP_LOOP_LAG_INTERVAL", "0.1"))
+
+# Disable type coercion on the formatters validation. Intended for tests and debugging.
+STRICT_VALIDATION: bool = os.getenv("BZM_MCP_STRICT_VALIDATION", "false").lower() == "true"
@@ -1,14 +1,14 @@
 from typing import Optional, List
 
 from models.account import Account
-from tools.utils import get_date_time_iso
+from tools.utils import get_date_time_iso, validate_models
 
 
 def format_accounts(accounts, params: Optional[dict] = None) -> List[Account]:
     formatted_accounts = []
     for account in accounts:
         formatted_accounts.append(
-            Account(
+            dict(
                 account_id=account.get("id"),
                 account_name=account.get("name", "Unknown"),
                 description=account.get("description", ""),
@@ -17,4 +17,4 @@ def format_accounts(accounts, params: Optional[dict] = None) -> List[Account]:
                 updated=get_date_time_iso(account.get("updated")),
             )
         )
-    return formatted_accounts
+    return validate_models(Account, formatted_accounts)
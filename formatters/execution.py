@@ -1,8 +1,8 @@
 from typing import Any, List, Optional
 
 from config.blazemeter import BZM_BASE_URL
-from models.execution import TestExecution, TestExecutionDetailed, TestExecutionStatus, TestExecutionStatuses
-from tools.utils import get_date_time_iso
+from models.execution import TestExecution, TestExecutionDetailed, TestExecutionStatus
+from tools.utils import get_date_time_iso, validate_models
 
 
 def format_executions(executions: List[Any], params: Optional[dict] = None) -> List[TestExecution]:
@@ -12,14 +12,14 @@ def format_executions(executions: List[Any], params: Optional[dict] = None) -> L
         execution_name = execution.get("name")
         project_id = execution.get("projectId")
         formatted_executions.append(
-            TestExecution(
+            dict(
                 execution_id=execution_id,
                 execution_name=execution_name,
                 project_id=project_id,
                 execution_url=f"{BZM_BASE_URL}/app/#/masters/{execution_id}"
             )
         )
-    return formatted_executions
+    return validate_models(TestExecution, formatted_executions)
 
 
 def format_executions_detailed(executions: List[Any], params: Optional[dict] = None) -> List[TestExecutionDetailed]:
@@ -27,7 +27,7 @@ def format_executions_detailed(executions: List[Any], params: Optional[dict] = N
     for execution in executions:
         execution_id = execution.get("id")
         formatted_executions.append(
-            TestExecutionDetailed(
+            dict(
                 execution_id=execution_id,
                 execution_name=execution.get("name"),
                 execution_url=f"{BZM_BASE_URL}/app/#/masters/{execution_id}",
@@ -39,7 +39,7 @@ def format_executions_detailed(executions: List[Any], params: Optional[dict] = N
                 execution_status_detailed=None
             )
         )
-    return formatted_executions
+    return validate_models(TestExecutionDetailed, formatted_executions)
 
 
 def format_executions_status(statuses: List[Any], params: Optional[dict] = None) -> List[TestExecutionStatus]:
@@ -48,10 +48,10 @@ def format_executions_status(statuses: List[Any], params: Optional[dict] = None)
         execution_step = status_element.get("executionStep", "Unknown")
         status = status_element.get("statuses")
         formatted_statuses.append(
-            TestExecutionStatus(
+            dict(
                 progress_percent=status.get("ended", 0),
                 execution_step=execution_step,
-                execution_statuses=TestExecutionStatuses(
+                execution_statuses=dict(
                     pending_percent=status.get("pending", 0),
                     booting_percent=status.get("booting", 0),
                     downloading_percent=status.get("downloading", 0),
@@ -60,4 +60,4 @@ def format_executions_status(statuses: List[Any], params: Optional[dict] = None)
                 )
             )
         )
-    return formatted_statuses
+    return validate_models(TestExecutionStatus, formatted_statuses)
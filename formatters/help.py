@@ -2,7 +2,7 @@ from typing import Any, Optional
 
 from lxml import html
 
-from tools.help_utils import html_to_markdown
+from tools.help_utils import html_to_markdown, markdown_sections, select_markdown_sections
 
 
 def format_help_info(html_content: str, params: Optional[dict] = None) -> dict[str, Any]:
@@ -12,6 +12,28 @@ def format_help_info(html_content: str, params: Optional[dict] = None) -> dict[s
         "help_url": base_url
     }
 
+
+def format_help_page(html_content: str, params: Optional[dict] = None) -> dict[str, Any]:
+    # The help info with the index of its sections, to read them later without converting the page again
+    help_info = format_help_info(html_content, params)
+    help_info["sections"] = markdown_sections(help_info["help_content"])
+    return help_info
+
+
+def format_help_sections(help_page: dict[str, Any], params: Optional[dict] = None) -> dict[str, Any]:
+    content = help_page["help_content"]
+    sections = select_markdown_sections(content, help_page["sections"], params.get("section"), params.get("query"))
+    help_sections = {
+        "help_content": "\n\n".join(content[section["start"]:section["end"]].strip() for section in sections),
+        "help_url": help_page["help_url"],
+        "sections": [" > ".join(section["path"]) for section in sections],
+    }
+    if not sections:
+        # Help the next read with the headings of the page
+        help_sections["available_sections"] = [" > ".join(section["path"]) for section in help_page["sections"]
+                                               if section["path"]]
+    return help_sections
+
 def format_list_real_devices_extended_commands_info(html_content: str, params: Optional[dict] = None) -> dict[str, Any]:
     # Parse HTML with lxml
     tree = html.fromstring(html_content)
@@ -1,14 +1,14 @@
 from typing import List, Any, Optional
 
 from models.project import Project
-from tools.utils import get_date_time_iso
+from tools.utils import get_date_time_iso, validate_models
 
 
 def format_projects(projects: List[Any], params: Optional[dict] = None) -> List[Project]:
     formatted_projects = []
     for project in projects:
         formatted_projects.append(
-            Project(
+            dict(
                 project_id=project.get("id"),
                 project_name=project.get("name", "Unknown"),
                 description=project.get("description", ""),
@@ -18,4 +18,4 @@ def format_projects(projects: List[Any], params: Optional[dict] = None) -> List[
                 tests_count=project.get("testsCount", 0)
             )
         )
-    return formatted_projects
+    return validate_models(Project, formatted_projects)
@@ -1,14 +1,14 @@
 from typing import List, Any, Optional
 
 from models.test import Test
-from tools.utils import get_date_time_iso
+from tools.utils import get_date_time_iso, validate_models
 
 
 def format_tests(tests: List[Any], params: Optional[dict] = None) -> List[Test]:
     formatted_tests = []
     for test in tests:
         formatted_tests.append(
-            Test(
+            dict(
                 test_id=test.get("id"),
                 test_name=test.get("name", "Unknown"),
                 description=test.get("description", ""),
@@ -19,4 +19,4 @@ def format_tests(tests: List[Any], params: Optional[dict] = None) -> List[Test]:
                 override_executions=test.get("overrideExecutions", [])
             )
         )
-    return formatted_tests
+    return validate_models(Test, formatted_tests)
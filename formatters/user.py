@@ -1,14 +1,14 @@
 from typing import List, Any, Optional
 
 from models.user import User
-from tools.utils import get_date_time_iso
+from tools.utils import get_date_time_iso, validate_models
 
 
 def format_users(users: List[Any], params: Optional[dict] = None) -> List[User]:
     formatted_users = []
     for user in users:
         formatted_users.append(
-            User(
+            dict(
                 user_id=user.get("id"),
                 display_name=user.get("displayName"),
                 first_name=user.get('firstName'),
@@ -23,4 +23,4 @@ def format_users(users: List[Any], params: Optional[dict] = None) -> List[User]:
                 default_project_id=user.get("defaultProjectId"),
             )
         )
-    return formatted_users
+    return validate_models(User, formatted_users)
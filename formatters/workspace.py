@@ -1,18 +1,28 @@
 from typing import List, Any, Union, Optional
 
 from models.workspace import WorkspaceDetailed, Workspace
-from tools.utils import get_date_time_iso
+from tools.utils import get_date_time_iso, validate_models
+
+
+def is_private_location(location_id: str) -> bool:
+    return location_id.startswith("harbor-")
+
+
+def count_workspace_locations(workspace: dict) -> dict[str, int]:
+    private_count = 0
+    locations = workspace.get("locations", [])
+    for location in locations:
+        if is_private_location(location["id"]):
+            private_count += 1
+    return {
+        "private": private_count,
+        "public": len(locations) - private_count
+    }
 
 
 def format_workspaces(workspaces: List[Any], params: Optional[dict] = None, detailed: bool = False) -> List[
     Union[WorkspaceDetailed, Workspace]]:
     normalized_workspaces = []
-    locations = format_workspaces_locations(workspaces) if detailed else None
-    if locations:
-        locations_dict = {
-            "private": len(locations[0]["private"]),
-            "public": len(locations[0]["public"])
-        }
     for workspace in workspaces:
 
         workspace_element = {
@@ -28,11 +38,10 @@ def format_workspaces(workspaces: List[Any], params: Optional[dict] = None, deta
                 "owner": workspace["owner"],
                 "allowance": workspace["allowance"],
                 "users_count": workspace["membersCount"],
-                "test_available_locations": locations_dict,
+                "test_available_locations": count_workspace_locations(workspace),
             })
-        workspace_object = WorkspaceDetailed(**workspace_element) if detailed else Workspace(**workspace_element)
-        normalized_workspaces.append(workspace_object)
-    return normalized_workspaces
+        normalized_workspaces.append(workspace_element)
+    return validate_models(WorkspaceDetailed if detailed else Workspace, normalized_workspaces)
 
 
 def format_workspaces_detailed(workspaces: List[Any], params: Optional[dict] = None) -> List[
@@ -40,6 +49,19 @@ def format_workspaces_detailed(workspaces: List[Any], params: Optional[dict] = N
     return format_workspaces(workspaces=workspaces, params=params, detailed=True)
 
 
+def format_location(location: dict) -> dict[str, Any]:
+    return {
+        "location_id": location["id"],
+        "location_title": location["title"],
+        "limits": {
+            "location_max_concurrency": location["limits"]["concurrency"],
+            "location_max_engines": location["limits"]["engines"],
+            "test_max_duration_in_minutes_per_engine": location["limits"]["duration"],
+            "test_max_concurrency_per_engine": location["limits"]["threadsPerEngine"],
+        }
+    }
+
+
 def format_workspaces_locations(workspaces: List[Any], params: Optional[dict] = None) -> List[Any]:
     purpose_filter = params.get("purpose", "local") if params else None
     purpose_filter_id = purpose_filter
@@ -55,17 +77,8 @@ def format_workspaces_locations(workspaces: List[Any], params: Optional[dict] =
         for location in locations:
             purposes = location.get("purposes", {})
             if purpose_filter_id in purposes and purposes[purpose_filter_id] or not purpose_filter_id:
-                location_element = {
-                    "location_id": location["id"],
-                    "location_title": location["title"],
-                    "limits": {
-                        "location_max_concurrency": location["limits"]["concurrency"],
-                        "location_max_engines": location["limits"]["engines"],
-                        "test_max_duration_in_minutes_per_engine": location["limits"]["duration"],
-                        "test_max_concurrency_per_engine": location["limits"]["threadsPerEngine"],
-                    }
-                }
-                if location["id"].startswith("harbor-"):
+                location_element = format_location(location)
+                if is_private_location(location["id"]):
                     private_locations.append(location_element)
                 else:
                     public_locations.append(location_element)
@@ -1,17 +1,28 @@
 import argparse
+import asyncio
 import json
 import logging
+import multiprocessing
 import os
 import sys
-from typing import Literal, cast
+from contextlib import asynccontextmanager
+from typing import Literal, Optional, cast
 
 from mcp.server.fastmcp import FastMCP
 
+from config.blazemeter import LOOP_LAG_INTERVAL
 from config.token import BzmToken, BzmTokenError
 from config.version import __version__, __executable__
 from server import register_tools
+from tools.metrics_exporter import start_metrics_server
+from tools.utils import close_shared_clients
+from tools.warmup import warm_up
+from tools.workers import monitor_loop_lag, shutdown_workers
 
 BLAZEMETER_API_KEY_FILE_PATH = os.getenv('BLAZEMETER_API_KEY')
+METRICS_PORT = os.getenv('BZM_MCP_METRICS_PORT')
+METRICS_HOST = os.getenv('BZM_MCP_METRICS_HOST', '127.0.0.1')
+WARM_UP = os.getenv('BZM_MCP_WARM_UP', 'false').lower() == 'true'
 
 LOG_LEVELS = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
@@ -51,7 +62,34 @@ def get_token():
     return token
 
 
-def run(log_level: str = "CRITICAL"):
+def build_lifespan(metrics_host: str, metrics_port: Optional[int], token: Optional[BzmToken] = None,
+                   warm_up_enabled: bool = False):
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        metrics_server = None
+        if metrics_port:
+            metrics_server = await start_metrics_server(metrics_host, metrics_port)
+        # In background, the server answers the initialization meanwhile
+        warm_up_task = asyncio.create_task(warm_up(token)) if warm_up_enabled else None
+        loop_lag_task = asyncio.create_task(monitor_loop_lag()) if LOOP_LAG_INTERVAL > 0 else None
+        try:
+            yield {}
+        finally:
+            if warm_up_task:
+                warm_up_task.cancel()
+            if loop_lag_task:
+                loop_lag_task.cancel()
+            if metrics_server:
+                metrics_server.close()
+                await metrics_server.wait_closed()
+            await close_shared_clients()
+            shutdown_workers()
+
+    return lifespan
+
+
+def run(log_level: str = "CRITICAL", metrics_host: str = METRICS_HOST, metrics_port: Optional[int] = None,
+        warm_up_enabled: bool = WARM_UP):
     token = get_token()
     instructions = """
     # BlazeMeter MCP Server
@@ -65,6 +103,7 @@ def run(log_level: str = "CRITICAL"):
         - If you have the information needed to call a tool action with its arguments, do so.
         - Read action always get more information about a particular item than the list action, list only display minimal information.
         - Read the current user information at startup to learn the username, default account, workspace and project, and other important information.
+        - To learn the accounts, workspaces, projects and tests available, use the user 'snapshot' action instead of listing them one by one.
         - Dependencies:
             accounts: It doesn't depend on anyone. In user you can access which is the default account, and in the list of accounts, you can see the accounts available to the user.
             workspaces: Workspaces belong to a particular account.
@@ -72,7 +111,8 @@ def run(log_level: str = "CRITICAL"):
             tests: Tests belong to a particular project.
             executions: Executions belong to a particular test.
     """
-    mcp = FastMCP("blazemeter-mcp", instructions=instructions, log_level=cast(LOG_LEVELS, log_level))
+    mcp = FastMCP("blazemeter-mcp", instructions=instructions, log_level=cast(LOG_LEVELS, log_level),
+                  lifespan=build_lifespan(metrics_host, metrics_port, token, warm_up_enabled))
     register_tools(mcp, token)
     mcp.run(transport="stdio")
 
@@ -99,11 +139,32 @@ def main():
         help="Logging level (default: CRITICAL = critical errors only)"
     )
 
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=int(METRICS_PORT) if METRICS_PORT else None,
+        help="Expose Prometheus metrics on http://<metrics-host>:<port>/metrics (default: disabled)"
+    )
+
+    parser.add_argument(
+        "--metrics-host",
+        default=METRICS_HOST,
+        help="Interface for the metrics endpoint (default: 127.0.0.1)"
+    )
+
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        default=WARM_UP,
+        help="On startup, connect to BlazeMeter and read the user, its defaults and the help index in background"
+    )
+
     args = parser.parse_args()
     init_logging(args.log_level)
 
     if args.mcp:
-        run(log_level=args.log_level.upper())
+        run(log_level=args.log_level.upper(), metrics_host=args.metrics_host, metrics_port=args.metrics_port,
+            warm_up_enabled=args.warm_up)
     else:
 
         logo_ascii = (
@@ -147,4 +208,5 @@ def main():
         input("Press Enter to exit...")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Process worker pool in the PyInstaller binary
     main()
@@ -1,4 +1,4 @@
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List
 
 from pydantic import BaseModel, Field
 
@@ -29,3 +29,4 @@ class BaseResult(BaseModel):
 
 class HttpBaseResult(BaseResult):
     result: Optional[Any] = Field(description="Result", default=None)
+    headers: Optional[Dict[str, str]] = Field(description="Response headers", default=None, exclude=True)
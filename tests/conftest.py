@@ -0,0 +1,42 @@
+import pytest
+
+import tools.utils
+
+
+@pytest.fixture(autouse=True)
+def strict_validation(monkeypatch):
+    # Formatters must produce exact model types, without relying on pydantic coercion
+    monkeypatch.setattr(tools.utils, "STRICT_VALIDATION", True)
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    from benchmarks.mock_api import MockBlazeMeterApi, MockServerThread
+    with MockServerThread(MockBlazeMeterApi()) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_api(mock_server, monkeypatch, tmp_path):
+    # Point the tools to the local BlazeMeter API stand-in, with a clean state for each test
+    from benchmarks.mock_api import MockSettings
+    from tools.entity_cache import entity_cache
+    from tools.help_manager import HelpManager
+    from tools.http_cache import http_cache
+    from tools.report_manager import ReportManager
+    from tools.result_cache import result_cache
+    from tools.workspace_manager import WorkspaceManager
+    monkeypatch.setattr(tools.utils, "BZM_API_BASE_URL", mock_server.base_url)
+    mock_server.api.settings = MockSettings()
+    mock_server.api.tests.clear()
+    mock_server.api.masters.clear()
+    mock_server.api.boots.clear()
+    mock_server.api.requests_count = 0
+    monkeypatch.setattr(entity_cache, "directory", str(tmp_path / "entities"))
+    http_cache.clear()
+    WorkspaceManager.location_indexes.clear()
+    ReportManager.reports.clear()
+    HelpManager.help_pages.clear()
+    monkeypatch.setattr(result_cache, "directory", str(tmp_path / "results"))
+    result_cache.clear()
+    return mock_server.api
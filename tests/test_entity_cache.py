@@ -0,0 +1,68 @@
+import asyncio
+import os
+
+import httpx
+
+from config.token import BzmToken
+from models.performance_test import PerformanceTestObject
+from tools.entity_cache import EntityCache
+from tools.http_cache import HttpCache, http_cache
+from tools.test_manager import TestManager
+
+TOKEN = BzmToken("test", "test")
+
+
+class TestEntityCache:
+
+    def test_store_and_expire(self, tmp_path, monkeypatch):
+        cache = EntityCache(str(tmp_path), ttl=60)
+        key = HttpCache.key("token", "/tests/1", {"limit": 1})
+        cache.store(key, {"result": {"id": 1}}, '"abc"', None)
+        body, etag, last_modified, age = cache.get(key)
+        assert body == {"result": {"id": 1}} and etag == '"abc"' and last_modified is None
+        assert 0 <= age < 60
+        assert cache.get(HttpCache.key("other", "/tests/1", {"limit": 1})) is None
+
+        monkeypatch.setattr("tools.entity_cache.time.time", lambda: 10 ** 12)
+        assert cache.get(key) is None
+
+    def test_invalidate(self, tmp_path):
+        cache = EntityCache(str(tmp_path), ttl=60)
+        keys = [HttpCache.key("token", endpoint, None) for endpoint in ["/tests/1", "/tests/12", "/projects/1"]]
+        for key in keys:
+            cache.store(key, {}, None, None)
+        cache.invalidate("token", "/tests/1/files")
+        assert [cache.get(key) is not None for key in keys] == [False, True, True]
+        cache.invalidate("token", "/tests")
+        assert [cache.get(key) is not None for key in keys] == [False, False, True]
+
+    def test_restored_in_new_memory_cache(self, tmp_path):
+        persistent = EntityCache(str(tmp_path), ttl=60)
+        key = HttpCache.key("token", "/projects/1", None)
+        HttpCache(persistent=persistent).store(key, {"result": {"id": 1}}, httpx.Headers({"ETag": '"abc"'}))
+        # A new process, the entry with validators is revalidated before its first use
+        entry = HttpCache(persistent=persistent).get(key)
+        assert entry.body == {"result": {"id": 1}} and entry.validators() == {"If-None-Match": '"abc"'}
+        assert not entry.is_fresh()
+        # Without validators, it's fresh for the rest of its time on disk
+        HttpCache(persistent=persistent).store(key, {"result": {"id": 1}}, httpx.Headers())
+        assert HttpCache(persistent=persistent).get(key).is_fresh()
+        assert not EntityCache("", ttl=60).enabled
+
+
+class TestEntityCacheWithMockApi:
+
+    def test_reads_across_sessions(self, mock_api):
+        test_manager = TestManager(TOKEN, None)
+        asyncio.run(test_manager.read(10101001))
+        http_cache.clear()  # A new session, only the disk store remains
+        requests_count = mock_api.requests_count
+        asyncio.run(test_manager.read(10101001))
+        # The restored test and project are revalidated (304) and the project tests counted
+        assert mock_api.requests_count - requests_count == 3
+
+        asyncio.run(test_manager.configure(PerformanceTestObject.from_args({"test_id": 10101001, "concurrency": 30})))
+        http_cache.clear()
+        result = asyncio.run(test_manager.read(10101001))
+        assert result.result[0].override_executions[0]["concurrency"] == 30
+        assert os.listdir(http_cache.persistent.directory)
@@ -0,0 +1,89 @@
+from benchmarks import fixtures
+from formatters.account import format_accounts
+from formatters.execution import format_executions, format_executions_detailed, format_executions_status
+from formatters.help import format_help_page, format_help_sections
+from formatters.project import format_projects
+from formatters.test import format_tests
+from formatters.user import format_users
+from formatters.workspace import format_workspaces, format_workspaces_detailed, format_workspaces_locations
+from models.workspace import Workspace, WorkspaceDetailed
+
+
+class TestFormatters:
+
+    def test_format_users(self):
+        result = format_users(fixtures.make_users(3))
+        assert [user.user_id for user in result] == [1, 2, 3]
+        assert result[0].default_project_id == 1
+
+    def test_format_accounts(self):
+        result = format_accounts(fixtures.make_accounts(2))
+        assert result[1].account_name == "Account 2"
+        assert result[1].ai_consent is True
+
+    def test_format_projects(self):
+        result = format_projects(fixtures.make_projects(2))
+        assert result[0].workspace_id == 1
+        assert result[0].tests_count == 0
+
+    def test_format_tests(self):
+        result = format_tests(fixtures.make_tests(2))
+        assert result[0].project_id == 1
+        assert result[0].override_executions[0]["concurrency"] == 20
+
+    def test_format_executions(self):
+        result = format_executions(fixtures.make_executions(2))
+        assert result[1].execution_id == 2
+        assert result[1].execution_url.endswith("/app/#/masters/2")
+
+    def test_format_executions_detailed(self):
+        result = format_executions_detailed(fixtures.make_executions(1))
+        assert result[0].execution_status == "pass"
+        assert result[0].ended is not None
+
+    def test_format_executions_status(self):
+        result = format_executions_status(fixtures.make_execution_statuses(1))
+        assert result[0].progress_percent == 100
+        assert result[0].execution_statuses.ended_percent == 100
+
+    def test_format_workspaces(self):
+        result = format_workspaces(fixtures.make_workspaces(2, locations=4))
+        assert all(type(workspace) is Workspace for workspace in result)
+
+    def test_format_workspaces_detailed_counts_locations_per_workspace(self):
+        result = format_workspaces_detailed(fixtures.make_workspaces(2, locations=8))
+        assert all(type(workspace) is WorkspaceDetailed for workspace in result)
+        assert result[1].test_available_locations == {"private": 2, "public": 6}
+
+    def test_format_workspaces_locations(self):
+        result = format_workspaces_locations(fixtures.make_workspaces(1, locations=8), {"purpose": "mock"})
+        location_ids = [location["location_id"] for location in result[0]["private"] + result[0]["public"]]
+        assert location_ids == ["harbor-0", "us-east3-a", "us-east6-a"]
+
+    def test_format_help_page_sections(self):
+        html = ("<html><body><div role=\"main\"><h1>Guide</h1><p>Intro.</p>"
+                "<h2>Setup</h2><p>Install it.</p><pre><code># not a heading</code></pre>"
+                "<h3>Parameters</h3><table><tr><th>Name</th></tr><tr><td>threads</td></tr></table>"
+                "<h2>Results</h2><p>Read the report.</p><h3>Parameters</h3><p>report_id</p></div></body></html>")
+        page = format_help_page(html, {"base_url": "https://help/guide.html"})
+        assert [section["path"] for section in page["sections"]] == [
+            ["Guide"], ["Guide", "Setup"], ["Guide", "Setup", "Parameters"], ["Guide", "Results"],
+            ["Guide", "Results", "Parameters"]]
+
+        setup = format_help_sections(page, {"section": "setup"})
+        assert setup["sections"] == ["Guide > Setup"]
+        assert setup["help_content"].startswith("## Setup") and "threads" in setup["help_content"]
+        assert "Results" not in setup["help_content"]
+        parameters = format_help_sections(page, {"section": "Results > Param"})
+        assert parameters["help_content"] == "### Parameters\nreport_id"
+        assert len(format_help_sections(page, {"section": "Parameters"})["sections"]) == 2
+
+        query = format_help_sections(page, {"query": "threads"})
+        assert query["sections"] == ["Guide > Setup > Parameters"]
+        query = format_help_sections(page, {"section": "Results", "query": "read"})
+        assert query["sections"] == ["Guide > Results"]
+        assert "report_id" not in query["help_content"]  # Only the own text of the section
+
+        missing = format_help_sections(page, {"section": "Missing"})
+        assert missing["help_content"] == ""
+        assert missing["available_sections"][0] == "Guide"
@@ -0,0 +1,31 @@
+from benchmarks.fixtures import make_help_toc
+from tools.help_bundle import HelpBundle, write_help_bundle
+
+
+def page(name):
+    content = f"# {name}\nIntroduction.\n\n## Parameters\nthreads"
+    return {"help_content": content, "sections": [], "etag": f'"{name}"', "last_modified": None}
+
+
+class TestHelpBundle:
+
+    def test_write_and_read(self, tmp_path):
+        index, chunks = make_help_toc(10)
+        path = str(tmp_path / "help_bundle.bin")
+        write_help_bundle(path, index["tree"], chunks, {"page-1.html": page("page-1"),
+                                                        "section-1/page-2.html": page("page-2")})
+        bundle = HelpBundle(path)
+        assert len(bundle) == 2
+        assert bundle.created > 0
+        assert bundle.toc() == (index["tree"], chunks)
+        assert bundle.page("section-1/page-2.html") == page("page-2")
+        assert bundle.page("missing.html") is None
+
+    def test_missing_and_invalid_bundle(self, tmp_path):
+        assert HelpBundle(str(tmp_path / "missing.bin")).toc() is None
+        path = tmp_path / "invalid.bin"
+        path.write_bytes(b"not a help bundle")
+        bundle = HelpBundle(str(path))
+        assert bundle.toc() is None
+        assert bundle.page("page-1.html") is None
+        assert len(bundle) == 0
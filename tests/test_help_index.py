@@ -0,0 +1,62 @@
+from benchmarks.fixtures import make_help_toc
+from tools.help_index import HelpIndex, split_help_path
+
+
+def build(pages, **kwargs):
+    index, chunks = make_help_toc(pages, **kwargs)
+    return HelpIndex.build(index["tree"], chunks)
+
+
+class TestHelpIndex:
+
+    def test_split_help_path(self):
+        assert split_help_path("guide/performance/page/part") == ("guide", "performance", "page/part")
+        assert split_help_path("guide/page") == ("guide", "self", "page")
+        assert split_help_path("/page") == ("root_category", "self", "page")
+
+    def test_categories_and_pages(self):
+        index = build(40)
+        assert len(index) == 40  # '___' and signup excluded
+        categories = index.categories()
+        assert list(categories) == ["guide", "apidocs", "release-notes", "functional"]
+        assert categories["guide"][0] == "self"
+        pages = index.pages("guide", "self")
+        assert pages[0] == {"title": "Page 0", "help_id": "page-0", "help_tree_id": 0}
+        assert all(page["help_id"].startswith("page-") for page in pages)
+        # Pages of a chunk first, in the TOC order
+        assert [page["help_tree_id"] for page in pages] == sorted(
+            (page["help_tree_id"] for page in pages), key=lambda tree_id: (tree_id % 4, tree_id))
+        assert index.pages("guide", "missing") is None
+        assert index.pages("missing", "self") is None
+
+    def test_find_and_sub_nodes(self):
+        index = build(40, fanout=3)
+        assert index.find("guide", "self", "page-0") == 0
+        assert index.find("apidocs", "section-1", "page-1") == 1
+        assert index.find("apidocs", "self", "page-1") is None
+        assert index.find("guide", "self", "page-00") is None
+        assert index.node(0)["sub_nodes"] == [1, 2, 3]
+        assert index.node(39)["sub_nodes"] == []
+        assert index.node(1000) is None
+        sub_nodes = index.sub_nodes("guide", "self", "page-0")
+        assert [node["help_id"] for node in sub_nodes] == ["page-1", "page-2", "page-3"]
+        assert sub_nodes[0] == {"category": "apidocs", "subcategory": "section-1", "help_id": "page-1",
+                                "sub_nodes": [4, 5, 6]}
+        assert index.sub_nodes("guide", "self", "missing") == []
+
+    def test_nodes_without_pages(self):
+        tree = {"n": [{"i": 0, "n": [{"i": 1, "n": [{"i": 2}]}, {"i": 3}]}]}
+        chunks = [{"/content/guide/root.html": {"i": [0], "t": ["Root"]},
+                   "/content/guide/leaf.html": {"i": [2], "t": ["Leaf"]}}]
+        index = HelpIndex.build(tree, chunks)
+        assert index.node(0)["sub_nodes"] == [1, 3]
+        assert index.node(1) is None
+        assert index.sub_nodes("guide", "self", "root") == []
+        assert index.node(2)["help_id"] == "leaf"
+
+    def test_empty(self):
+        index = HelpIndex.build({}, [])
+        assert len(index) == 0
+        assert index.categories() == {}
+        assert index.find("guide", "self", "page") is None
+        assert index.node(0) is None
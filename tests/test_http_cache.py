@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+
+from config.token import BzmToken
+from models.performance_test import PerformanceTestObject
+from tools.http_cache import CacheEntry, HttpCache, HTTP_CACHE_FRESHNESS_SECONDS
+from tools.instrumentation import metrics
+from tools.test_manager import TestManager
+
+TOKEN = BzmToken("test", "test")
+
+
+class TestCacheEntry:
+
+    def test_freshness_without_validators(self):
+        entry = CacheEntry({}, httpx.Headers())
+        assert entry.freshness == HTTP_CACHE_FRESHNESS_SECONDS
+        assert entry.is_fresh()
+        assert entry.validators() == {}
+
+    def test_validators_are_always_revalidated(self):
+        entry = CacheEntry({}, httpx.Headers({"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}))
+        assert not entry.is_fresh()
+        assert entry.validators() == {"If-None-Match": '"abc"', "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+    def test_cache_control(self):
+        assert CacheEntry({}, httpx.Headers({"ETag": '"abc"', "Cache-Control": "private, max-age=60"})).is_fresh()
+        assert not CacheEntry({}, httpx.Headers({"Cache-Control": "no-cache"})).is_fresh()
+
+    def test_invalidate_entity(self):
+        cache = HttpCache()
+        for endpoint in ["/tests/1", "/tests/12", "/projects/1"]:
+            cache.store(cache.key("token", endpoint, None), {}, httpx.Headers())
+        cache.store(cache.key("other", "/tests/1", None), {}, httpx.Headers())
+        cache.invalidate("token", "/tests/1/files")
+        assert [key[:2] for key in cache.entries] == [("token", "/tests/12"), ("token", "/projects/1"),
+                                                      ("other", "/tests/1")]
+
+    def test_max_entries(self):
+        cache = HttpCache(max_entries=2)
+        for endpoint in ["/tests/1", "/tests/2", "/tests/3"]:
+            cache.store(cache.key("token", endpoint, None), {}, httpx.Headers())
+        assert [key[1] for key in cache.entries] == ["/tests/2", "/tests/3"]
+
+
+class TestHttpCacheWithMockApi:
+
+    def test_conditional_reads(self, mock_api):
+        metrics.reset()
+        test_manager = TestManager(TOKEN, None)
+        asyncio.run(test_manager.read(10101001))
+        assert mock_api.requests_count == 5  # Test, project, workspace, account and project tests count
+        assert metrics.cache_misses["http"] == 4
+
+        result = asyncio.run(test_manager.read(10101001))
+        # Test and project revalidated with 304 responses, workspace and account served from memory
+        assert mock_api.requests_count == 8
+        assert metrics.cache_hits["http"] == 4
+        assert result.result[0].override_executions[0]["concurrency"] == 20
+
+    def test_mutation_invalidates_reads(self, mock_api):
+        test_manager = TestManager(TOKEN, None)
+        asyncio.run(test_manager.read(10101001))
+        asyncio.run(test_manager.configure(PerformanceTestObject.from_args({"test_id": 10101001, "concurrency": 30})))
+        result = asyncio.run(test_manager.read(10101001))
+        assert result.result[0].override_executions[0]["concurrency"] == 30
@@ -0,0 +1,83 @@
+import asyncio
+
+from mcp.server.fastmcp import FastMCP
+
+from config.token import BzmToken
+from server import register_tools
+from tools.instrumentation import Histogram, LATENCY_BUCKETS, endpoint_key, metrics
+
+
+class TestInstrumentation:
+
+    def test_endpoint_key(self):
+        assert endpoint_key("GET", "/tests/123") == "GET /tests/{id}"
+        assert endpoint_key("GET", "/masters/42/reports/default/summary") == "GET /masters/{id}/reports/default/summary"
+        assert endpoint_key("GET", "https://help.blazemeter.com/docs/guide/a.html") == "GET help.blazemeter.com"
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram(LATENCY_BUCKETS)
+        for value in [0.001] * 90 + [0.2] * 9 + [3.0]:
+            histogram.observe(value)
+        assert histogram.count == 100
+        # Estimated as the bucket upper bound, capped by the maximum observed value
+        assert histogram.quantile(0.5) == 0.005
+        assert histogram.quantile(0.95) == 0.25
+        assert histogram.quantile(0.99) == 0.25
+        assert histogram.quantile(1.0) == 3.0
+
+    def test_tool_invocation_counts_upstream_calls(self, mock_api):
+        metrics.reset()
+        mcp = FastMCP("test")
+        register_tools(mcp, BzmToken("test", "test"))
+
+        async def call():
+            await mcp.call_tool("blazemeter_project", {"action": "read", "args": {"project_id": 10101}})
+            return await mcp.call_tool("blazemeter_diagnostics", {"action": "read", "args": {}})
+
+        _, diagnostics = asyncio.run(call())
+        snapshot = diagnostics["result"][0]
+        project_read = snapshot["tools"]["blazemeter_project.read"]
+        # Project, workspace, account and tests count requests
+        assert project_read["upstream_calls"]["max"] == 4
+        assert snapshot["endpoints"]["GET /projects/{id}"]["statuses"] == {"200": 1}
+        assert snapshot["endpoints"]["GET /projects/{id}"]["bytes_in"] > 0
+
+    def test_tool_unknown_actions(self, mock_api):
+        metrics.reset()
+        mcp = FastMCP("test")
+        register_tools(mcp, BzmToken("test", "test"))
+
+        async def call():
+            for action in ["read_all", "x" * 100, "read_all"]:
+                await mcp.call_tool("blazemeter_project", {"action": action, "args": {}})
+            return await mcp.call_tool("blazemeter_diagnostics", {"action": "read", "args": {}})
+
+        _, diagnostics = asyncio.run(call())
+        tools = diagnostics["result"][0]["tools"]
+        # The actions sent by the clients don't add series
+        assert [key for key in tools if key.startswith("blazemeter_project.")] == ["blazemeter_project.unknown"]
+        assert tools["blazemeter_project.unknown"]["latency_ms"]["count"] == 3
+
+
+class TestPrometheusExporter:
+
+    def test_render_prometheus(self):
+        import tools.help_manager  # noqa: F401 Registers the help cache gauge
+        from tools.instrumentation import Invocation, Metrics
+        from tools.metrics_exporter import render_prometheus
+
+        source = Metrics()
+        source.record_tool("blazemeter_tests.read", 0.02, Invocation(upstream_calls=4), failed=False)
+        source.record_request("GET /tests/{id}", 0.3, "404", 0, 120)
+        source.record_loop_lag(0.03)
+        source.record_worker_task(offloaded=True)
+
+        text = render_prometheus(source)
+        assert 'bzm_mcp_tool_duration_seconds_bucket{tool="blazemeter_tests",action="read",le="0.025"} 1' in text
+        assert 'bzm_mcp_tool_duration_seconds_count{tool="blazemeter_tests",action="read"} 1' in text
+        assert 'bzm_mcp_upstream_request_duration_seconds_bucket{method="GET",endpoint="/tests/{id}",le="0.25"} 0' in text
+        assert 'bzm_mcp_upstream_requests_total{method="GET",endpoint="/tests/{id}",status="404"} 1' in text
+        assert 'bzm_mcp_upstream_received_bytes_total{method="GET",endpoint="/tests/{id}"} 120' in text
+        assert 'bzm_mcp_event_loop_lag_seconds_bucket{le="0.05"} 1' in text
+        assert 'bzm_mcp_worker_tasks_total{mode="offloaded"} 1' in text
+        assert "bzm_mcp_help_cache_items 0" in text
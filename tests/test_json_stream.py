@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from tools.json_stream import ResultArrayParser
+
+BODY = json.dumps({
+    "api_version": 4,
+    "error": None,
+    "result": [{"labelId": f"label-{i}", "name": f"GET /ñ/{i}", "avg": i * 1.5, "tags": [i, str(i)]}
+               for i in range(20)],
+    "total": 20,
+    "skip": 0,
+    "limit": 20,
+}).encode("utf-8")
+
+
+def parse(body: bytes, chunk_size: int):
+    parser = ResultArrayParser()
+    items = []
+    for position in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[position:position + chunk_size]))
+    items.extend(parser.close())
+    return items, parser
+
+
+class TestResultArrayParser:
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+    def test_chunk_boundaries(self, chunk_size):
+        items, parser = parse(BODY, chunk_size)
+        expected = json.loads(BODY)
+        assert items == expected["result"]
+        assert parser.fields == {"api_version": 4, "error": None, "total": 20, "skip": 0, "limit": 20}
+        assert parser.result_is_list
+
+    def test_items_are_returned_incrementally(self):
+        parser = ResultArrayParser()
+        assert parser.feed(b'{"result": [{"a": 1}, {"b"') == [{"a": 1}]
+        assert parser.feed(b': 2}, 12') == [{"b": 2}]
+        assert parser.feed(b'3], "total": 3}') == [123]
+        assert parser.close() == []
+        assert parser.fields == {"total": 3}
+
+    def test_single_object_result(self):
+        items, parser = parse(b'{"error": null, "result": {"summary": [1, 2]}}', 5)
+        assert items == [{"summary": [1, 2]}]
+        assert not parser.result_is_list
+
+    def test_empty_and_null_results(self):
+        assert parse(b'{"result": []}', 1)[0] == []
+        assert parse(b'{"result": null, "error": {"code": 404}}', 4)[1].fields == {"error": {"code": 404}}
+
+    def test_incomplete_body(self):
+        parser = ResultArrayParser()
+        parser.feed(b'{"result": [{"a": 1}, {"b"')
+        with pytest.raises(ValueError):
+            parser.close()
+
+    @pytest.mark.parametrize("split", range(1, 12))
+    def test_numbers_split_between_chunks(self, split):
+        body = b'{"result": [1.5, -2.5e-3, 4E+2, 7], "total": 1.25e1}'
+        for position in range(len(body)):
+            parser = ResultArrayParser()
+            items = parser.feed(body[:position]) + parser.feed(body[position:position + split])
+            items += parser.feed(body[position + split:]) + parser.close()
+            assert items == [1.5, -2.5e-3, 4e2, 7]
+            assert parser.fields == {"total": 12.5}
+
+    def test_float_split_after_dot(self):
+        parser = ResultArrayParser()
+        assert parser.feed(b'{"result": [1.') == []
+        assert parser.feed(b'5, 2]}') == [1.5, 2]
+        assert parser.close() == []
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 13])
+    def test_strings_with_escapes_and_brackets(self, chunk_size):
+        result = [{"name": 'a "quoted" [label] {x}', "path": "C:\\dir\\", "unicode": "\u00f1\u2603"}, "]}", -1.5e3]
+        body = json.dumps({"result": result, "summary": {"text": "\\\"}"}}).encode("utf-8")
+        items, parser = parse(body, chunk_size)
+        assert items == result
+        assert parser.fields == {"summary": {"text": "\\\"}"}}
+
+    def test_large_item_decoded_once(self, monkeypatch):
+        import tools.json_stream
+        decoder = tools.json_stream._decoder
+        decoded = []
+
+        class CountingDecoder:
+            def raw_decode(self, text, position):
+                decoded.append(position)
+                return decoder.raw_decode(text, position)
+
+        monkeypatch.setattr(tools.json_stream, "_decoder", CountingDecoder())
+        summary = {"labels": [{"labelId": f"label-{i}", "avg": i} for i in range(2000)]}
+        items, parser = parse(json.dumps({"result": summary, "total": 1}).encode("utf-8"), 64)
+        assert items == [summary] and not parser.result_is_list
+        assert len(decoded) == 5  # Keys, values and the summary attempt in its first chunk, not once per chunk
@@ -0,0 +1,76 @@
+from tools.load_planner import allocate_users, plan_load
+
+
+def limits(concurrency: int, engines: int, threads_per_engine: int) -> dict:
+    return {
+        "location_max_concurrency": concurrency,
+        "location_max_engines": engines,
+        "test_max_duration_in_minutes_per_engine": 120,
+        "test_max_concurrency_per_engine": threads_per_engine,
+    }
+
+
+LIMITS = {
+    "us-east1-a": limits(2000, 20, 100),
+    "us-west1-a": limits(5000, 10, 500),
+    "harbor-1": limits(100, 1, 100),
+    "harbor-2": limits(100, 1, 0),
+}
+
+
+class TestAllocateUsers:
+
+    def test_largest_remainder_sums_concurrency(self):
+        assert allocate_users(10, {"a": 33.3, "b": 33.3, "c": 33.4}) == {"a": 3, "b": 3, "c": 4}
+        assert sum(allocate_users(997, {"a": 12.5, "b": 37.5, "c": 50}).values()) == 997
+
+    def test_every_location_gets_one_user(self):
+        assert allocate_users(3, {"a": 90, "b": 5, "c": 5}) == {"a": 1, "b": 1, "c": 1}
+        assert allocate_users(20, {"a": 98, "b": 1, "c": 1}) == {"a": 18, "b": 1, "c": 1}
+
+    def test_percents_not_summing_100(self):
+        assert allocate_users(30, {"a": 1, "b": 2}) == {"a": 10, "b": 20}
+
+
+class TestPlanLoad:
+
+    def test_minimum_engines(self):
+        plan = plan_load(1250, {"us-east1-a": 60, "us-west1-a": 40}, LIMITS)
+        assert plan.error is None
+        assert plan.users == {"us-east1-a": 750, "us-west1-a": 500}
+        assert plan.engines == {"us-east1-a": 8, "us-west1-a": 1}
+
+    def test_reject_exceeded_location(self):
+        plan = plan_load(500, {"us-east1-a": 50, "harbor-1": 50}, LIMITS)
+        assert "Location harbor-1 supports up to 100 users" in plan.error
+
+    def test_adjust_moves_users(self):
+        plan = plan_load(500, {"us-east1-a": 50, "harbor-1": 50}, LIMITS, adjust=True)
+        assert plan.users == {"us-east1-a": 400, "harbor-1": 100}
+        assert plan.concurrency == 500
+        assert plan.adjustments == ["Location harbor-1 limited to 100 users"]
+
+    def test_adjust_reduces_concurrency(self):
+        plan = plan_load(9000, {"us-east1-a": 50, "us-west1-a": 50}, LIMITS, adjust=True)
+        assert plan.users == {"us-east1-a": 2000, "us-west1-a": 5000}
+        assert plan.concurrency == 7000
+
+    def test_location_without_capacity(self):
+        plan = plan_load(100, {"us-east1-a": 50, "harbor-2": 50}, LIMITS)
+        assert plan.error == "Locations without capacity in the workspace: harbor-2"
+        plan = plan_load(100, {"us-east1-a": 50, "harbor-2": 50}, LIMITS, adjust=True)
+        assert plan.users == {"us-east1-a": 100}
+        assert plan.engines == {"us-east1-a": 1}
+        assert plan.adjustments == ["Location harbor-2 left out, it has no capacity"]
+        assert plan_load(100, {"harbor-2": 100}, LIMITS, adjust=True).error is not None
+
+    def test_fewer_users_than_locations(self):
+        percents = {"us-east1-a": 40, "us-west1-a": 30, "harbor-1": 30}
+        assert plan_load(2, percents, LIMITS).error == "3 locations need at least 3 users, 2 requested"
+        plan = plan_load(2, percents, LIMITS, adjust=True)
+        assert plan.users == {"us-east1-a": 1, "us-west1-a": 1, "harbor-1": 1}
+        assert plan.concurrency == sum(plan.users.values()) == 3
+        assert plan.adjustments == ["Concurrency raised from 2 to 3 users, at least 1 user for each location"]
+
+    def test_unknown_location(self):
+        assert plan_load(10, {"eu-west9-z": 100}, LIMITS).error == "Locations not available in the workspace: eu-west9-z"
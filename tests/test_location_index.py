@@ -0,0 +1,26 @@
+from benchmarks import fixtures
+from formatters.workspace import format_workspaces_locations
+from tools.location_index import LocationIndex
+
+
+class TestLocationIndex:
+
+    def test_query_without_filters_matches_formatter(self):
+        workspace = fixtures.make_workspaces(1, locations=12)[0]
+        index = LocationIndex.from_workspace(workspace)
+        for purpose in [None, "load", "functional", "mock"]:
+            assert index.query(purpose) == format_workspaces_locations([workspace], {"purpose": purpose})[0]
+
+    def test_capacity_query(self):
+        index = LocationIndex(1, fixtures.make_locations(20))
+        result = index.query("functional", min_threads_per_engine=400, min_engines=40)
+        locations = result["private"] + result["public"]
+        assert [location["location_id"] for location in locations] == ["harbor-4", "harbor-8", "us-east14-a",
+                                                                          "us-east18-a"]
+        assert all(location["limits"]["test_max_concurrency_per_engine"] >= 400 for location in locations)
+
+    def test_private_only(self):
+        index = LocationIndex(1, fixtures.make_locations(20))
+        result = index.query("mock", private_only=True)
+        assert [location["location_id"] for location in result["private"]] == ["harbor-0", "harbor-12"]
+        assert result["public"] == []
@@ -0,0 +1,469 @@
+import asyncio
+
+from benchmarks.fixtures import BASE_TIMESTAMP
+from config.token import BzmToken
+from tools.account_manager import AccountManager
+from tools.execution_manager import ExecutionManager
+from tools.project_manager import ProjectManager
+from tools.report_manager import ReportManager
+from tools.test_manager import TestManager
+from tools.user_manager import UserManager
+from tools.workspace_manager import WorkspaceManager
+from models.performance_test import PerformanceTestObject
+
+TOKEN = BzmToken("test", "test")
+
+
+class TestManagersWithMockApi:
+
+    def test_user_read(self, mock_api):
+        result = asyncio.run(UserManager(TOKEN, None).read())
+        assert result.error is None
+        assert result.result[0].default_project_id == 10101
+
+    def test_account_read_without_ai_consent(self, mock_api):
+        result = asyncio.run(AccountManager(TOKEN, None).read(2))
+        assert "does not have AI consent" in result.error
+
+    def test_workspace_list_paging(self, mock_api):
+        result = asyncio.run(WorkspaceManager(TOKEN, None).list(1, limit=4, offset=0))
+        assert [workspace.workspace_id for workspace in result.result] == [101, 102, 103, 104]
+        assert result.total == 10
+        assert result.has_more is True
+
+    def test_project_read_counts_tests(self, mock_api):
+        result = asyncio.run(ProjectManager(TOKEN, None).read(10101))
+        assert result.result[0].tests_count == 10
+
+    def test_test_configure_load(self, mock_api):
+        performance_test = PerformanceTestObject.from_args({"test_id": 10101001, "concurrency": 40})
+        result = asyncio.run(TestManager(TOKEN, None).configure(performance_test))
+        assert result.result[0].override_executions[0]["concurrency"] == 40
+        assert result.result[0].override_executions[0]["locations"] == {"us-east1-a": 40}
+
+    def test_execution_read_with_status(self, mock_api):
+        result = asyncio.run(ExecutionManager(TOKEN, None).read(10101001001))
+        execution = result.result[0]["result"]
+        assert execution.execution_status_detailed.execution_step == "ENDED"
+
+    def test_report_read_request_stats(self, mock_api):
+        mock_api.settings.report_rows = 3
+        result = asyncio.run(ReportManager(TOKEN, None).read_request_stats(10101001001))
+        assert [row["labelId"] for row in result.result] == ["label-0", "label-1", "label-2"]
+
+    def test_invalid_credentials(self, mock_api):
+        mock_api.settings.error_rate = 1.0
+        mock_api.settings.error_status = 401
+        result = asyncio.run(UserManager(TOKEN, None).read())
+        assert result.error == "Invalid credentials"
+
+    def test_user_snapshot(self, mock_api):
+        mock_api.settings.rows = 3
+        user_manager = UserManager(TOKEN, None)
+        result = asyncio.run(user_manager.snapshot(max_depth=4, max_children=2, refresh=True))
+        snapshot = result.result[0]
+        consented, not_consented = snapshot["accounts"]
+        assert not_consented == {"account_id": 2, "account_name": "Account 2", "ai_consent": False}
+        assert consented["workspaces_total"] == 3
+        assert [workspace["workspace_id"] for workspace in consented["workspaces"]] == [101, 102]
+        assert consented["workspaces"][0]["projects"][0]["tests"][1] == {"test_id": 10101002, "test_name": "Test 10101002"}
+
+        requests_count = mock_api.requests_count
+        matches = asyncio.run(user_manager.snapshot(max_depth=4, max_children=2, search="test 10102001")).result
+        assert mock_api.requests_count == requests_count  # Served from the cached snapshot
+        assert matches == [{"account_id": 1, "workspace_id": 101, "project_id": 10102,
+                            "test_id": 10102001, "test_name": "Test 10102001"}]
+
+    def test_user_snapshot_limits(self, mock_api, monkeypatch):
+        import tools.bridge
+        import tools.user_manager
+        mock_api.settings.rows = 3
+        read_account = tools.bridge.read_account
+
+        async def failing_read_account(token, ctx, account_id):
+            if account_id == 2:
+                raise RuntimeError("Connection lost")
+            return await read_account(token, ctx, account_id)
+
+        monkeypatch.setattr(tools.bridge, "read_account", failing_read_account)
+        monkeypatch.setattr(tools.user_manager, "SNAPSHOT_MAX_REQUESTS", 3)
+        user_manager = UserManager(TOKEN, None)
+        result = asyncio.run(user_manager.snapshot(max_depth=3, max_children=2, refresh=True))
+        snapshot = result.result[0]
+        consented, failed = snapshot["accounts"]
+        assert failed == {"account_id": 2, "account_name": "Account 2", "error": "RuntimeError: Connection lost"}
+        # Accounts, workspaces and one projects list, the other workspace is not expanded
+        workspaces = consented["workspaces"]
+        assert sorted("projects" in workspace for workspace in workspaces) == [False, True]
+        assert any(workspace.get("projects_error", "").startswith("Not listed") for workspace in workspaces)
+        assert snapshot["not_expanded"] == 1 and "1 elements were not expanded" in result.warning[0]
+
+        result = asyncio.run(user_manager.snapshot(max_depth=1, max_children=0, refresh=True))
+        assert len(result.result[0]["accounts"]) == 1  # max_children is at least 1
+
+    def test_test_read_many(self, mock_api):
+        result = asyncio.run(TestManager(TOKEN, None).read_many([10101002, 10101999, 10101001, 10101002]))
+        assert [element["test_id"] for element in result.result] == [10101002, 10101999, 10101001, 10101002]
+        assert result.result[0]["result"].test_id == 10101002
+        assert "404" in result.result[1]["error"]
+        # Three different tests plus a single validation of their shared project hierarchy
+        assert mock_api.requests_count == 3 + 4
+
+    def test_project_read_many(self, mock_api):
+        result = asyncio.run(ProjectManager(TOKEN, None).read_many([10101, 20101]))
+        assert result.result[0]["result"].tests_count == 10
+        assert "does not have AI consent" in result.result[1]["error"]
+
+    def test_execution_read_many(self, mock_api):
+        result = asyncio.run(ExecutionManager(TOKEN, None).read_many([10101001001, 10101001002]))
+        executions = [element["result"] for element in result.result]
+        assert [execution.execution_id for execution in executions] == [10101001001, 10101001002]
+        assert executions[1].execution_status_detailed.execution_step == "ENDED"
+
+    def test_test_configure_bulk(self, mock_api):
+        mock_api.settings.rows = 3
+        test_manager = TestManager(TOKEN, None)
+        asyncio.run(test_manager.configure(PerformanceTestObject.from_args({"test_id": 10101001, "concurrency": 40})))
+
+        result = asyncio.run(test_manager.configure_bulk({"concurrency": 40}, project_id=10101))
+        assert [report["status"] for report in result.result] == ["unchanged", "updated", "updated"]
+        assert {report["test_id"] for report in result.result} == {10101001, 10101002, 10101003}
+        assert result.result[1]["override_executions"][0]["locations"] == {"us-east1-a": 40}
+
+        result = asyncio.run(test_manager.configure_bulk({"concurrency": 40}, test_ids=[10101002, 10101999]))
+        assert result.result[0] == {"test_id": 10101002, "status": "unchanged"}
+        assert result.result[1]["status"] == "error"
+
+    def test_test_configure_bulk_project_over_limit(self, mock_api, monkeypatch):
+        import tools.test_manager
+        monkeypatch.setattr(tools.test_manager, "MAX_BULK_TESTS", 2)
+        mock_api.settings.rows = 3
+        test_manager = TestManager(TOKEN, None)
+
+        result = asyncio.run(test_manager.configure_bulk({"concurrency": 40}, project_id=10101))
+        assert [report["test_id"] for report in result.result] == [10101001, 10101002]
+        assert "3 tests, 1 were not configured" in result.warning[0] and "offset=2" in result.warning[0]
+        result = asyncio.run(test_manager.configure_bulk({"concurrency": 40}, project_id=10101, offset=2))
+        assert [report["test_id"] for report in result.result] == [10101003]
+        assert result.warning is None
+
+    def test_test_configure_bulk_plans_concurrently(self, mock_api, monkeypatch):
+        mock_api.settings.rows = 4
+        plan_locations = TestManager._plan_locations
+        running = []
+        concurrency = []
+
+        async def slow_plan_locations(self, override_executions, workspace_id, adjust=False):
+            running.append(workspace_id)
+            concurrency.append(len(running))
+            await asyncio.sleep(0.05)
+            running.pop()
+            return await plan_locations(self, override_executions, workspace_id, adjust)
+
+        monkeypatch.setattr(TestManager, "_plan_locations", slow_plan_locations)
+        result = asyncio.run(TestManager(TOKEN, None).configure_bulk({"concurrency": 30}, project_id=10101,
+                                                                     max_concurrency=2))
+        assert [report["status"] for report in result.result] == ["updated"] * 4
+        assert max(concurrency) == 2
+
+    def test_execution_start_plan_staggered(self, mock_api):
+        mock_api.settings.boot_time = 0.2
+        result = asyncio.run(ExecutionManager(TOKEN, None).start_plan(
+            [10101001, 10101002, 10101999], stagger_seconds=0.1, poll_interval=0.05))
+        first, second, missing = result.result
+        assert first["status"] == second["status"] == "released"
+        assert first["boot_seconds"] >= 0.2
+        assert round(second["released_seconds"] - first["released_seconds"], 1) >= 0.1
+        assert missing["status"] == "error"
+        assert mock_api.boots == {}  # Every started execution was released
+
+    def test_execution_start_plan_boot_timeout(self, mock_api):
+        mock_api.settings.boot_time = 10
+        result = asyncio.run(ExecutionManager(TOKEN, None).start_plan([10101001], boot_timeout=0.1,
+                                                                      poll_interval=0.05))
+        report = result.result[0]
+        assert report["status"] == "boot_timeout" and report["running"]
+        assert report["ready_percent"] < 100
+        assert len(mock_api.boots) == 1
+        assert "release_plan" in result.info[1]
+
+        # The plan continues in a following call
+        mock_api.settings.boot_time = 0
+        result = asyncio.run(ExecutionManager(TOKEN, None).release_plan([report["execution_id"], 10101001999],
+                                                                        poll_interval=0.05))
+        released, missing = result.result
+        assert released["status"] == "released" and "running" not in released
+        assert missing["status"] == "error" and "running" not in missing
+        assert mock_api.boots == {}
+
+    def test_workspace_read_locations_query(self, mock_api):
+        workspace_manager = WorkspaceManager(TOKEN, None)
+        result = asyncio.run(workspace_manager.read_locations(101, "load", min_threads_per_engine=500))
+        assert [location["location_id"] for location in result.result[0]["private"]] == ["harbor-4"]
+        assert [location["location_id"] for location in result.result[0]["public"]] == ["us-east9-a", "us-east14-a",
+                                                                                         "us-east19-a"]
+        requests_count = mock_api.requests_count
+        result = asyncio.run(workspace_manager.read_locations(101, "mock", private_only=True))
+        assert mock_api.requests_count == requests_count  # Indexed locations and cached account validation
+        assert [location["location_id"] for location in result.result[0]["private"]] == ["harbor-0", "harbor-12"]
+
+    def test_test_configure_locations_plan(self, mock_api):
+        test_manager = TestManager(TOKEN, None)
+        configuration = {"test_id": 10101001, "concurrency": 5000, "locations": ["us-east1-a=50", "us-east2-a=50"]}
+        result = asyncio.run(test_manager.configure(PerformanceTestObject.from_args(configuration)))
+        assert "Location us-east1-a supports up to 2000 users" in result.error
+
+        result = asyncio.run(test_manager.configure(PerformanceTestObject.from_args(configuration), adjust_plan=True))
+        assert result.result[0].override_executions[0]["locations"] == {"us-east1-a": 2000, "us-east2-a": 3000}
+        assert result.info[0] == ("Load plan for 5000 users. us-east1-a: 2000 users in 10 engines, "
+                                  "us-east2-a: 3000 users in 10 engines")
+
+    def test_report_analyze_errors(self, mock_api):
+        mock_api.settings.report_rows = 20
+        result = asyncio.run(ReportManager(TOKEN, None).analyze_errors(10101001001, top_k=2))
+        analysis = result.result[0]
+        assert analysis["groups"] == 3  # Not Found, Internal Server Error and assertion failures
+        assert analysis["top"][0]["signature"] == "Not Found /api/items/<n>?session=<*>"
+        assert analysis["top"][0]["count"] == sum(range(1, 21))
+
+    def test_report_request_stats_cursor_paging(self, mock_api):
+        mock_api.settings.report_rows = 30
+        report_manager = ReportManager(TOKEN, None)
+        first_page = asyncio.run(report_manager.read_request_stats(10101001001, limit=20, sort="-avgResponseTime"))
+        assert first_page.total == 30
+        assert first_page.has_more is True
+        assert first_page.result[0]["labelId"] == "label-29"
+        requests_count = mock_api.requests_count
+
+        cursor = first_page.info[0].split("cursor=")[1].split(" ")[0]
+        second_page = asyncio.run(report_manager.read_request_stats(10101001001, limit=20, cursor=cursor,
+                                                                    sort="-avgResponseTime"))
+        assert mock_api.requests_count == requests_count  # Served from memory
+        assert [row["labelId"] for row in second_page.result] == [f"label-{label}" for label in range(9, -1, -1)]
+        assert second_page.has_more is False
+
+        other_query = asyncio.run(report_manager.read_request_stats(10101001001, cursor=cursor))
+        assert "different query" in other_query.error
+
+    def test_report_errors_filters(self, mock_api):
+        mock_api.settings.report_rows = 30
+        result = asyncio.run(ReportManager(TOKEN, None).read_error(10101001001, limit=3, sort="-errors",
+                                                                   label="items/2", response_code=404))
+        assert [row["labelId"] for row in result.result] == ["label-29", "label-28", "label-27"]
+        assert result.total == 11  # label-2 and label-20 to label-29
+
+    def test_report_read_timeline(self, mock_api):
+        mock_api.settings.timeline_points = 1000
+        result = asyncio.run(ReportManager(TOKEN, None).read_timeline(10101001001, max_points=50, labels=["ALL"],
+                                                                      start_offset=100))
+        series = result.result
+        assert [label["label_id"] for label in series] == ["ALL"]
+        assert series[0]["points_total"] == 990
+        assert len(series[0]["points"]) == 50
+        assert max(point["avg_rt"] for point in series[0]["points"]) > 1000  # The spike is kept
+
+    def test_report_read_timeline_window(self, mock_api):
+        mock_api.settings.timeline_points = 1000
+        result = asyncio.run(ReportManager(TOKEN, None).read_timeline(10101001001, labels="items", start_offset=100,
+                                                                      end_offset=200))
+        series = result.result
+        # A single label text is not matched character by character
+        assert [label["label_id"] for label in series] == ["label-0", "label-1"]
+        # The offsets are from the start of the master, the same window for all the labels
+        started = BASE_TIMESTAMP + 3600
+        for label in series:
+            assert label["points_total"] == 11
+            assert [point["ts"] for point in label["points"]] == list(range(started + 100, started + 201, 10))
+
+    def test_report_read_timeline_bounds(self, mock_api, monkeypatch):
+        import tools.report_manager
+        monkeypatch.setattr(tools.report_manager, "TIMELINE_MAX_POINTS_LIMIT", 20)
+        mock_api.settings.timeline_points = 1000
+        report_manager = ReportManager(TOKEN, None)
+        result = asyncio.run(report_manager.read_timeline(10101001001, max_points=3, method="minmax", labels=["ALL"]))
+        assert len(result.result[0]["points"]) <= 4
+        result = asyncio.run(report_manager.read_timeline(10101001001, max_points=100000, labels=["ALL"]))
+        assert len(result.result[0]["points"]) == 20
+
+    def test_report_read_trend(self, mock_api):
+        result = asyncio.run(ReportManager(TOKEN, None).read_trend(10101001, last=5, window=2))
+        trend = result.result[0]
+        execution_ids = [row[0] for row in trend["rows"]]
+        assert execution_ids == [10101001006, 10101001007, 10101001008, 10101001009, 10101001010]
+        assert trend["columns"][:3] == ["execution_id", "created", "avg_rt"]
+        assert len(trend["trends"]["avg_rt"]["moving_average"]) == 5
+        assert trend["errors"] == []
+
+        label_result = asyncio.run(ReportManager(TOKEN, None).read_trend(10101001, last=3, label="items/1"))
+        assert label_result.result[0]["trends"]["avg_rt"]["direction"] == "stable"
+        assert label_result.result[0]["rows"][0][2] == 101.0
+
+    def test_report_results_store(self, mock_api, tmp_path, monkeypatch):
+        import tools.results_store
+        from tools.results_store import ResultsStore
+        monkeypatch.setattr(tools.results_store, "_store", ResultsStore(str(tmp_path / "results.db")))
+        report_manager = ReportManager(TOKEN, None)
+
+        ingestion = asyncio.run(report_manager.ingest_results(10101001)).result[0]
+        assert ingestion["ingested"] == 10 and ingestion["errors"] == []
+        requests_count = mock_api.requests_count
+        assert asyncio.run(report_manager.ingest_results(10101001)).result[0]["ingested"] == 0
+        assert mock_api.requests_count - requests_count < 10  # No report is downloaded again
+
+        summary = asyncio.run(report_manager.query_results(test_id=10101001, limit=3)).result[0]
+        assert len(summary["rows"]) == 3
+        labels = asyncio.run(report_manager.query_results("labels", label="items/49")).result[0]
+        assert len(labels["rows"]) == 10
+        assert asyncio.run(report_manager.query_results("other")).error
+
+    def test_report_results_store_ingests_the_oldest_first(self, mock_api, tmp_path, monkeypatch):
+        import tools.report_manager
+        import tools.results_store
+        from tools.results_store import ResultsStore
+        monkeypatch.setattr(tools.results_store, "_store", ResultsStore(str(tmp_path / "results.db")))
+        monkeypatch.setattr(tools.report_manager, "RESULTS_STORE_MAX_INGEST", 4)
+        report_manager = ReportManager(TOKEN, None)
+
+        ingestions = [asyncio.run(report_manager.ingest_results(10101001)) for _ in range(4)]
+        assert [(ingestion.result[0]["ingested"], ingestion.result[0]["pending"]) for ingestion in ingestions] == [
+            (4, 6), (4, 2), (2, 0), (0, 0)]
+        assert ingestions[0].info and not ingestions[2].info
+        summary = asyncio.run(report_manager.query_results(test_id=10101001, limit=50)).result[0]
+        assert len(summary["rows"]) == 10
+
+    def test_report_ended_execution_cached(self, mock_api):
+        report_manager = ReportManager(TOKEN, None)
+        first = asyncio.run(report_manager.read_summary(10101001001))
+        stats = asyncio.run(report_manager.read_request_stats(10101001001, limit=5))
+        errors = asyncio.run(report_manager.analyze_errors(10101001001))
+        ReportManager.reports.clear()
+
+        requests_count = mock_api.requests_count
+        asyncio.run(ExecutionManager(TOKEN, None).read(10101001001))
+        validation_requests = mock_api.requests_count - requests_count
+
+        requests_count = mock_api.requests_count
+        assert asyncio.run(report_manager.read_summary(10101001001)).result == first.result
+        assert asyncio.run(report_manager.read_request_stats(10101001001, limit=5)).result == stats.result
+        assert asyncio.run(report_manager.analyze_errors(10101001001)).result == errors.result
+        # Only the execution validations, the reports come from the disk cache
+        assert mock_api.requests_count - requests_count == 3 * validation_requests
+
+        # Running executions are always read from BlazeMeter
+        execution_id = asyncio.run(ExecutionManager(TOKEN, None).start(10101001)).result[0].execution_id
+        requests_count = mock_api.requests_count
+        asyncio.run(report_manager.read_summary(execution_id))
+        asyncio.run(report_manager.read_summary(execution_id))
+        assert mock_api.requests_count - requests_count == 2 * (validation_requests + 1)
+
+    def test_warm_up_prefetch_user(self, mock_api):
+        from tools.warmup import prefetch_user
+        asyncio.run(prefetch_user(TOKEN))
+        requests_count = mock_api.requests_count
+
+        async def first_calls():
+            return await asyncio.gather(UserManager(TOKEN, None).read(), AccountManager(TOKEN, None).read(1),
+                                        WorkspaceManager(TOKEN, None).read(101))
+
+        assert not any(result.error for result in asyncio.run(first_calls()))
+        assert mock_api.requests_count == requests_count  # Served from the HTTP cache
+
+    def test_help_read_pages_concurrently(self, mock_api, mock_server, monkeypatch):
+        import time
+        import tools.help_manager
+        from tools.help_index import HelpIndex
+        from tools.help_manager import HelpManager
+        monkeypatch.setattr(tools.help_manager, "HELP_BASE_CONTENT_URL", mock_server.help_base_url)
+        monkeypatch.setattr(HelpManager, "help_index", HelpIndex())  # Only the pages are read
+        mock_api.settings.latency = 0.3
+
+        start = time.monotonic()
+        result = asyncio.run(HelpManager(TOKEN, None).read_help_info(
+            "guide", "", ["page-1", "missing-page", "page-2", "page-3"]))
+        elapsed = time.monotonic() - start
+        help_results = result.result[0]["help_results"]
+        assert [page["help_id"] for page in help_results] == ["page-1", "missing-page", "page-2", "page-3"]
+        assert help_results[0]["help_result"]["help_content"].startswith("# page-1")
+        assert help_results[1]["help_result"] == "Error:Page not found"
+        assert elapsed < 0.9  # Not one after another
+
+    def test_help_read_sections_from_cached_page(self, mock_api, mock_server, monkeypatch):
+        import tools.help_manager
+        from tools.help_index import HelpIndex
+        from tools.help_manager import HelpManager
+        monkeypatch.setattr(tools.help_manager, "HELP_BASE_CONTENT_URL", mock_server.help_base_url)
+        monkeypatch.setattr(HelpManager, "help_index", HelpIndex())
+
+        full = asyncio.run(HelpManager(TOKEN, None).read_help_info("guide", "", ["page-1"]))
+        requests_count = mock_api.requests_count
+        result = asyncio.run(HelpManager(TOKEN, None).read_help_info(
+            "guide", "", ["page-1"], section="Section 2 > Parameters"))
+        help_result = result.result[0]["help_results"][0]["help_result"]
+        assert help_result["sections"] == ["page-1 > Section 2 > Parameters of section 2"]
+        assert "param_2_1" in help_result["help_content"] and "param_1_1" not in help_result["help_content"]
+        assert len(help_result["help_content"]) < len(full.result[0]["help_results"][0]["help_result"]["help_content"])
+        result = asyncio.run(HelpManager(TOKEN, None).read_help_info("guide", "", ["page-1"], query="param_4_3"))
+        assert result.result[0]["help_results"][0]["help_result"]["sections"] == [
+            "page-1 > Section 4 > Parameters of section 4"]
+        assert mock_api.requests_count == requests_count  # Sections read from the converted page
+
+    def test_help_bundle_offline_and_revalidated(self, mock_api, mock_server, monkeypatch, tmp_path):
+        import tools.help_bundle
+        import tools.help_manager
+        from tools.help_bundle import snapshot_help
+        from tools.help_manager import HelpManager
+        help_base_url = mock_server.help_base_url
+        monkeypatch.setattr(tools.help_manager, "HELP_BASE_CONTENT_URL", help_base_url)
+        monkeypatch.setattr(tools.help_manager, "HELP_TOC_URL", f"{help_base_url}/Data/Tocs/")
+        monkeypatch.setattr(tools.help_manager, "HELP_INDEX_URL", f"{help_base_url}/Data/Tocs/azure_toc_public.js")
+        mock_api.settings.help_pages = 12
+        bundle_path = str(tmp_path / "help_bundle.bin")
+        assert asyncio.run(snapshot_help(bundle_path)) == 12
+        monkeypatch.setattr(tools.help_bundle, "HELP_BUNDLE_PATH", bundle_path)
+        monkeypatch.setattr(tools.help_bundle, "_bundle", None)
+        monkeypatch.setattr(HelpManager, "help_index", None)
+
+        # Offline, the bundled index and pages are used
+        offline_url = "http://127.0.0.1:1/docs"
+        monkeypatch.setattr(tools.help_manager, "HELP_BASE_CONTENT_URL", offline_url)
+        monkeypatch.setattr(tools.help_manager, "HELP_INDEX_URL", f"{offline_url}/Data/Tocs/azure_toc_public.js")
+        categories = asyncio.run(HelpManager(TOKEN, None).list_help_categories()).result
+        assert categories[0]["category"] == "guide"
+        result = asyncio.run(HelpManager(TOKEN, None).read_help_info(
+            "apidocs", "section-1", ["page-1"], section="Section 3"))
+        help_result = result.result[0]["help_results"][0]["help_result"]
+        assert "param_3_1" in help_result["help_content"]
+        assert help_result["help_url"] == f"{offline_url}/section-1/page-1.html"
+
+        # Online, the bundled page is revalidated and not downloaded again
+        HelpManager.help_pages.clear()
+        monkeypatch.setattr(tools.help_manager, "HELP_BASE_CONTENT_URL", help_base_url)
+        downloaded = []
+        original_format = tools.help_manager.format_help_page
+        monkeypatch.setattr(tools.help_manager, "format_help_page",
+                            lambda *args: downloaded.append(args) or original_format(*args))
+        requests_count = mock_api.requests_count
+        result = asyncio.run(HelpManager(TOKEN, None).read_help_info("guide", "", ["page-0", "page-100"]))
+        help_results = result.result[0]["help_results"]
+        assert help_results[0]["help_result"]["help_content"].startswith("# page-0")
+        assert help_results[1]["help_result"]["help_content"].startswith("# page-100")
+        assert mock_api.requests_count == requests_count + 2
+        assert len(downloaded) == 1  # Only the page missing in the bundle
+
+    def test_help_index_loaded_from_toc(self, mock_api, mock_server, monkeypatch):
+        import tools.help_manager
+        from tools.help_manager import HelpManager
+        monkeypatch.setattr(tools.help_manager, "HELP_TOC_URL", f"{mock_server.help_base_url}/Data/Tocs/")
+        monkeypatch.setattr(tools.help_manager, "HELP_INDEX_URL",
+                            f"{mock_server.help_base_url}/Data/Tocs/azure_toc_public.js")
+        monkeypatch.setattr(HelpManager, "help_index", None)
+
+        categories = asyncio.run(HelpManager(TOKEN, None).list_help_categories()).result
+        assert [category["category"] for category in categories] == [
+            "guide", "apidocs", "release-notes", "functional"]
+        requests_count = mock_api.requests_count
+        content = asyncio.run(HelpManager(TOKEN, None).list_help_category_content(
+            "apidocs", ["section-1", "missing"])).result
+        assert content[0][0] == {"title": "Page 1", "help_id": "page-1", "help_tree_id": 1}
+        assert content[1].warning
+        assert mock_api.requests_count == requests_count  # The index is loaded once
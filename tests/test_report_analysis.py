@@ -0,0 +1,47 @@
+from tools.report_analysis import ErrorReportAnalyzer, normalize_message
+
+
+class TestNormalizeMessage:
+
+    def test_masks_variable_parts(self):
+        assert normalize_message("Not Found /api/items/42?session=7919&lang=en") == \
+               "Not Found /api/items/<n>?session=<*>&lang=<*>"
+        assert normalize_message("Expected 200 got 404 at 2025-01-01T10:00:00Z") == "Expected <n> got <n> at <timestamp>"
+        assert normalize_message("Order 3f2b8c1e-0a4d-4c9e-9b7f-1d2e3f4a5b6c failed for a@b.com") == \
+               "Order <uuid> failed for <email>"
+        assert normalize_message("token 5f4dcc3b5aa765d61d8327deb882cf99  expired") == "token <hex> expired"
+
+    def test_empty_message(self):
+        assert normalize_message(None) == ""
+
+
+class TestErrorReportAnalyzer:
+
+    def test_groups_by_signature(self):
+        analyzer = ErrorReportAnalyzer(max_samples=2)
+        analyzer.add_report([
+            {"name": f"GET /api/items/{label}", "errors": [
+                {"m": f"Not Found /api/items/{label}?session={label * 7}", "rc": "404", "count": 2},
+                {"m": "Internal Server Error", "rc": "500", "count": 1},
+            ], "assertions": [], "failedEmbeddedResources": []}
+            for label in range(10)
+        ])
+        analysis = analyzer.top(top_k=1)
+        assert analysis["total_errors"] == 30
+        assert analysis["groups"] == 2
+        assert analysis["top"] == [{
+            "type": "error", "label": "GET /api/items/<n>", "response_code": "404",
+            "signature": "Not Found /api/items/<n>?session=<*>", "count": 20, "percent": 66.67,
+            "samples": ["Not Found /api/items/0?session=0", "Not Found /api/items/1?session=7"],
+        }]
+
+    def test_bounded_groups(self):
+        analyzer = ErrorReportAnalyzer(max_groups=3)
+        analyzer.add("error", "label", "500", "Frequent error", 100)
+        for code in range(10):
+            analyzer.add("error", "label", code, "Rare error")
+        analysis = analyzer.top(top_k=2)
+        assert analysis["groups"] == 3
+        assert analysis["evicted_groups"] == 8
+        assert analysis["top"][0]["count"] == 100
+        assert analysis["top"][1]["max_count_error"] > 0
@@ -0,0 +1,64 @@
+import asyncio
+import os
+
+import tools.result_cache
+from tools.result_cache import ResultCache, iter_rows
+
+
+def report(rows):
+    return {"result": [{"labelId": f"label-{row}", "avgResponseTime": row} for row in range(rows)], "total": rows}
+
+
+class TestResultCache:
+
+    def test_store_and_reload(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        asyncio.run(cache.store("key", 1, "summary", report(3)))
+        assert asyncio.run(cache.get("key", 1, "summary")) == report(3)
+        assert asyncio.run(cache.get("other", 1, "summary")) is None
+        assert asyncio.run(cache.get("key", 1, "errorsreport")) is None
+
+        # A new instance finds the files of the previous one
+        reloaded = ResultCache(str(tmp_path))
+        assert asyncio.run(reloaded.get("key", 1, "summary")) == report(3)
+        assert reloaded.size == cache.size > 0
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        asyncio.run(cache.store("key", 1, "summary", report(100)))
+        cache.max_bytes = cache.size * 2 + 10
+        asyncio.run(cache.store("key", 2, "summary", report(100)))
+        assert asyncio.run(cache.get("key", 1, "summary")) is not None  # Now the most recently used
+        asyncio.run(cache.store("key", 3, "summary", report(100)))
+        assert asyncio.run(cache.get("key", 2, "summary")) is None
+        assert asyncio.run(cache.get("key", 1, "summary")) is not None
+        assert cache.size <= cache.max_bytes
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_corrupted_file_and_disabled(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        asyncio.run(cache.store("key", 1, "summary", report(1)))
+        with open(os.path.join(tmp_path, cache.file_name("key", 1, "summary")), "wb") as file:
+            file.write(b"not gzip")
+        assert asyncio.run(cache.get("key", 1, "summary")) is None
+        assert os.listdir(tmp_path) == []
+
+        disabled = ResultCache("")
+        asyncio.run(disabled.store("key", 1, "summary", report(1)))
+        assert asyncio.run(disabled.get("key", 1, "summary")) is None
+        assert disabled.writer("key", 1, "summary") is None
+
+    def test_writer_streams_rows_in_members(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tools.result_cache, "RESULT_CACHE_MEMBER_BYTES", 200)
+        cache = ResultCache(str(tmp_path))
+
+        async def write():
+            writer = cache.writer("key", 1, "errorsreport")
+            for row in report(50)["result"]:
+                writer.add(row)
+            await writer.close()
+            return len(writer._members)
+
+        assert asyncio.run(write()) > 1
+        assert asyncio.run(cache.get("key", 1, "errorsreport")) == report(50)
+        assert list(iter_rows(cache.locate("key", 1, "errorsreport"))) == report(50)["result"]
@@ -0,0 +1,49 @@
+from tools.results_store import ResultsStore
+
+
+def add_execution(store, token_id, execution_id, created, status="pass", avg_rt=100.0):
+    store.add_execution(
+        token_id,
+        {"execution_id": execution_id, "test_id": 1, "created": created, "updated": created + 10,
+         "ended": created + 10, "status": status},
+        {"avg_rt": avg_rt, "hits": 1000, "failed": 10, "error_rate": 1.0},
+        [{"label_id": "label-0", "label_name": "GET /home", "samples": 100, "avg_rt": avg_rt},
+         {"label_id": "label-1", "label_name": "POST /login_form", "samples": 50, "avg_rt": avg_rt * 2}],
+        [{"type": "error", "label": "GET /home", "response_code": "500", "signature": "Internal Server Error",
+          "count": 3}]
+    )
+
+
+class TestResultsStore:
+
+    def test_query_filters(self, tmp_path):
+        store = ResultsStore(str(tmp_path / "results.db"))
+        add_execution(store, "key", 1, 1000, "pass", 100.0)
+        add_execution(store, "key", 2, 2000, "fail", 200.0)
+        add_execution(store, "other", 3, 3000)
+
+        summary = store.query("key")
+        assert [row[0] for row in summary["rows"]] == [2, 1]
+        assert summary["columns"][4] == "avg_rt" and summary["rows"][0][4] == 200.0
+        assert [row[0] for row in store.query("key", status="fail")["rows"]] == [2]
+        assert [row[0] for row in store.query("key", start=1500)["rows"]] == [2]
+        assert [row[0] for row in store.query("key", end=1500)["rows"]] == [1]
+
+        labels = store.query("key", "labels", label="login_")
+        assert [row[5] for row in labels["rows"]] == ["POST /login_form"] * 2
+        assert store.query("key", "labels", label="%")["rows"] == []
+        assert store.query("key", "errors", test_id=1)["rows"][0][-1] == 3
+        store.close()
+
+    def test_replace_and_ingestion_mark(self, tmp_path):
+        store = ResultsStore(str(tmp_path / "results.db"))
+        add_execution(store, "key", 1, 1000)
+        add_execution(store, "key", 1, 1000, avg_rt=150.0)
+        assert len(store.query("key", "labels")["rows"]) == 2
+        assert store.query("key")["rows"][0][4] == 150.0
+
+        assert store.last_updated("key", 1) == 0
+        store.set_last_updated("key", 1, 1010)
+        store.set_last_updated("key", 1, 900)
+        assert store.last_updated("key", 1) == 1010
+        store.close()
@@ -0,0 +1,34 @@
+import math
+
+from tools.timeline import downsample, lttb, minmax
+
+
+class TestDownsampling:
+
+    def test_lttb_keeps_ends_and_spike(self):
+        xs = list(range(1000))
+        ys = [math.sin(x / 50) for x in xs]
+        ys[500] = 10
+        indexes = lttb(xs, ys, 100)
+        assert len(indexes) == 100
+        assert indexes[0] == 0 and indexes[-1] == 999
+        assert 500 in indexes
+        assert indexes == sorted(indexes)
+
+    def test_minmax_keeps_extremes(self):
+        ys = [float(x % 7) for x in range(1000)]
+        ys[321] = -5
+        indexes = minmax(ys, 50)
+        assert len(indexes) <= 50
+        assert 321 in indexes
+        assert indexes == sorted(indexes)
+
+    def test_small_series_unchanged(self):
+        points = [{"ts": ts, "avg_rt": ts} for ts in range(10)]
+        assert downsample(points, 10, "avg_rt") == points
+        assert lttb([1, 2], [1, 2], 1) == [0, 1]
+
+    def test_downsample_method_minimum(self):
+        points = [{"ts": ts, "avg_rt": ts % 5} for ts in range(100)]
+        assert len(downsample(points, 1, "avg_rt")) == 3
+        assert 2 <= len(downsample(points, 3, "avg_rt", "minmax")) <= 4
@@ -0,0 +1,22 @@
+from tools.trend import metric_trend, moving_average, outliers, slope
+
+
+class TestTrend:
+
+    def test_slope(self):
+        assert slope([1, 3, 5, 7]) == 2
+        assert slope([5, None, 5]) == 0
+        assert slope([None, 1]) is None
+
+    def test_moving_average(self):
+        assert moving_average([1, 2, 3, 4, 5], 2) == [1, 1.5, 2.5, 3.5, 4.5]
+        assert moving_average([None, 2, None, 4], 3) == [None, 2, 2, 3]
+
+    def test_outliers(self):
+        assert outliers([100, 102, 98, 101, 500, 99]) == [False, False, False, False, True, False]
+        assert outliers([1, 2]) == [False, False]
+
+    def test_metric_trend_direction(self):
+        assert metric_trend([100, 110, 120, 130])["direction"] == "increasing"
+        assert metric_trend([100, 101, 100, 101])["direction"] == "stable"
+        assert metric_trend([None])["direction"] == "unknown"
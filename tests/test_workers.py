@@ -0,0 +1,61 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import tools.workers
+from tools.instrumentation import metrics
+from tools.workers import monitor_loop_lag, offload, shutdown_workers
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+@pytest.fixture
+def worker_pool(monkeypatch):
+    def configure(kind: str):
+        shutdown_workers()
+        monkeypatch.setattr(tools.workers, "WORKER_POOL", kind)
+    yield configure
+    shutdown_workers()
+
+
+class TestWorkers:
+
+    def test_offloads_large_inputs(self, worker_pool):
+        worker_pool("thread")
+        metrics.reset()
+
+        async def run():
+            return (await offload(thread_name, size=10),
+                    await offload(thread_name, size=tools.workers.OFFLOAD_MIN_BYTES),
+                    await offload(thread_name, rows=tools.workers.OFFLOAD_MIN_ROWS))
+
+        small, large, many_rows = asyncio.run(run())
+        assert small == threading.current_thread().name
+        assert large.startswith("bzm-mcp-worker") and many_rows.startswith("bzm-mcp-worker")
+        assert metrics.worker_tasks == {"inline": 1, "offloaded": 2}
+
+    def test_process_pool_and_disabled_pool(self, worker_pool):
+        worker_pool("process")
+        assert asyncio.run(offload(os.getpid, rows=10 ** 6)) != os.getpid()
+        worker_pool("none")
+        assert asyncio.run(offload(thread_name, rows=10 ** 6)) == threading.current_thread().name
+
+    def test_monitor_loop_lag(self):
+        metrics.reset()
+
+        async def run():
+            monitor = asyncio.create_task(monitor_loop_lag(0.01))
+            await asyncio.sleep(0.02)
+            time.sleep(0.2)  # Blocks the event loop
+            await asyncio.sleep(0.02)
+            monitor.cancel()
+
+        asyncio.run(run())
+        assert metrics.loop_lag.count >= 2
+        assert metrics.loop_lag.max >= 0.15
+        assert metrics.snapshot()["event_loop_lag_ms"]["max"] >= 150
@@ -8,6 +8,7 @@ from config.token import BzmToken
 from formatters.account import format_accounts
 from models.manager import Manager
 from models.result import BaseResult
+from tools.instrumentation import instrument_tool
 from tools.utils import api_request
 
 
@@ -20,12 +21,14 @@ class AccountManager(Manager):
     def __init__(self, token: Optional[BzmToken], ctx: Context):
         super().__init__(token, ctx)
 
-    async def read(self, account_id: int) -> BaseResult:
+    async def read(self, account_id: int, fresh: bool = False) -> BaseResult:
         account_result = await api_request(
             self.token,
             "GET",
             f"{ACCOUNTS_ENDPOINT}/{account_id}",
-            result_formatter=format_accounts
+            result_formatter=format_accounts,
+            cache=True,
+            fresh=fresh
         )
         if account_result.error:
             return account_result
@@ -67,6 +70,7 @@ def register(mcp, token: Optional[BzmToken]) -> None:
         - read: Read a Account. Get the information of a account.
             args(dict): Dictionary with the following required parameters:
                 account_id (int): The id of the account to get information.
+                refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
         - list: List all accounts. 
             args(dict): Dictionary with the following required parameters:
                 limit (int, default=10, valid=[1 to 50]): The number of tests to list.
@@ -76,12 +80,13 @@ def register(mcp, token: Optional[BzmToken]) -> None:
         - Use the read operation if AI consent information is needed. The AI Consent it's located at account level.
     """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_account", ("read", "list"))
     async def account(action: str, args: Dict[str, Any], ctx: Context) -> BaseResult:
         account_manager = AccountManager(token, ctx)
         try:
             match action:
                 case "read":
-                    return await account_manager.read(args["account_id"])
+                    return await account_manager.read(args["account_id"], args.get("refresh", False))
                 case "list":
                     return await account_manager.list(args.get("limit", 50), args.get("offset", 0))
                 case _:
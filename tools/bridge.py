@@ -23,6 +23,11 @@ async def read_workspace(token: BzmToken, ctx: Context, workspace_id: int) -> Ba
     return await WorkspaceManager(token, ctx).read(workspace_id)
 
 
+async def read_location_index(token: BzmToken, ctx: Context, workspace_id: int) -> BaseResult:
+    from tools.workspace_manager import WorkspaceManager
+    return await WorkspaceManager(token, ctx).read_location_index(workspace_id)
+
+
 async def read_test(token: BzmToken, ctx: Context, test_id: int) -> BaseResult:
     from tools.test_manager import TestManager
     return await TestManager(token, ctx).read(test_id)
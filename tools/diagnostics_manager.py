@@ -0,0 +1,64 @@
+import traceback
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import Context
+from pydantic import Field
+
+from config.blazemeter import TOOLS_PREFIX, SUPPORT_MESSAGE
+from config.token import BzmToken
+from models.manager import Manager
+from models.result import BaseResult
+from tools.instrumentation import metrics, instrument_tool
+
+
+class DiagnosticsManager(Manager):
+
+    def __init__(self, token: Optional[BzmToken], ctx: Context):
+        super().__init__(token, ctx)
+
+    async def read(self) -> BaseResult:
+        return BaseResult(
+            result=[metrics.snapshot()],
+            info=["Latencies are in milliseconds, percentiles are estimated from histogram buckets.",
+                  "upstream_calls is the number of BlazeMeter API or help requests per tool invocation."]
+        )
+
+    async def reset(self) -> BaseResult:
+        metrics.reset()
+        return BaseResult(
+            result=[metrics.snapshot()]
+        )
+
+
+def register(mcp, token: Optional[BzmToken]):
+    @mcp.tool(
+        name=f"{TOOLS_PREFIX}_diagnostics",
+        description="""
+        Diagnostics of the BlazeMeter MCP server itself. Use it when the user asks why a tool call was slow.
+        Actions:
+        - read: Read the latency of each tool action and each BlazeMeter endpoint, the upstream calls per tool
+                invocation, the transferred bytes and the cache hits and misses since the server started.
+        - reset: Reset all the collected diagnostics.
+        """
+    )
+    @instrument_tool(f"{TOOLS_PREFIX}_diagnostics", ("read", "reset"))
+    async def diagnostics(
+            action: str = Field(description="The action id to execute"),
+            args: Dict[str, Any] = Field(description="Dictionary with parameters", default=None),
+            ctx: Context = Field(description="Context object providing access to MCP capabilities")
+    ) -> BaseResult:
+        diagnostics_manager = DiagnosticsManager(token, ctx)
+        try:
+            match action:
+                case "read":
+                    return await diagnostics_manager.read()
+                case "reset":
+                    return await diagnostics_manager.reset()
+                case _:
+                    return BaseResult(
+                        error=f"Action {action} not found in diagnostics manager tool"
+                    )
+        except Exception:
+            return BaseResult(
+                error=f"Error: {traceback.format_exc()}\n{SUPPORT_MESSAGE}"
+            )
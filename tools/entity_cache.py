@@ -0,0 +1,93 @@
+"""
+Disk store of the HTTP cache entity reads, so a new server process (a new IDE session) finds
+the user, accounts, workspaces, projects and tests read in the previous minutes.
+Entries expire ENTITY_CACHE_TTL_SECONDS after they were read or revalidated with BlazeMeter.
+Files are grouped by API key and entity (tests_1 for /tests/1 and /tests/1/files), so the
+mutation of an entity removes all its reads, as in the memory cache.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config.blazemeter import CACHE_DIR, ENTITY_CACHE_TTL_SECONDS
+from tools.file_utils import atomic_write
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class EntityCache:
+
+    def __init__(self, directory: str, ttl: float = ENTITY_CACHE_TTL_SECONDS):
+        self.directory = directory
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.ttl > 0
+
+    @staticmethod
+    def _entity(endpoint: str) -> str:
+        return "_".join(endpoint.strip("/").split("/")[:2])
+
+    def _token_directory(self, token_id: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(str(token_id).encode("utf-8")).hexdigest()[:32])
+
+    def _path(self, key: CacheKey) -> str:
+        token_id, endpoint, params = key
+        name = hashlib.sha256(json.dumps([endpoint, params]).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self._token_directory(token_id), self._entity(endpoint), f"{name}.json")
+
+    def get(self, key: CacheKey) -> Optional[Tuple[Dict[str, Any], Optional[str], Optional[str], float]]:
+        """Body, ETag, Last-Modified and age in seconds of a stored read, None if missing or expired."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return None
+        age = time.time() - stored.get("stored", 0)
+        if not 0 <= age < self.ttl or stored.get("key") != json.loads(json.dumps(key)):
+            self._remove(path)
+            return None
+        return stored["body"], stored.get("etag"), stored.get("last_modified"), age
+
+    def store(self, key: CacheKey, body: Dict[str, Any], etag: Optional[str], last_modified: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        content = {"key": key, "stored": time.time(), "etag": etag, "last_modified": last_modified, "body": body}
+        try:
+            atomic_write(path, json.dumps(content, separators=(",", ":")).encode("utf-8"))
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def invalidate(self, token_id: str, endpoint: str) -> None:
+        """Remove the stored reads of the entity changed by a request to the endpoint, all of them for a collection."""
+        if not self.enabled:
+            return
+        entity = self._entity(endpoint)
+        token_directory = self._token_directory(token_id)
+        if not os.path.isdir(token_directory):
+            return
+        for name in os.listdir(token_directory):
+            if name == entity or ("_" not in entity and name.startswith(entity + "_")):
+                shutil.rmtree(os.path.join(token_directory, name), ignore_errors=True)
+
+    def clear(self) -> None:
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+entity_cache = EntityCache(os.path.join(CACHE_DIR, "entities") if CACHE_DIR else "")
@@ -1,19 +1,43 @@
+import asyncio
+import time
 import traceback
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Iterable
 
 import httpx
 from mcp.server.fastmcp import Context
 from pydantic import Field
 
-from config.blazemeter import TOOLS_PREFIX, EXECUTIONS_ENDPOINT, SUPPORT_MESSAGE
+from config.blazemeter import TOOLS_PREFIX, EXECUTIONS_ENDPOINT, SUPPORT_MESSAGE, MAX_BATCH_CONCURRENCY, \
+    START_PLAN_POLL_INTERVAL, START_PLAN_BOOT_TIMEOUT
 from config.token import BzmToken
 from formatters.execution import format_executions, format_executions_detailed, format_executions_status
 from models.execution import TestExecutionDetailed
 from models.manager import Manager
 from models.result import BaseResult
 from tools import bridge
-from tools.report_manager import ReportManager
-from tools.utils import api_request
+from tools.report_manager import ReportManager, REPORT_PAGE_LIMIT, TIMELINE_MAX_POINTS
+from tools.instrumentation import instrument_tool
+from tools.utils import api_request, gather_limited, batch_ids, batch_error
+
+
+EXECUTION_STATUS_CONTEXT = (
+    "The execution_status is main attribute that indicates if the test passed or failed.\n"
+    "The possible values are:\n"
+    "pass: Passed - A test is deemed to pass if none of the Failure Criteria defined for the test"
+    " are met.\n"
+    "fail: Failed - A test is deemed to fail if one or more of the Failure Criteria defined for the test"
+    " are met,\n"
+    "unset: Not Set - A test that has no Failure Criteria defined. Do not report as failed.\n"
+    "abort: Aborted - A test that is terminated using the Abort Test command available during the"
+    " booting phase.\n"
+    "error: Error - A test with one or more execution errors that causes the test to end with no data.\n"
+    "noData: No Data - deprecated. Legacy reports with execution errors that ended with no data will"
+    " remain in No Data status.\n"
+)
+
+
+# Steps of an execution that will not become ready anymore
+EXECUTION_FINAL_STEPS = {"ENDED", "TERMINATED", "ABORTED", "ERROR"}
 
 
 class ExecutionResult(BaseResult):
@@ -49,6 +73,141 @@ class ExecutionManager(Manager):
             json=start_body
         )
 
+    async def start_plan(self, test_ids: List[int], stagger_seconds: float = 0,
+                         boot_timeout: float = START_PLAN_BOOT_TIMEOUT,
+                         poll_interval: float = START_PLAN_POLL_INTERVAL,
+                         max_concurrency: int = MAX_BATCH_CONCURRENCY) -> BaseResult:
+        """
+        Start many tests with delayed start, wait until the engines of every test are ready and
+        release them together (stagger_seconds=0) or one after the other every stagger_seconds,
+        in the order of the tests. Tests not ready within boot_timeout are not released.
+        """
+        unique_ids = batch_ids(test_ids)
+        plan_start = time.monotonic()
+        start_results = await gather_limited(
+            (self.start(test_id, delayed_start_ready=True) for test_id in unique_ids),
+            max_concurrency, return_exceptions=True)
+
+        reports = {}
+        booting = {}
+        for test_id, start_result in zip(unique_ids, start_results):
+            if isinstance(start_result, Exception) or start_result.error:
+                reports[test_id] = {"test_id": test_id, "status": "error", "error": batch_error(start_result)}
+            else:
+                reports[test_id] = {"test_id": test_id, "execution_id": start_result.result[0].execution_id}
+                booting[test_id] = start_result.result[0].execution_id
+
+        await self._release_when_ready(reports, booting, plan_start, stagger_seconds, boot_timeout, poll_interval,
+                                       max_concurrency)
+        return self._plan_result([reports[test_id] for test_id in unique_ids], booting.values())
+
+    async def release_plan(self, execution_ids: List[int], stagger_seconds: float = 0,
+                           boot_timeout: float = START_PLAN_BOOT_TIMEOUT,
+                           poll_interval: float = START_PLAN_POLL_INTERVAL,
+                           max_concurrency: int = MAX_BATCH_CONCURRENCY) -> BaseResult:
+        """
+        Continue a start plan: wait until the engines of the delayed start executions not released yet
+        are ready and release them, in the order of the executions.
+        """
+        unique_ids = batch_ids(execution_ids)
+        plan_start = time.monotonic()
+        # Check if they are valid or allowed
+        executions_result = await self.read_many(unique_ids, max_concurrency)
+
+        reports = {}
+        booting = {}
+        for execution in executions_result.result:
+            execution_id = execution["execution_id"]
+            if "error" in execution:
+                reports[execution_id] = {"execution_id": execution_id, "status": "error", "error": execution["error"]}
+            else:
+                reports[execution_id] = {"execution_id": execution_id}
+                booting[execution_id] = execution_id
+
+        await self._release_when_ready(reports, booting, plan_start, stagger_seconds, boot_timeout, poll_interval,
+                                       max_concurrency)
+        return self._plan_result([reports[execution_id] for execution_id in unique_ids], booting.values())
+
+    async def _release_when_ready(self, reports: Dict[int, Dict[str, Any]], booting: Dict[int, int],
+                                  plan_start: float, stagger_seconds: float, boot_timeout: float,
+                                  poll_interval: float, max_concurrency: int) -> None:
+        """Wait for the boot of the executions (by report key) and release the ready ones, updating their reports."""
+        # Monitor the boot of all the executions concurrently
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def wait_ready(key: int, execution_id: int) -> None:
+            report = reports[key]
+            while True:
+                try:
+                    async with semaphore:
+                        status_result = await self._read_status(execution_id)
+                except Exception as e:
+                    status_result = e
+                elapsed = time.monotonic() - plan_start
+                if isinstance(status_result, Exception) or status_result.error:
+                    report.update(status="error", error=batch_error(status_result))
+                    return
+                status = status_result.result[0]
+                report["ready_percent"] = status.execution_statuses.ready_percent
+                if status.execution_statuses.ready_percent >= 100:
+                    report.update(status="ready", boot_seconds=round(elapsed, 1))
+                    return
+                if status.execution_step.upper() in EXECUTION_FINAL_STEPS:
+                    report.update(status="error", error=f"Execution {status.execution_step} while booting",
+                                  ended=True)
+                    return
+                if elapsed + poll_interval > boot_timeout:
+                    report.update(status="boot_timeout", boot_seconds=round(elapsed, 1))
+                    return
+                await asyncio.sleep(poll_interval)
+
+        await asyncio.gather(*(wait_ready(key, execution_id) for key, execution_id in booting.items()))
+
+        async def release(key: int, delay: float) -> None:
+            report = reports[key]
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                async with semaphore:
+                    release_result = await api_request(
+                        self.token,
+                        "POST",
+                        f"{EXECUTIONS_ENDPOINT}/{booting[key]}/force-start",
+                        result_formatter=format_executions)
+            except Exception as e:
+                release_result = e
+            if isinstance(release_result, Exception) or release_result.error:
+                report.update(status="error", error=batch_error(release_result))
+            else:
+                report.update(status="released", released_seconds=round(time.monotonic() - plan_start, 1))
+
+        ready_ids = [key for key in booting if reports[key].get("status") == "ready"]
+        await asyncio.gather(*(release(key, index * stagger_seconds) for index, key in enumerate(ready_ids)))
+
+    @staticmethod
+    def _plan_result(results: List[Dict[str, Any]], started_ids: Iterable[int]) -> BaseResult:
+        statuses = [report.get("status") for report in results]
+        info = [f"Released: {statuses.count('released')}, not ready: {statuses.count('boot_timeout')}, "
+                f"errors: {statuses.count('error')}"]
+        # Started executions not released keep running, waiting for the release, unless they ended
+        started_ids = set(started_ids)
+        running_ids = []
+        for report in results:
+            ended = report.pop("ended", False)
+            if report.get("execution_id") in started_ids and report["status"] != "released":
+                report["running"] = not ended
+                if not ended:
+                    running_ids.append(report["execution_id"])
+        if running_ids:
+            info.append(f"Executions {', '.join(map(str, running_ids))} are still running and not released. "
+                        f"Use release_plan with their execution_id_list to keep waiting and release them, "
+                        f"or abort them from BlazeMeter.")
+        return BaseResult(
+            result=results,
+            total=len(results),
+            info=info
+        )
+
     async def read(self, execution_id: int) -> BaseResult:
 
         execution_response = await api_request(
@@ -69,12 +228,30 @@ class ExecutionManager(Manager):
             return project_result
 
         # Get status information and append that to execution element
+        status_response = await self._read_status(execution_id)
+
+        if status_response.error:
+            return status_response
+
+        # Append the status information
+        execution_element.execution_status_detailed = status_response.result[0]
+
+        result = {
+            "result": execution_element,
+            "context": EXECUTION_STATUS_CONTEXT
+        }
+
+        return BaseResult(
+            result=[result],
+        )
+
+    async def _read_status(self, execution_id: int) -> BaseResult:
         # https://help.blazemeter.com/apidocs/performance/masters_tracking_test_status.htm
         parameters = {
             "level ": 200,  # INFO
             "events": False  # Evaluate the use in the future
         }
-        status_response = await api_request(
+        return await api_request(
             self.token,
             "GET",
             f"{EXECUTIONS_ENDPOINT}/{execution_id}/status",
@@ -82,30 +259,55 @@ class ExecutionManager(Manager):
             params=parameters
         )
 
-        if status_response.error:
-            return status_response
+    async def read_many(self, execution_ids: List[int], max_concurrency: int = MAX_BATCH_CONCURRENCY) -> BaseResult:
+        """
+        Read many executions concurrently. Each project is validated once for all its executions.
+        Results keep the input order, with an error for each execution that can't be read.
+        """
+        unique_ids = batch_ids(execution_ids)
+        execution_results = await gather_limited(
+            (api_request(self.token, "GET", f"{EXECUTIONS_ENDPOINT}/{execution_id}",
+                         result_formatter=format_executions_detailed)
+             for execution_id in unique_ids),
+            max_concurrency, return_exceptions=True)
+        executions = dict(zip(unique_ids, execution_results))
 
-        # Append the status information
-        execution_element.execution_status_detailed = status_response.result[0]
+        project_ids = list({execution_result.result[0].project_id for execution_result in execution_results
+                            if isinstance(execution_result, BaseResult) and not execution_result.error})
+        project_results = await gather_limited(
+            (bridge.read_project(self.token, self.ctx, project_id) for project_id in project_ids),
+            max_concurrency, return_exceptions=True)
+        projects = dict(zip(project_ids, project_results))
 
-        result = {
-            "result": execution_element,
-            "context": "The execution_status is main attribute that indicates if the test passed or failed.\n"
-                    "The possible values are:\n"
-                    "pass: Passed - A test is deemed to pass if none of the Failure Criteria defined for the test"
-                    " are met.\n"
-                    "fail: Failed - A test is deemed to fail if one or more of the Failure Criteria defined for the test"
-                    " are met,\n"
-                    "unset: Not Set - A test that has no Failure Criteria defined. Do not report as failed.\n"
-                    "abort: Aborted - A test that is terminated using the Abort Test command available during the"
-                    " booting phase.\n"
-                    "error: Error - A test with one or more execution errors that causes the test to end with no data.\n"
-                    "noData: No Data - deprecated. Legacy reports with execution errors that ended with no data will"
-                    " remain in No Data status.\n"
-        }
+        allowed_ids = []
+        for execution_id in unique_ids:
+            execution_result = executions[execution_id]
+            if isinstance(execution_result, BaseResult) and not execution_result.error:
+                project_result = projects[execution_result.result[0].project_id]
+                if isinstance(project_result, BaseResult) and not project_result.error:
+                    allowed_ids.append(execution_id)
+        status_results = await gather_limited(
+            (self._read_status(execution_id) for execution_id in allowed_ids),
+            max_concurrency, return_exceptions=True)
+        statuses = dict(zip(allowed_ids, status_results))
 
+        results = []
+        for execution_id in execution_ids:
+            execution_result = executions[execution_id]
+            if isinstance(execution_result, Exception) or execution_result.error:
+                results.append({"execution_id": execution_id, "error": batch_error(execution_result)})
+                continue
+            execution_element = execution_result.result[0]
+            status_result = statuses.get(execution_id, projects[execution_element.project_id])
+            if isinstance(status_result, Exception) or status_result.error:
+                results.append({"execution_id": execution_id, "error": batch_error(status_result)})
+            else:
+                execution_element.execution_status_detailed = status_result.result[0]
+                results.append({"execution_id": execution_id, "result": execution_element})
         return BaseResult(
-            result=[result],
+            result=results,
+            total=len(results),
+            info=[EXECUTION_STATUS_CONTEXT]
         )
 
     async def list(self, test_id: int, limit: int = 50, offset: int = 0) -> BaseResult:
@@ -140,9 +342,25 @@ def register(mcp, token: Optional[BzmToken]):
         - start: start a preconfigured load test, you need to know the test_id of a created and configured test.
             args(dict): Dictionary with the following required parameters:
                 test_id (int): The test Id that should be started.
+        - start_plan: start several preconfigured load tests and begin generating load together or staggered.
+                      The engines of every test boot first, and the tests are released when all of them are ready.
+            args(dict): Dictionary with the following parameters:
+                test_id_list (list[int]): The test Ids that should be started, in release order (max 50).
+                stagger_seconds (float, default=0): Seconds between the release of consecutive tests. 0 releases all the tests together.
+                boot_timeout (int, default=45): Maximum seconds to wait for the engines to be ready. Tests not ready in time are not released.
+                Returns for each test the execution_id, the status (released, boot_timeout or error), the boot time and the release time in seconds since the plan start,
+                and running=true for the executions still booting or waiting for the release, to continue with release_plan.
+        - release_plan: continue a start_plan, wait for the engines of its executions still running and release them when they are ready.
+            args(dict): Dictionary with the following parameters:
+                execution_id_list (list[int]): The execution Ids still running of the start_plan result, in release order (max 50).
+                stagger_seconds (float, default=0): Seconds between the release of consecutive executions.
+                boot_timeout (int, default=45): Maximum seconds to wait for the engines to be ready.
         - read: Read a Test Execution. Get the information and status of a test execution.
             args(dict): Dictionary with the following required parameters:
                 execution_id (int): The execution ID to get the information.
+        - read_many: Read many Test Executions in a single call. Prefer it over several 'read' calls.
+            args(dict): Dictionary with the following required parameters:
+                execution_id_list (list[int]): The execution IDs to read (max 50). Results keep this order, with an error for each execution that can't be read.
         - list: List all executions for a test ID. 
             args(dict): Dictionary with the following required parameters:
                 test_id (int): The id of the test to list the execution from
@@ -151,17 +369,71 @@ def register(mcp, token: Optional[BzmToken]):
         - read_summary: get the summary report for a given execution ID.
             args(dict): Dictionary with the following required parameters:
                 execution_id (int): The execution ID to get the summary report for.
-        - read_errors: get the error report for a given execution ID.
-            args(dict): Dictionary with the following required parameters:
+        - read_errors: get the error report for a given execution ID, one page of labels at a time.
+            args(dict): Dictionary with the following parameters:
                 execution_id (int): The execution ID to get the error report for.
-        - read_request_stats: get the request statistics report for a given execution ID.
-            args(dict): Dictionary with the following required parameters:
+                limit (int, default=50, valid=[1 to 500]): The number of labels in the page.
+                cursor (str, optional): The cursor returned in the info of the previous page to get the next page.
+                sort (str, optional): Sort the labels by a key, with '-' prefix for descending order. E.g.: "-errors" for the labels with more errors first.
+                label (str, optional): Only labels containing this text.
+                response_code (str, optional): Only labels with errors of this response code.
+                refresh (bool, default=False): The report is kept for 1 minute to get the following pages, use it to get it again from BlazeMeter.
+        - analyze_errors: get the errors of a given execution ID grouped by label, response code and message, ignoring ids, numbers and timestamps in the messages.
+                          Prefer it over read_errors for executions with many errors.
+            args(dict): Dictionary with the following parameters:
+                execution_id (int): The execution ID to analyze the errors for.
+                top_k (int, default=10): Number of groups to return, from the most frequent.
+                max_samples (int, default=3): Number of original messages to include for each group.
+        - read_request_stats: get the request statistics report for a given execution ID, one page of labels at a time.
+            args(dict): Dictionary with the following parameters:
                 execution_id (int): The execution ID to get the request statistics report for.
+                limit (int, default=50, valid=[1 to 500]): The number of labels in the page.
+                cursor (str, optional): The cursor returned in the info of the previous page to get the next page.
+                sort (str, optional): Sort the labels by a report field, with '-' prefix for descending order. E.g.: "-avgResponseTime", "-errorsCount", "-samples".
+                label (str, optional): Only labels containing this text.
+                refresh (bool, default=False): The report is kept for 1 minute to get the following pages, use it to get it again from BlazeMeter.
+        - read_timeline: get the time series KPIs of a given execution ID, to find degradations over time.
+                         Each point has ts (timestamp), na (active users), n (hits), avg_rt (average response time in ms) and ec (errors count).
+            args(dict): Dictionary with the following parameters:
+                execution_id (int): The execution ID to get the timeline for.
+                max_points (int, default=300, valid=[4 to 2000]): Maximum points of each label, long tests are downsampled.
+                method (str, default="lttb", valid=["lttb", "minmax"]): Downsampling method. lttb keeps the shape of the series, minmax keeps the spikes.
+                metric (str, default="avg_rt"): KPI used to select the points.
+                labels (list[str], optional): Only labels containing any of these texts. "ALL" is the aggregation of all the labels.
+                start_offset (int, optional): Only points from these seconds since the start of the test.
+                end_offset (int, optional): Only points until these seconds since the start of the test.
+        - trend: get the performance trend across the last executions of a test, to find regressions between executions.
+                 Returns a table with a row by execution (oldest first) and, for each metric, its slope by execution,
+                 change percent, direction, moving average and the executions that are outliers.
+            args(dict): Dictionary with the following parameters:
+                test_id (int): The test Id to get the trend for.
+                last (int, default=10, valid=[1 to 50]): Number of most recent executions to include.
+                window (int, default=3): Number of executions of the moving average.
+                label (str, optional): Trend of the request statistics of the first label containing this text. By default, the summary of all the labels.
+        - ingest_results: store the reports of the ended executions of a test in the local results store, to query them later with query_results.
+                          Only the executions updated since the last ingestion of the test are downloaded. Requires the results store to be enabled.
+            args(dict): Dictionary with the following required parameters:
+                test_id (int): The test Id to ingest the executions from.
+        - query_results: query the reports of the executions in the local results store, answered locally without calls to BlazeMeter.
+                         Use ingest_results first to add the latest executions of the tests.
+            args(dict): Dictionary with the following parameters:
+                report (str, default="summary", valid=["summary", "labels", "errors"]): summary of the execution, request statistics by label or error groups.
+                test_id (int, optional): Only executions of this test.
+                label (str, optional): Only labels containing this text (labels and errors reports).
+                status (str, optional): Only executions with this execution_status (pass, fail, unset, abort, error).
+                start (str, optional): Only executions created from this ISO 8601 date.
+                end (str, optional): Only executions created until this ISO 8601 date.
+                limit (int, default=100, valid=[1 to 500]): Maximum rows, from the newest executions.
         - read_all_reports: get all reports (summary, error, and request statistics) for a given execution ID.
+                            Error and request statistics reports include their first page, use read_errors and read_request_stats for the next pages.
             args(dict): Dictionary with the following required parameters:
                 execution_id (int): The execution ID to get all reports for.
         """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_execution", ("start", "start_plan", "release_plan", "read", "read_many", "list",
+                                                   "read_summary", "read_errors", "analyze_errors",
+                                                   "read_request_stats", "read_timeline", "trend", "ingest_results",
+                                                   "query_results", "read_all_reports"))
     async def execution(action: str, args: Dict[str, Any], ctx: Context) -> BaseResult:
         test_manager = ExecutionManager(token, ctx)
         report_manager = ReportManager(token, ctx)
@@ -170,20 +442,48 @@ def register(mcp, token: Optional[BzmToken]):
             match action:
                 case "start":
                     return await test_manager.start(args["test_id"])
+                case "start_plan":
+                    return await test_manager.start_plan(args["test_id_list"], args.get("stagger_seconds", 0),
+                                                         args.get("boot_timeout", START_PLAN_BOOT_TIMEOUT))
+                case "release_plan":
+                    return await test_manager.release_plan(args["execution_id_list"], args.get("stagger_seconds", 0),
+                                                           args.get("boot_timeout", START_PLAN_BOOT_TIMEOUT))
                 case "read":
                     return await test_manager.read(args["execution_id"])
+                case "read_many":
+                    return await test_manager.read_many(args["execution_id_list"])
                 case "list":
                     return await test_manager.list(args["test_id"])
                 case "read_summary":
                     return await report_manager.read_summary(args["execution_id"])
                 case "read_errors":
-                    return BaseResult(
-                        result=await report_manager.read_error(args["execution_id"])
-                    )
+                    return await report_manager.read_error(args["execution_id"], args.get("limit", REPORT_PAGE_LIMIT),
+                                                           args.get("cursor"), args.get("sort"), args.get("label"),
+                                                           args.get("response_code"), args.get("refresh", False))
+                case "analyze_errors":
+                    return await report_manager.analyze_errors(args["execution_id"], args.get("top_k", 10),
+                                                               args.get("max_samples", 3))
                 case "read_request_stats":
-                    return BaseResult(
-                        result=await report_manager.read_request_stats(args["execution_id"])
-                    )
+                    return await report_manager.read_request_stats(args["execution_id"],
+                                                                   args.get("limit", REPORT_PAGE_LIMIT),
+                                                                   args.get("cursor"), args.get("sort"),
+                                                                   args.get("label"), args.get("refresh", False))
+                case "read_timeline":
+                    return await report_manager.read_timeline(args["execution_id"],
+                                                              args.get("max_points", TIMELINE_MAX_POINTS),
+                                                              args.get("method", "lttb"), args.get("metric", "avg_rt"),
+                                                              args.get("labels"), args.get("start_offset"),
+                                                              args.get("end_offset"))
+                case "trend":
+                    return await report_manager.read_trend(args["test_id"], args.get("last", 10),
+                                                           args.get("window", 3), args.get("label"))
+                case "ingest_results":
+                    return await report_manager.ingest_results(args["test_id"])
+                case "query_results":
+                    return await report_manager.query_results(args.get("report", "summary"), args.get("test_id"),
+                                                              args.get("label"), args.get("status"),
+                                                              args.get("start"), args.get("end"),
+                                                              args.get("limit", 100))
                 case "read_all_reports":
                     return BaseResult(
                         result=[{
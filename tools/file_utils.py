@@ -0,0 +1,24 @@
+"""
+File helpers of the disk caches and the help bundle.
+"""
+import os
+import tempfile
+
+
+def atomic_write(path: str, *chunks: bytes) -> None:
+    """Write the chunks to a file, creating its directory, so readers see either the previous or the new content."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Written aside and renamed, a concurrent reader never sees a partial file
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,166 @@
+"""
+Prebuilt offline bundle of the help: the table of contents and the converted pages, with their sections index,
+snapshotted from help.blazemeter.com at build time and shipped with the binary and the Docker image.
+The file is memory mapped on first use and only the read records are decompressed:
+    magic | header length (8 bytes, little endian) | zlib JSON header | zlib JSON records
+The header has the offset and length of the table of contents and of each page record, with the page
+ETag and Last-Modified to revalidate it online.
+
+Usage (run by build.py before PyInstaller):
+    python -m tools.help_bundle [--output help_bundle.bin] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.blazemeter import HELP_BUNDLE_PATH
+from tools.file_utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+HELP_BUNDLE_MAGIC = b"BZMHELP1"
+HEADER_LENGTH = struct.Struct("<Q")
+
+
+def _compress(content: Any) -> bytes:
+    return zlib.compress(json.dumps(content, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def write_help_bundle(path: str, tree: Dict[str, Any], chunks: List[Dict[str, Any]],
+                      pages: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write a bundle with the TOC tree and chunks, and the pages by path relative to the help base url
+    ({'help_content', 'sections', 'etag', 'last_modified'}).
+    """
+    records = []
+    offset = 0
+
+    def add_record(content: Any) -> List[int]:
+        nonlocal offset
+        record = _compress(content)
+        records.append(record)
+        offset += len(record)
+        return [offset - len(record), len(record)]
+
+    header = {"created": time.time(), "toc": add_record({"tree": tree, "chunks": chunks}), "pages": {}}
+    for page_path, page in pages.items():
+        header["pages"][page_path] = add_record(
+            {"help_content": page["help_content"], "sections": page["sections"]}) + [
+            page.get("etag"), page.get("last_modified")]
+    compressed_header = _compress(header)
+
+    atomic_write(path, HELP_BUNDLE_MAGIC + HEADER_LENGTH.pack(len(compressed_header)) + compressed_header, *records)
+
+
+class HelpBundle:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mapping: Optional[mmap.mmap] = None
+        self._header: Optional[Dict[str, Any]] = None
+        self._records_offset = 0
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        # Mapped on the first read, an invalid bundle is ignored as a missing one
+        with self._lock:
+            if self._header is None:
+                try:
+                    with open(self.path, "rb") as file:
+                        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    if mapping[:len(HELP_BUNDLE_MAGIC)] != HELP_BUNDLE_MAGIC:
+                        raise ValueError("Not a help bundle")
+                    start = len(HELP_BUNDLE_MAGIC) + HEADER_LENGTH.size
+                    header_length = HEADER_LENGTH.unpack_from(mapping, len(HELP_BUNDLE_MAGIC))[0]
+                    self._header = json.loads(zlib.decompress(mapping[start:start + header_length]))
+                    self._records_offset = start + header_length
+                    self._mapping = mapping
+                except (OSError, ValueError, zlib.error, struct.error):
+                    logger.debug("Help bundle %s not available", self.path, exc_info=True)
+                    self._header = {}
+            return self._header
+
+    def _record(self, location: List[int]) -> Any:
+        start = self._records_offset + location[0]
+        return json.loads(zlib.decompress(self._mapping[start:start + location[1]]))
+
+    @property
+    def created(self) -> Optional[float]:
+        return self._load().get("created")
+
+    def toc(self) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """TOC tree and chunks, None without a bundle."""
+        header = self._load()
+        if not header:
+            return None
+        toc = self._record(header["toc"])
+        return toc["tree"], toc["chunks"]
+
+    def page(self, page_path: str) -> Optional[Dict[str, Any]]:
+        """Converted page with its sections index, ETag and Last-Modified, None if it's not in the bundle."""
+        location = self._load().get("pages", {}).get(page_path)
+        if location is None:
+            return None
+        page = self._record(location)
+        page["etag"], page["last_modified"] = location[2], location[3]
+        return page
+
+    def __len__(self) -> int:
+        return len(self._load().get("pages", {}))
+
+
+_bundle: Optional[HelpBundle] = None
+
+
+def get_help_bundle() -> Optional[HelpBundle]:
+    """The help bundle shipped with the server, None when there isn't any."""
+    global _bundle
+    if _bundle is None and HELP_BUNDLE_PATH and os.path.isfile(HELP_BUNDLE_PATH):
+        _bundle = HelpBundle(HELP_BUNDLE_PATH)
+    return _bundle
+
+
+async def snapshot_help(path: str, max_concurrency: int = 8) -> int:
+    """Read the help TOC and all its pages into a new bundle. Returns the amount of pages."""
+    from tools.help_index import HelpIndex
+    from tools.help_manager import HelpManager
+    from tools.utils import gather_limited
+
+    help_manager = HelpManager(None, None)
+    tree, chunks = await help_manager._read_help_toc()
+    help_index = HelpIndex.build(tree, chunks)
+    page_paths = sorted({HelpManager._help_path(subcategory, help_id)
+                         for category, subcategory in help_index.groups
+                         for help_id in (page["help_id"] for page in help_index.pages(category, subcategory))})
+    results = await gather_limited((help_manager._download_help_page(page_path) for page_path in page_paths),
+                                   max_concurrency, return_exceptions=True)
+    pages = {}
+    for page_path, result in zip(page_paths, results):
+        if isinstance(result, Exception):
+            logger.warning("Help page %s not bundled: %r", page_path, result)
+        else:
+            pages[page_path] = result
+    write_help_bundle(path, tree, chunks, pages)
+    return len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="help_bundle")
+    parser.add_argument("--output", default=HELP_BUNDLE_PATH or "help_bundle.bin", help="Bundle file")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pages read at the same time (default: 8)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    pages = asyncio.run(snapshot_help(args.output, args.concurrency))
+    print(f"Help bundle {args.output}: {pages} pages, {os.path.getsize(args.output) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Compact index of the help table of contents.
+The TOC nodes and the help pages are kept in flat arrays addressed by integer ids, and the pages are
+found by 'category:subcategory:help_id' with a binary search over the sorted keys.
+It's built in a single pass over the TOC tree and the chunks, without copying the nodes.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ROOT_CATEGORY = "root_category"  # Name of the pages in the root of the help site
+SELF_SUBCATEGORY = "self"  # Subcategory of the pages directly in a category
+
+
+def split_help_path(path: str) -> Tuple[str, str, str]:
+    """Category, subcategory and help_id of a help page path like 'guide/performance/page'."""
+    sections = path.split("/")
+    category = sections[0] or ROOT_CATEGORY
+    if len(sections) > 2:
+        return category, sections[1], "/".join(sections[2:])
+    return category, SELF_SUBCATEGORY, "/".join(sections[1:])
+
+
+class HelpIndex:
+
+    def __init__(self):
+        # TOC nodes, by node id: the children of the node i are child_ids[child_start[i]:child_end[i]]
+        self.child_start = array("i")
+        self.child_end = array("i")
+        self.child_ids = array("i")
+        self.node_page = array("i")  # First page of each node id, -1 for the nodes without pages
+        # Pages, grouped by category and subcategory in the TOC order: the pages of the group g are
+        # the positions group_start[g]:group_start[g + 1]
+        self.titles: List[str] = []
+        self.help_ids: List[str] = []
+        self.tree_ids = array("i")
+        self.page_group = array("i")
+        self.groups: List[Tuple[str, str]] = []
+        self.group_start = array("i", [0])
+        self._group_index: Dict[Tuple[str, str], int] = {}
+        # 'category:subcategory:help_id' keys sorted, with the position of their page
+        self._keys: List[str] = []
+        self._key_pages = array("i")
+
+    @classmethod
+    def build(cls, tree: Dict[str, Any], chunks: Iterable[Dict[str, Any]]) -> "HelpIndex":
+        """
+        Index the TOC 'tree' (nodes with id 'i' and children 'n') and the chunks pages
+        ('/content/<path>.html': {'i': [node id], 't': [title]}).
+        """
+        index = cls()
+
+        # Children of each node, appended to a single array while walking the tree
+        node_ids, starts, ends, child_ids = [], [], [], index.child_ids
+        stack = list(tree.get("n", []))
+        while stack:
+            node = stack.pop()
+            children = node.get("n") or []
+            node_ids.append(node.get("i"))
+            starts.append(len(child_ids))
+            child_ids.extend(child.get("i") for child in children)
+            ends.append(len(child_ids))
+            stack.extend(children)
+
+        # Pages, bucketed by category and subcategory in the order they are found
+        buckets: List[List[Tuple[str, str, int]]] = []
+        for chunk in chunks:
+            for url, content in chunk.items():
+                path = url.replace("/content/", "").replace(".html", "")
+                # Exclude '___' and all the 'signup'
+                if path == "___" or path.startswith("signup"):
+                    continue
+                category, subcategory, help_id = split_help_path(path)
+                group = index._group_index.get((category, subcategory))
+                if group is None:
+                    group = index._group_index[(category, subcategory)] = len(index.groups)
+                    index.groups.append((category, subcategory))
+                    buckets.append([])
+                tree_id = (content.get("i") or [-1])[0]
+                buckets[group].append(((content.get("t") or [""])[0], help_id, tree_id))
+
+        keys = []
+        for group, bucket in enumerate(buckets):
+            category, subcategory = index.groups[group]
+            for title, help_id, tree_id in bucket:
+                index.titles.append(title)
+                index.help_ids.append(help_id)
+                index.tree_ids.append(tree_id)
+                index.page_group.append(group)
+                keys.append(f"{category}:{subcategory}:{help_id}")
+            index.group_start.append(len(index.titles))
+
+        # Node ids are small integers, so the nodes are addressed directly by their id
+        size = max(max(node_ids, default=-1), max(index.tree_ids, default=-1)) + 1
+        index.child_start = array("i", bytes(4 * size))
+        index.child_end = array("i", bytes(4 * size))
+        for node_id, start, end in zip(node_ids, starts, ends):
+            index.child_start[node_id] = start
+            index.child_end[node_id] = end
+        index.node_page = array("i", [-1]) * size
+        for position in range(len(index.tree_ids) - 1, -1, -1):
+            if index.tree_ids[position] >= 0:
+                index.node_page[index.tree_ids[position]] = position
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        index._keys = [keys[position] for position in order]
+        index._key_pages = array("i", order)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def categories(self) -> Dict[str, List[str]]:
+        """Subcategories of each category, in the TOC order."""
+        categories: Dict[str, List[str]] = {}
+        for category, subcategory in self.groups:
+            categories.setdefault(category, []).append(subcategory)
+        return categories
+
+    def pages(self, category: str, subcategory: str) -> Optional[List[Dict[str, Any]]]:
+        """Pages of a category and subcategory, None if there isn't any."""
+        group = self._group_index.get((category, subcategory))
+        if group is None:
+            return None
+        return [self._page(position) for position in range(self.group_start[group], self.group_start[group + 1])]
+
+    def _page(self, position: int) -> Dict[str, Any]:
+        return {"title": self.titles[position], "help_id": self.help_ids[position],
+                "help_tree_id": self.tree_ids[position]}
+
+    def find(self, category: str, subcategory: str, help_id: str) -> Optional[int]:
+        """Node id of a page, None if it's not in the index."""
+        key = f"{category}:{subcategory}:{help_id}"
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self.tree_ids[self._key_pages[position]]
+        return None
+
+    def node(self, tree_id: int) -> Optional[Dict[str, Any]]:
+        """Page of a node with its children node ids, None for the nodes without pages."""
+        if not 0 <= tree_id < len(self.node_page) or self.node_page[tree_id] < 0:
+            return None
+        position = self.node_page[tree_id]
+        category, subcategory = self.groups[self.page_group[position]]
+        return {
+            "category": category,
+            "subcategory": subcategory,
+            "help_id": self.help_ids[position],
+            "sub_nodes": self.child_ids[self.child_start[tree_id]:self.child_end[tree_id]].tolist(),
+        }
+
+    def sub_nodes(self, category: str, subcategory: str, help_id: str) -> List[Dict[str, Any]]:
+        """Pages of the children nodes of a page."""
+        tree_id = self.find(category, subcategory, help_id)
+        if tree_id is None:
+            return []
+        node = self.node(tree_id)
+        if node is None:
+            return []
+        return [sub_node for sub_node in map(self.node, node["sub_nodes"]) if sub_node is not None]
@@ -1,62 +1,47 @@
 import asyncio
+import logging
 import traceback
-from copy import deepcopy
-from itertools import chain
-from typing import Optional, Any, Dict, List
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Tuple
 
 import httpx
 from mcp.server.fastmcp import Context
 from pydantic import Field
 
 from config.blazemeter import TOOLS_PREFIX, SUPPORT_MESSAGE, \
-    HELP_INDEX_URL, HELP_TOC_URL, HELP_BASE_CONTENT_URL
+    HELP_INDEX_URL, HELP_TOC_URL, HELP_BASE_CONTENT_URL, HELP_MAX_CONCURRENCY, HELP_PAGE_CACHE_MAX_ENTRIES
 from config.token import BzmToken
-from formatters.help import format_help_info
+from formatters.help import format_help_page, format_help_sections
 from models.manager import Manager
 from models.result import BaseResult
+from tools.help_bundle import get_help_bundle
+from tools.help_index import HelpIndex
 from tools.help_utils import convert_js_to_py_dict
-from tools.utils import http_request
+from tools.instrumentation import instrument_tool, record_cache, register_gauge
+from tools.utils import http_request, gather_limited, batch_error
+from tools.workers import offload
 
+logger = logging.getLogger(__name__)
 
 class HelpManager(Manager):
-    help_tree = None  # Static to share between different instance of HelpManager
-    help_items_index = {}
-    help_index_nodes = {}
+    help_index: Optional[HelpIndex] = None  # Static to share between different instance of HelpManager
+    help_pages = OrderedDict()  # Help page path -> converted page with its sections index, least recently used first
+    help_refresh: Optional[asyncio.Task] = None  # Online read of the index, when the bundled one is used
 
     def __init__(self, token: Optional[BzmToken], ctx: Context):
         super().__init__(token, ctx)
 
-    async def _load_help_tree(self):
+    async def _read_help_toc(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         help_index_url = HELP_INDEX_URL
         help_index_response = await http_request("GET", endpoint=help_index_url)
 
-        help_index_response.result = convert_js_to_py_dict(help_index_response.result)
+        help_index_response.result = await offload(convert_js_to_py_dict, help_index_response.result,
+                                                   size=len(help_index_response.result))
 
         num_chunks = help_index_response.result.get("numchunks", 2)
         chunk_prefix = help_index_response.result.get("prefix", "azure_toc_public_Chunk")
         help_tree_index = help_index_response.result.get("tree", {})
 
-        # Flat the tree to obtain each item nodes
-        help_tree_index_flat = {}
-        stack = list(help_tree_index.get("n", []))  # Root
-
-        while stack:
-            node = stack.pop()
-            children = node.get("n", [])
-
-            node_copy = deepcopy(node)
-            node_id = node_copy.get("i")
-            node_copy.pop("n", None)
-            node_copy.pop("c", None)
-            node_copy.pop("i", None)
-
-            help_tree_index_flat[node_id] = {
-                **node_copy,
-                "n": [ch["i"] for ch in children]
-            }
-            if children:
-                stack.extend(children)
-
         help_chunk_urls = []
 
         for i in range(num_chunks):
@@ -65,64 +50,41 @@ class HelpManager(Manager):
 
         async def fetch_chunk(chunk_url: str):
             help_chunk_response = await http_request("GET", endpoint=chunk_url)
-            help_chunk_response.result = convert_js_to_py_dict(help_chunk_response.result)
-            help_content = []
-            for url, content in help_chunk_response.result.items():
-                help_item = {"title": content.get("t", [""])[0],
-                             "help_id": url.replace("/content/", "").replace(".html", ""),
-                             "help_tree_id": content.get("i", [""])[0]
-                             }
-                # Exclude '___' and all the 'signup'
-                if help_item.get("help_id") == "___" or help_item.get("help_id").startswith("signup"):
-                    continue
-                help_content.append(help_item)
-            return help_content
+            return await offload(convert_js_to_py_dict, help_chunk_response.result,
+                                 size=len(help_chunk_response.result))
 
         tasks = [fetch_chunk(url) for url in help_chunk_urls]
-        results = await asyncio.gather(*tasks)
-
-        merged = list(chain.from_iterable(results))
-
-        help_tree = {}
-        for item in merged:
-            tree_id = item.get("help_tree_id", 0)
-            sections = item.get("help_id").split("/")
-            category = sections[0]
-            if len(sections) > 2:
-                subcategory = sections[1]
-                new_id = "/".join(sections[2:])
+        chunks = await asyncio.gather(*tasks)
+        return help_tree_index, chunks
+
+    async def _load_help_tree(self):
+        HelpManager.help_index = HelpIndex.build(*await self._read_help_toc())
+
+    async def _refresh_help_tree(self):
+        try:
+            await self._load_help_tree()
+        except Exception:
+            logger.debug("Help index not refreshed, using the bundled one", exc_info=True)
+
+    async def _ensure_help_tree(self):
+        record_cache("help_tree", HelpManager.help_index is not None)
+        if HelpManager.help_index is None:
+            help_bundle = get_help_bundle()
+            bundled_toc = help_bundle.toc() if help_bundle else None
+            if bundled_toc:
+                # Answer from the bundled index at once, and replace it with the online one when it's read
+                HelpManager.help_index = HelpIndex.build(*bundled_toc)
+                HelpManager.help_refresh = asyncio.create_task(self._refresh_help_tree())
             else:
-                subcategory = "self"
-                new_id = "/".join(sections[1:])
-
-            item["help_id"] = new_id
-            if category not in help_tree:
-                help_tree[category] = {}
-            if subcategory not in help_tree[category]:
-                help_tree[category][subcategory] = []
-            help_tree[category][subcategory].append(item)
-
-            HelpManager.help_items_index[f"{category}:{subcategory}:{new_id}"] = tree_id
-
-            if tree_id not in HelpManager.help_index_nodes:
-                HelpManager.help_index_nodes[tree_id] = {
-                    "category": category,
-                    "subcategory": subcategory,
-                    "help_id": new_id,
-                    "sub_nodes": help_tree_index_flat[tree_id]["n"]
-                }
-        if '' in help_tree.keys():
-            help_tree['root_category'] = help_tree.pop('') # Assign a name to the root category
-        HelpManager.help_tree = help_tree
+                await self._load_help_tree()
 
     async def list_help_categories(self) -> BaseResult:
-        if HelpManager.help_tree is None:
-            await self._load_help_tree()
+        await self._ensure_help_tree()
         categories = []
-        for key in HelpManager.help_tree.keys():
+        for key, subcategories in HelpManager.help_index.categories().items():
             category = {
                 "category": key,
-                "subcategories": list(HelpManager.help_tree[key].keys()),
+                "subcategories": subcategories,
             }
             categories.append(category)
         return BaseResult(
@@ -131,14 +93,14 @@ class HelpManager(Manager):
         )
 
     async def list_help_category_content(self, category_id: str, subcategory_id_list: List[str]) -> BaseResult:
-        if HelpManager.help_tree is None:
-            await self._load_help_tree()
+        await self._ensure_help_tree()
         results = []
         for subcategory_id in subcategory_id_list:
             if subcategory_id == "":
                 subcategory_id = "self"
-            if category_id in HelpManager.help_tree.keys() and subcategory_id in HelpManager.help_tree[category_id]:
-                results.append(HelpManager.help_tree[category_id][subcategory_id])
+            pages = HelpManager.help_index.pages(category_id, subcategory_id)
+            if pages is not None:
+                results.append(pages)
             else:
                 results.append(
                     BaseResult(warning=[f"Category '{category_id}' and subcategory '{subcategory_id}' not found."]))
@@ -146,44 +108,100 @@ class HelpManager(Manager):
             result=results,
         )
 
-    async def read_help_info(self, category_id: str, subcategory_id: str, help_id_list: List[str]) -> BaseResult:
-        if HelpManager.help_tree is None:
-            await self._load_help_tree()
-        results = []
+    @staticmethod
+    def _help_path(subcategory_id: str, help_id: str) -> str:
+        help_path = "" # BlazeMeter don't use category_id
+        if subcategory_id != "self":
+            help_path += f"{subcategory_id}/"
+        return help_path + f"{help_id}.html" # BlazeMeter use HTML not HTM
+
+    async def _download_help_page(self, help_path: str, bundled_page: Optional[Dict[str, Any]] = None
+                                  ) -> Optional[Dict[str, Any]]:
+        """
+        Converted page with its sections index and validators. With a bundled page, it's read only if it changed,
+        None when it didn't.
+        """
+        help_url = f"{HELP_BASE_CONTENT_URL}/{help_path}"
+        headers = {}
+        if bundled_page and bundled_page.get("etag"):
+            headers["If-None-Match"] = bundled_page["etag"]
+        if bundled_page and bundled_page.get("last_modified"):
+            headers["If-Modified-Since"] = bundled_page["last_modified"]
+        page_result = await http_request("GET", endpoint=help_url, headers=headers)
+        if page_result.result is None and not page_result.error and bundled_page:
+            return None
+        # The conversion of long pages is CPU bound, out of the event loop to not stall the other calls
+        help_page = await offload(format_help_page, page_result.result, {"base_url": help_url},
+                                  size=len(page_result.result))
+        response_headers = page_result.headers or {}
+        help_page["etag"] = response_headers.get("etag")
+        help_page["last_modified"] = response_headers.get("last-modified")
+        return help_page
+
+    async def _help_page(self, help_path: str) -> Dict[str, Any]:
+        help_page = HelpManager.help_pages.get(help_path)
+        record_cache("help_pages", help_page is not None)
+        if help_page is not None:
+            HelpManager.help_pages.move_to_end(help_path)
+            return help_page
+        help_bundle = get_help_bundle()
+        bundled_page = help_bundle.page(help_path) if help_bundle else None
+        try:
+            help_page = await self._download_help_page(help_path, bundled_page)
+        except httpx.TransportError:
+            # Offline, the bundled page is used
+            if bundled_page is None:
+                raise
+            help_page = None
+        if help_page is None:
+            help_page = {**bundled_page, "help_url": f"{HELP_BASE_CONTENT_URL}/{help_path}"}
+        HelpManager.help_pages[help_path] = help_page
+        while len(HelpManager.help_pages) > HELP_PAGE_CACHE_MAX_ENTRIES:
+            HelpManager.help_pages.popitem(last=False)
+        return help_page
+
+    async def _read_help_page(self, category_id: str, subcategory_id: str, help_id: str,
+                              section: Optional[str] = None, query: Optional[str] = None) -> Dict[str, Any]:
+        help_object = {
+            "help_id": help_id,
+        }
+        try:
+            help_page = await self._help_page(self._help_path(subcategory_id, help_id))
+            if section or query:
+                help_result = format_help_sections(help_page, {"section": section, "query": query})
+            else:
+                help_result = {"help_content": help_page["help_content"], "help_url": help_page["help_url"]}
+
+            # Expand or "Argument" the content ending with ""
+            if help_page["help_content"].endswith("In this section:"):
+                help_object["sub_nodes"] = HelpManager.help_index.sub_nodes(category_id, subcategory_id, help_id)
+
+            help_object["help_result"] = help_result
+        except httpx.HTTPStatusError as e:
+            help_object["help_result"] = f"Error:{e.response.text}"
+        return help_object
+
+    async def read_help_info(self, category_id: str, subcategory_id: str, help_id_list: List[str],
+                             section: Optional[str] = None, query: Optional[str] = None,
+                             max_concurrency: int = HELP_MAX_CONCURRENCY) -> BaseResult:
+        """
+        Read the help pages concurrently. Results keep the help_id_list order, with an error for each page
+        that can't be read.
+        With a section heading path and/or a query, only the matching sections of each page are returned.
+        """
+        await self._ensure_help_tree()
         if subcategory_id == "":
             subcategory_id = "self"
-        for help_id in help_id_list:
+        page_results = await gather_limited(
+            (self._read_help_page(category_id, subcategory_id, help_id, section, query) for help_id in help_id_list),
+            max_concurrency, return_exceptions=True)
 
-            help_base_url = HELP_BASE_CONTENT_URL
-            help_url = f"{help_base_url}/" # BlazeMeter don't use category_id
-            if subcategory_id != "self":
-                help_url += f"{subcategory_id}/"
-            help_url += f"{help_id}.html" # BlazeMeter use HTML not HTM
-
-            help_object = {
-                "help_id": help_id,
-            }
-            try:
-                result = await http_request("GET", endpoint=help_url, result_formatter=format_help_info,
-                                            result_formatter_params={"base_url": help_url})
-
-                # Expand or "Argument" the content ending with ""
-                if result.result.get("help_content", "").endswith("In this section:"):
-                    index_id = f"{category_id}:{subcategory_id}:{help_id}"
-                    sub_nodes_items = []
-                    if index_id in HelpManager.help_items_index:
-                        node_id = HelpManager.help_items_index[index_id]
-                        sub_nodes = HelpManager.help_index_nodes[node_id]["sub_nodes"]
-                        for sub_node in sub_nodes:
-                            if sub_node in HelpManager.help_index_nodes:
-                                sub_nodes_items.append(HelpManager.help_index_nodes[sub_node])
-                    help_object["sub_nodes"] = sub_nodes_items
-
-                help_object["help_result"] = result.result
-            except httpx.HTTPStatusError as e:
-                help_object["help_result"] = f"Error:{e.response.text}"
-
-            results.append(help_object)
+        results = []
+        for help_id, page_result in zip(help_id_list, page_results):
+            if isinstance(page_result, Exception):
+                results.append({"help_id": help_id, "help_result": f"Error:{batch_error(page_result)}"})
+            else:
+                results.append(page_result)
 
         return BaseResult(
             result=[{
@@ -194,6 +212,10 @@ class HelpManager(Manager):
         )
 
 
+register_gauge("help_cache_items", "Help pages indexed in the help cache",
+               lambda: len(HelpManager.help_index) if HelpManager.help_index else 0)
+
+
 def register(mcp, token: Optional[BzmToken]):
     @mcp.tool(
         name=f"{TOOLS_PREFIX}_help",
@@ -210,10 +232,15 @@ Actions:
         category_id (str): The category id.
         subcategory_id (str): The sub-category id.
         help_id_list (List[str]): The help id list to read.
+    args(dict): Dictionary with the following optional parameters:
+        section (str): Heading path of the sections to read, titles separated by '>' (e.g. 'Configuration > Parameters'). Partial titles are accepted.
+        query (str): Words to search, only the sections containing all of them are read.
+        Without matches, the available_sections of the page are listed. Use them on long pages to read only the needed sections.
 Hints:
 - Always generates the url attributes as a link in markdown format (like command_url).
 """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_help", ("list_help_categories", "list_help_category_content", "read_help_info"))
     async def help_main(
             action: str = Field(description="The action id to execute"),
             args: Dict[str, Any] = Field(description="Dictionary with parameters", default=None),
@@ -232,7 +259,8 @@ Hints:
                 case "read_help_info":
                     return await help_manager.read_help_info(args.get("category_id", "home"),
                                                              args.get("subcategory_id", ""),
-                                                             args.get("help_id_list", []))
+                                                             args.get("help_id_list", []),
+                                                             args.get("section"), args.get("query"))
                 case _:
                     return BaseResult(
                         error=f"Action {action} not found in help manager tool"
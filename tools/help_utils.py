@@ -1,5 +1,6 @@
 import json
 import re
+from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
 import lxml.html
@@ -293,6 +294,79 @@ def html_to_markdown(html_content, base_url=None):
     return markdown.strip()
 
 
+HEADING_PATTERN = re.compile(r"^(#{1,6}) (.+)$")
+
+
+def markdown_sections(markdown: str) -> List[Dict[str, Any]]:
+    """
+    Heading-addressed index of a markdown page. Each section has the path of titles from the top heading,
+    the offsets of its own text (until the next heading) and of its text with its subsections.
+    The text before the first heading is a section without title.
+    """
+    sections = []
+    opened = []  # Sections whose subsections can still follow
+    path = []
+    in_code = False
+    offset = 0
+    for line in markdown.splitlines(keepends=True):
+        if line.startswith("```"):
+            in_code = not in_code
+        heading = None if in_code else HEADING_PATTERN.match(line.rstrip("\n"))
+        if heading or offset == 0:
+            level = len(heading.group(1)) if heading else 0
+            title = heading.group(2).strip() if heading else ""
+            while opened and (opened[-1]["level"] >= level or opened[-1]["level"] == 0):
+                opened.pop()["end"] = offset
+            if sections:
+                sections[-1]["own_end"] = offset
+            path = [section["title"] for section in opened] + ([title] if heading else [])
+            section = {"title": title, "level": level, "path": path, "start": offset, "own_end": None, "end": None}
+            sections.append(section)
+            opened.append(section)
+        offset += len(line)
+    for section in opened:
+        section["end"] = offset
+    if sections:
+        sections[-1]["own_end"] = offset
+    return sections
+
+
+def select_markdown_sections(markdown: str, sections: List[Dict[str, Any]], section_path: Optional[str] = None,
+                             query: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Sections matching a heading path ('Title > Subtitle', the last titles of the path, case insensitive,
+    complete or partial titles) with their subsections, and/or containing all the words of a query
+    in their own text.
+    """
+    selected = sections
+    if section_path:
+        titles = [title.strip().casefold() for title in section_path.split(">") if title.strip()]
+
+        def path_matches(section: Dict[str, Any], exact: bool) -> bool:
+            path = [title.casefold() for title in section["path"]]
+            if len(path) < len(titles):
+                return False
+            return all(title == part if exact else title in part for title, part in zip(titles, path[-len(titles):]))
+
+        selected = ([section for section in sections if path_matches(section, True)]
+                    or [section for section in sections if path_matches(section, False)])
+        if query:
+            # The query is searched in the matching sections and their subsections
+            selected = [section for section in sections
+                        if any(parent["start"] <= section["start"] < parent["end"] for parent in selected)]
+    if query:
+        words = query.casefold().split()
+        selected = [{**section, "end": section["own_end"]} for section in selected
+                    if all(word in markdown[section["start"]:section["own_end"]].casefold()
+                           or any(word in title.casefold() for title in section["path"]) for word in words)]
+    # Subsections already included in a selected section are skipped
+    results = []
+    for section in selected:
+        if not results or section["start"] >= results[-1]["end"]:
+            results.append(section)
+    return results
+
+
 def convert_js_to_py_dict(js_text: str) -> dict:
     # Remove signup link
     js_text = js_text.replace(
@@ -0,0 +1,145 @@
+"""
+HTTP cache for the BlazeMeter API entity reads (tests, projects, workspaces, accounts).
+Responses with validators (ETag, Last-Modified) are revalidated with conditional requests,
+responses without validators are served from memory within a short freshness window.
+Cache-Control max-age, no-cache and no-store are honored.
+Entries are isolated by API key, and any mutation of an entity invalidates its cached reads.
+The entries are also kept on disk for a short time (see tools/entity_cache.py) for the next server sessions.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from tools.entity_cache import EntityCache, entity_cache
+from tools.instrumentation import register_gauge
+
+HTTP_CACHE_MAX_ENTRIES = 1024
+# Freshness of the responses without validators nor max-age, in seconds
+HTTP_CACHE_FRESHNESS_SECONDS = 30.0
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "last_modified", "stored", "freshness", "no_cache")
+
+    def __init__(self, body: Dict[str, Any], headers: httpx.Headers):
+        self.body = body
+        self.update(headers)
+
+    def update(self, headers: httpx.Headers) -> None:
+        # A 304 response can update the validators and the freshness of the stored response
+        self.etag = headers.get("etag", getattr(self, "etag", None))
+        self.last_modified = headers.get("last-modified", getattr(self, "last_modified", None))
+        self.stored = time.monotonic()
+        directives = cache_control(headers)
+        self.no_cache = "no-cache" in directives
+        max_age = directives.get("max-age")
+        if max_age is not None and max_age.isdigit():
+            self.freshness = float(max_age)
+        elif self.etag or self.last_modified:
+            self.freshness = 0.0  # Cheap to revalidate
+        else:
+            self.freshness = HTTP_CACHE_FRESHNESS_SECONDS
+
+    @classmethod
+    def restored(cls, body: Dict[str, Any], etag: Optional[str], last_modified: Optional[str],
+                 freshness: float) -> "CacheEntry":
+        """
+        Entry read from the disk store. With validators it's revalidated before its first use, as the entity
+        could be changed in BlazeMeter meanwhile, without them it's fresh for the rest of its time there.
+        """
+        entry = cls.__new__(cls)
+        entry.body = body
+        entry.etag = etag
+        entry.last_modified = last_modified
+        entry.stored = time.monotonic()
+        entry.freshness = 0.0 if etag or last_modified else freshness
+        entry.no_cache = False
+        return entry
+
+    def is_fresh(self) -> bool:
+        return not self.no_cache and time.monotonic() - self.stored < self.freshness
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_control(headers: httpx.Headers) -> Dict[str, Optional[str]]:
+    directives = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def is_cacheable(response: httpx.Response) -> bool:
+    return response.status_code == 200 and "no-store" not in cache_control(response.headers)
+
+
+class HttpCache:
+
+    def __init__(self, max_entries: int = HTTP_CACHE_MAX_ENTRIES, persistent: Optional[EntityCache] = None):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self.persistent = persistent
+
+    @staticmethod
+    def key(token_id: str, endpoint: str, params: Optional[Dict[str, Any]]) -> CacheKey:
+        return token_id, endpoint, tuple(sorted((str(name), str(value)) for name, value in (params or {}).items()))
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        entry = self.entries.get(key)
+        if entry is None and self.persistent is not None:
+            stored = self.persistent.get(key)
+            if stored is not None:
+                body, etag, last_modified, age = stored
+                entry = CacheEntry.restored(body, etag, last_modified, self.persistent.ttl - age)
+                self._put(key, entry)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key: CacheKey, body: Dict[str, Any], headers: httpx.Headers) -> None:
+        entry = CacheEntry(body, headers)
+        self._put(key, entry)
+        self._persist(key, entry)
+
+    def revalidated(self, key: CacheKey, entry: CacheEntry, headers: httpx.Headers) -> None:
+        """The stored response is still valid (304 Not Modified)."""
+        entry.update(headers)
+        self._persist(key, entry)
+
+    def _put(self, key: CacheKey, entry: CacheEntry) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _persist(self, key: CacheKey, entry: CacheEntry) -> None:
+        if self.persistent is not None and not entry.no_cache:
+            self.persistent.store(key, entry.body, entry.etag, entry.last_modified)
+
+    def invalidate(self, token_id: str, endpoint: str) -> None:
+        """Remove the cached reads of the entity changed by a request to the endpoint, e.g. /tests/1/files -> /tests/1"""
+        entity_path = "/" + "/".join(endpoint.strip("/").split("/")[:2])
+        for key in [key for key in self.entries
+                    if key[0] == token_id and (key[1] == entity_path or key[1].startswith(entity_path + "/"))]:
+            del self.entries[key]
+        if self.persistent is not None:
+            self.persistent.invalidate(token_id, endpoint)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+http_cache = HttpCache(persistent=entity_cache)
+register_gauge("http_cache_entries", "Entity reads stored in the HTTP cache", lambda: len(http_cache.entries))
@@ -0,0 +1,274 @@
+"""
+Instrumentation of the tools calls and the upstream requests (BlazeMeter API and help webpages).
+Collects latency histograms, upstream calls per tool invocation, transferred bytes and cache hits/misses.
+Optionally exports OpenTelemetry spans (BZM_MCP_OTEL_ENABLED=true, requires opentelemetry-api and a configured SDK).
+"""
+import functools
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from opentelemetry import trace
+except ImportError:  # Optional dependency
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+OTEL_ENABLED = trace is not None and os.getenv("BZM_MCP_OTEL_ENABLED", "false").lower() == "true"
+tracer = trace.get_tracer("bzm-mcp") if OTEL_ENABLED else None
+
+# Upper bounds in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds in calls
+CALLS_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 4, 5, 8, 10, 15, 20, 30, 50, 100)
+# Upper bounds in seconds of the event loop lag
+LAG_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last one it's the +Inf bucket
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        # Estimated as the upper bound of the bucket containing the quantile
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        accumulated = 0
+        for index, bucket_count in enumerate(self.counts):
+            accumulated += bucket_count
+            if accumulated >= rank:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def summary(self, scale: float = 1.0, precision: int = 1) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": round(self.sum / self.count * scale, precision) if self.count else 0,
+            "p50": round(self.quantile(0.50) * scale, precision),
+            "p95": round(self.quantile(0.95) * scale, precision),
+            "p99": round(self.quantile(0.99) * scale, precision),
+            "max": round(self.max * scale, precision),
+        }
+
+
+@dataclass
+class Invocation:
+    """Counters of a single tool invocation."""
+    upstream_calls: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+class Metrics:
+
+    def __init__(self):
+        self.started = time.time()
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.tool_upstream_calls: Dict[str, Histogram] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.endpoint_latency: Dict[str, Histogram] = {}
+        self.endpoint_bytes_in: Dict[str, int] = {}
+        self.endpoint_bytes_out: Dict[str, int] = {}
+        self.endpoint_statuses: Dict[Tuple[str, str], int] = {}
+        self.cache_hits: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+        self.in_flight_requests = 0
+        self.loop_lag = Histogram(LAG_BUCKETS)
+        self.worker_tasks: Dict[str, int] = {}  # 'offloaded' or 'inline' -> transforms
+
+    def reset(self) -> None:
+        in_flight_requests = self.in_flight_requests
+        self.__init__()
+        self.in_flight_requests = in_flight_requests
+
+    @staticmethod
+    def _histogram(histograms: Dict[str, Histogram], key: str, buckets: Tuple[float, ...]) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    def record_tool(self, key: str, duration: float, invocation: Invocation, failed: bool) -> None:
+        self._histogram(self.tool_latency, key, LATENCY_BUCKETS).observe(duration)
+        self._histogram(self.tool_upstream_calls, key, CALLS_BUCKETS).observe(invocation.upstream_calls)
+        if failed:
+            self.tool_errors[key] = self.tool_errors.get(key, 0) + 1
+
+    def record_request(self, key: str, duration: float, status: str, bytes_out: int, bytes_in: int) -> None:
+        self._histogram(self.endpoint_latency, key, LATENCY_BUCKETS).observe(duration)
+        self.endpoint_bytes_out[key] = self.endpoint_bytes_out.get(key, 0) + bytes_out
+        self.endpoint_bytes_in[key] = self.endpoint_bytes_in.get(key, 0) + bytes_in
+        self.endpoint_statuses[(key, status)] = self.endpoint_statuses.get((key, status), 0) + 1
+
+    def record_cache(self, cache_name: str, hit: bool) -> None:
+        counters = self.cache_hits if hit else self.cache_misses
+        counters[cache_name] = counters.get(cache_name, 0) + 1
+
+    def record_loop_lag(self, lag: float) -> None:
+        self.loop_lag.observe(lag)
+
+    def record_worker_task(self, offloaded: bool) -> None:
+        mode = "offloaded" if offloaded else "inline"
+        self.worker_tasks[mode] = self.worker_tasks.get(mode, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        tools = {}
+        for key, histogram in self.tool_latency.items():
+            tools[key] = {
+                "latency_ms": histogram.summary(scale=1000),
+                "upstream_calls": self.tool_upstream_calls[key].summary(precision=2),
+                "errors": self.tool_errors.get(key, 0),
+            }
+        endpoints = {}
+        for key, histogram in self.endpoint_latency.items():
+            endpoints[key] = {
+                "latency_ms": histogram.summary(scale=1000),
+                "bytes_in": self.endpoint_bytes_in.get(key, 0),
+                "bytes_out": self.endpoint_bytes_out.get(key, 0),
+                "statuses": {status: count for (endpoint, status), count in self.endpoint_statuses.items()
+                             if endpoint == key},
+            }
+        caches = {}
+        for cache_name in sorted(set(self.cache_hits) | set(self.cache_misses)):
+            caches[cache_name] = {"hits": self.cache_hits.get(cache_name, 0),
+                                  "misses": self.cache_misses.get(cache_name, 0)}
+        return {
+            "uptime_seconds": round(time.time() - self.started),
+            "in_flight_requests": self.in_flight_requests,
+            "event_loop_lag_ms": self.loop_lag.summary(scale=1000),
+            "worker_tasks": dict(self.worker_tasks),
+            "gauges": {name: callback() for name, (_, callback) in gauges.items()},
+            "tools": tools,
+            "endpoints": endpoints,
+            "caches": caches,
+            "opentelemetry": OTEL_ENABLED,
+        }
+
+
+metrics = Metrics()
+# Gauges evaluated when the metrics are exported, name -> (description, callback)
+gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+_invocation: ContextVar[Optional[Invocation]] = ContextVar("bzm_mcp_invocation", default=None)
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """
+    Low cardinality name of a request: numeric ids are replaced by {id} and
+    absolute urls (help webpages) are reduced to their host.
+    """
+    if endpoint.startswith(("http://", "https://")):
+        return f"{method} {urlsplit(endpoint).netloc}"
+    return f"{method} {_ID_PATTERN.sub('/{id}', endpoint)}"
+
+
+def _span(name: str, attributes: Dict[str, Any]):
+    if tracer is None:
+        return nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+class RequestTracker:
+    __slots__ = ("status", "bytes_out", "bytes_in")
+
+    def __init__(self):
+        self.status = "error"  # Status when there is no response (connection errors, timeouts)
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    def response(self, response) -> None:
+        self.status = str(response.status_code)
+        self.bytes_out = int(response.request.headers.get("content-length", 0))
+        self.bytes_in = response.num_bytes_downloaded
+
+
+@contextmanager
+def track_request(method: str, endpoint: str):
+    """Measure an upstream request, the caller reports the response to the tracker."""
+    key = endpoint_key(method, endpoint)
+    tracker = RequestTracker()
+    invocation = _invocation.get()
+    start = time.perf_counter()
+    metrics.in_flight_requests += 1
+    with _span(key, {"http.request.method": method, "url.path": endpoint}) as span:
+        try:
+            yield tracker
+        finally:
+            duration = time.perf_counter() - start
+            metrics.in_flight_requests -= 1
+            metrics.record_request(key, duration, tracker.status, tracker.bytes_out, tracker.bytes_in)
+            if invocation is not None:
+                invocation.upstream_calls += 1
+                invocation.bytes_out += tracker.bytes_out
+                invocation.bytes_in += tracker.bytes_in
+            if span is not None:
+                span.set_attribute("http.response.status_code", tracker.status)
+            logger.debug(f"{key} [{endpoint}] -> {tracker.status} in {duration * 1000:.1f}ms "
+                         f"(out {tracker.bytes_out} bytes, in {tracker.bytes_in} bytes)")
+
+
+def record_cache(cache_name: str, hit: bool) -> None:
+    metrics.record_cache(cache_name, hit)
+
+
+def register_gauge(name: str, description: str, callback: Callable[[], float]) -> None:
+    gauges[name] = (description, callback)
+
+
+def instrument_tool(tool_name: str, actions: Iterable[str]):
+    """
+    Decorator for the tools functions, measure each invocation by action.
+    Actions not in the tool actions are measured as 'unknown', the clients can't add metrics series.
+    """
+    known_actions = frozenset(actions)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            action = kwargs.get("action")
+            key = f"{tool_name}.{action if action in known_actions else 'unknown'}"
+            invocation = Invocation()
+            token = _invocation.set(invocation)
+            start = time.perf_counter()
+            failed = True
+            try:
+                with _span(key, {"mcp.tool.name": tool_name, "mcp.tool.action": str(action)}):
+                    result = await func(*args, **kwargs)
+                failed = bool(getattr(result, "error", None))
+                return result
+            finally:
+                duration = time.perf_counter() - start
+                _invocation.reset(token)
+                metrics.record_tool(key, duration, invocation, failed)
+                logger.debug(f"{key} in {duration * 1000:.1f}ms with {invocation.upstream_calls} upstream calls")
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,209 @@
+"""
+Incremental parser of the BlazeMeter API responses: {"result": [...], "total": ..., ...}
+The items of the top level result array are returned as soon as they are complete in the
+received chunks, so only the unparsed tail of the body is kept in memory.
+The other top level fields (error, total, skip, limit) are kept as they are small.
+A value not complete in its first chunk is only scanned for its end (nesting and strings) in the
+next chunks, and decoded when it's complete, so large items are not parsed again with every chunk.
+"""
+import codecs
+import json
+import re
+from typing import Any, Dict, List
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Brackets and whole strings, a string not ended in the text is matched until its end
+_STRING = r'[^"\\]*(?:\\.[^"\\]*)*(?:(?P<end>")|(?P<escape>\\)?\Z)'
+_TOKENS = re.compile(r'[{}\[\]]|"' + _STRING, re.DOTALL)
+_STRING_END = re.compile(_STRING, re.DOTALL)
+_SCALAR_END = re.compile(r"[,\]} \t\n\r]")
+_decoder = json.JSONDecoder()
+
+# Parser states
+_OBJECT_START = 0
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_AFTER_VALUE = 4
+_ITEM = 5
+_AFTER_ITEM = 6
+_DONE = 7
+
+
+class ResultArrayParser:
+    __slots__ = ("fields", "result_is_list", "_result_key", "_utf8", "_buffer", "_position", "_state", "_key",
+                 "_parts", "_scanning", "_complete", "_depth", "_in_string", "_escaped", "_scalar")
+
+    def __init__(self, result_key: str = "result"):
+        self.fields: Dict[str, Any] = {}  # Top level fields, except the result
+        self.result_is_list = True
+        self._result_key = result_key
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._state = _OBJECT_START
+        self._key = None
+        # Scanner of the value at the position: chunks received while it's incomplete, and its state
+        self._parts: List[str] = []
+        self._scanning = False
+        self._complete = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._scalar = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add a chunk of the body, returning the result items completed with it."""
+        text = self._utf8.decode(chunk)
+        if self._scanning:
+            # Only the new text is scanned, the value is joined once its end arrives
+            self._parts.append(text)
+            if self._scan(text, 0) is None:
+                return []
+            self._complete = True
+            self._join_parts()
+        else:
+            self._buffer += text
+        items = self._parse(final=False)
+        # Drop the consumed text
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        return items
+
+    def close(self) -> List[Any]:
+        """End of the body, returning the last items. Raises ValueError if the body is incomplete."""
+        self._parts.append(self._utf8.decode(b"", final=True))
+        self._join_parts()
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON response")
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        self._position = _WHITESPACE.match(self._buffer, self._position).end()
+        return self._position < len(self._buffer)
+
+    def _join_parts(self) -> None:
+        self._buffer = "".join([self._buffer, *self._parts])
+        self._parts = []
+
+    def _scan(self, text: str, position: int):
+        """Continue scanning the value in the text, the position after its end or None if it doesn't end in it."""
+        if position >= len(text):
+            return None
+        if self._scalar:
+            # Numbers and literals at the end of the text can continue in the next chunk
+            match = _SCALAR_END.search(text, position)
+            return match.start() if match else None
+        if self._in_string:
+            # End of a string started in a previous chunk
+            if self._escaped:
+                self._escaped = False
+                position += 1
+            match = _STRING_END.match(text, position)
+            if not match.group("end"):
+                self._escaped = match.group("escape") is not None
+                return None
+            self._in_string = False
+            position = match.end()
+            if self._depth == 0:
+                return position
+        for match in _TOKENS.finditer(text, position):
+            token = match.group()
+            if token in "{[":
+                self._depth += 1
+            elif token in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    return match.end()
+            elif not match.group("end"):
+                # The string continues in the next chunk
+                self._in_string = True
+                self._escaped = match.group("escape") is not None
+                return None
+            elif self._depth == 0:
+                return match.end()
+        return None
+
+    def _decode_value(self, final: bool):
+        """Decode the value at the position, None when it's not complete yet."""
+        complete = self._complete or final
+        self._complete = False
+        try:
+            value, end = _decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            if complete:
+                raise ValueError(f"Invalid JSON response at {self._position}")
+            end = None
+        scalar = self._buffer[self._position] not in '"{['
+        # Numbers and literals not followed by a delimiter can continue in the next chunk ('1.' of '1.5')
+        if not complete and (end is None or scalar and _SCALAR_END.match(self._buffer, end) is None):
+            # Not decoded again until the scanner finds its end in the next chunks
+            self._depth = 0
+            self._in_string = self._escaped = False
+            self._scalar = scalar
+            if self._scan(self._buffer, self._position) is None:
+                self._scanning = True
+                return None
+            raise ValueError(f"Invalid JSON response at {self._position}")
+        self._scanning = False
+        self._position = end
+        return (value,)
+
+    def _expect(self, characters: str) -> str:
+        character = self._buffer[self._position]
+        if character not in characters:
+            raise ValueError(f"Invalid JSON response, unexpected {character!r} at {self._position}")
+        self._position += 1
+        return character
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        while self._state != _DONE and self._skip_whitespace():
+            if self._state == _OBJECT_START:
+                self._expect("{")
+                self._state = _KEY
+            elif self._state == _KEY:
+                if self._buffer[self._position] == "}":  # Empty object
+                    self._position += 1
+                    self._state = _DONE
+                    continue
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    break
+                self._key = decoded[0]
+                self._state = _COLON
+            elif self._state == _COLON:
+                self._expect(":")
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if self._key == self._result_key and self._buffer[self._position] == "[":
+                    self._position += 1
+                    self._state = _ITEM
+                    continue
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    break
+                if self._key == self._result_key:
+                    # Single object result
+                    self.result_is_list = False
+                    if decoded[0] is not None:
+                        items.append(decoded[0])
+                else:
+                    self.fields[self._key] = decoded[0]
+                self._state = _AFTER_VALUE
+            elif self._state == _AFTER_VALUE:
+                self._state = _KEY if self._expect(",}") == "," else _DONE
+            elif self._state == _ITEM:
+                if self._buffer[self._position] == "]":  # Empty array
+                    self._position += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    break
+                items.append(decoded[0])
+                self._state = _AFTER_ITEM
+            elif self._state == _AFTER_ITEM:
+                self._state = _ITEM if self._expect(",]") == "," else _AFTER_VALUE
+        return items
@@ -0,0 +1,115 @@
+"""
+Distribution of the test concurrency between locations.
+Users are allocated with the largest remainder method, so the allocations always sum the
+target concurrency, and validated against the workspace locations limits (max concurrency,
+max engines and users per engine) before the test is started.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class LoadPlan:
+    concurrency: int
+    users: Dict[str, int] = field(default_factory=dict)
+    engines: Dict[str, int] = field(default_factory=dict)
+    adjustments: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def summary(self) -> List[str]:
+        locations = ", ".join(f"{location}: {users} users in {self.engines[location]} engines"
+                              for location, users in self.users.items())
+        return [f"Load plan for {self.concurrency} users. {locations}"] + self.adjustments
+
+
+def allocate_users(concurrency: int, percents: Dict[str, float]) -> Dict[str, int]:
+    """
+    Split the concurrency by the locations percents with the largest remainder method.
+    Every location gets at least 1 user (BlazeMeter default), taken from the largest allocations.
+    """
+    weights = {location: percent for location, percent in percents.items() if percent > 0}
+    total_weight = sum(weights.values())
+    if not weights:
+        return {}
+    quotas = {location: concurrency * weight / total_weight for location, weight in weights.items()}
+    users = {location: int(quota) for location, quota in quotas.items()}
+    remaining = concurrency - sum(users.values())
+    for location in sorted(quotas, key=lambda name: users[name] - quotas[name])[:remaining]:
+        users[location] += 1
+
+    for location in [location for location, location_users in users.items() if location_users == 0]:
+        users[location] = 1
+        largest = max(users, key=users.get)
+        if users[largest] > 1:
+            users[largest] -= 1
+    return users
+
+
+def location_capacity(limits: Dict[str, int]) -> int:
+    return min(limits["location_max_concurrency"],
+               limits["location_max_engines"] * limits["test_max_concurrency_per_engine"])
+
+
+def plan_load(concurrency: int, percents: Dict[str, float], limits: Dict[str, Dict[str, int]],
+              adjust: bool = False) -> LoadPlan:
+    """
+    Allocate the users of each location and the minimum engines to run them.
+    limits are the formatted limits of the workspace locations, by location id.
+    Without adjust, a plan exceeding the capacity of a location is rejected. With adjust, the
+    exceeding users are moved to the locations with free capacity, and the concurrency
+    is reduced when all the locations are full. Locations without capacity (no engines or
+    users per engine) are rejected, or left out of the plan with adjust.
+    """
+    plan = LoadPlan(concurrency=concurrency)
+    unknown_locations = [location for location in percents if location not in limits]
+    if unknown_locations:
+        plan.error = f"Locations not available in the workspace: {', '.join(unknown_locations)}"
+        return plan
+
+    capacities = {location: location_capacity(limits[location]) for location in percents}
+    empty_locations = [location for location in percents if capacities[location] <= 0]
+    if empty_locations:
+        if not adjust or len(empty_locations) == len(percents):
+            plan.error = f"Locations without capacity in the workspace: {', '.join(empty_locations)}"
+            return plan
+        percents = {location: percent for location, percent in percents.items() if location not in empty_locations}
+        plan.adjustments.extend(f"Location {location} left out, it has no capacity" for location in empty_locations)
+    users = allocate_users(concurrency, percents)
+    if sum(users.values()) > concurrency:
+        # Every location runs at least 1 user
+        if not adjust:
+            plan.error = f"{len(users)} locations need at least {len(users)} users, {concurrency} requested"
+            return plan
+        plan.adjustments.append(f"Concurrency raised from {concurrency} to {sum(users.values())} users, "
+                                f"at least 1 user for each location")
+        plan.concurrency = concurrency = sum(users.values())
+    exceeded = [location for location, location_users in users.items() if location_users > capacities[location]]
+    if exceeded and not adjust:
+        plan.error = "; ".join(
+            f"Location {location} supports up to {capacities[location]} users "
+            f"({limits[location]['location_max_engines']} engines of "
+            f"{limits[location]['test_max_concurrency_per_engine']} users, "
+            f"max {limits[location]['location_max_concurrency']} users), {users[location]} requested"
+            for location in exceeded)
+        return plan
+
+    full = {}
+    while exceeded:
+        for location in exceeded:
+            full[location] = capacities[location]
+            plan.adjustments.append(f"Location {location} limited to {capacities[location]} users")
+        free_percents = {location: percent for location, percent in percents.items() if location not in full}
+        remaining = concurrency - sum(full.values())
+        users = {**full, **allocate_users(max(remaining, 0), free_percents)}
+        exceeded = [location for location, location_users in users.items()
+                    if location not in full and location_users > capacities[location]]
+    if sum(users.values()) < concurrency:
+        plan.concurrency = sum(users.values())
+        plan.adjustments.append(f"Concurrency reduced from {concurrency} to {plan.concurrency} users, "
+                                f"the capacity of the selected locations")
+
+    plan.users = {location: users[location] for location in percents if location in users}
+    plan.engines = {location: max(1, math.ceil(location_users / limits[location]["test_max_concurrency_per_engine"]))
+                    for location, location_users in plan.users.items()}
+    return plan
@@ -0,0 +1,69 @@
+"""
+Index of the locations of a workspace, to answer capacity queries locally.
+Built in a single pass over the workspace payload, the locations are kept in the workspace
+order with a secondary order by engine capacity (threadsPerEngine) and a set of positions by purpose.
+"""
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Set
+
+from formatters.workspace import format_location, is_private_location
+
+# Location purposes are named differently in the tools arguments
+PURPOSE_IDS = {"mock": "serviceMock"}
+
+
+class LocationIndex:
+    __slots__ = ("account_id", "locations", "private", "engines", "by_threads", "negative_threads", "purposes")
+
+    def __init__(self, account_id: int, locations: List[Dict[str, Any]]):
+        self.account_id = account_id
+        self.locations = [format_location(location) for location in locations]
+        self.private = [is_private_location(location["id"]) for location in locations]
+        self.engines = [location["limits"]["engines"] for location in locations]
+        threads = [location["limits"]["threadsPerEngine"] for location in locations]
+        # Positions by threadsPerEngine descending, negated for bisect
+        self.by_threads = sorted(range(len(locations)), key=lambda position: -threads[position])
+        self.negative_threads = [-threads[position] for position in self.by_threads]
+        self.purposes: Dict[str, Set[int]] = {}
+        for position, location in enumerate(locations):
+            for purpose, enabled in location.get("purposes", {}).items():
+                if enabled:
+                    self.purposes.setdefault(purpose, set()).add(position)
+
+    @classmethod
+    def from_workspace(cls, workspace: Dict[str, Any]) -> "LocationIndex":
+        return cls(workspace["accountId"], workspace.get("locations", []))
+
+    def query(self, purpose: Optional[str] = None, min_threads_per_engine: int = 0, min_engines: int = 0,
+              private_only: bool = False) -> Dict[str, Any]:
+        """Locations matching all the filters, split in private and public, in the workspace order."""
+        if min_threads_per_engine > 0:
+            positions = sorted(self.by_threads[:bisect_right(self.negative_threads, -min_threads_per_engine)])
+        else:
+            positions = range(len(self.locations))
+        if purpose:
+            purpose_positions = self.purposes.get(PURPOSE_IDS.get(purpose, purpose), set())
+            positions = [position for position in positions if position in purpose_positions]
+
+        private_locations = []
+        public_locations = []
+        for position in positions:
+            if self.engines[position] < min_engines:
+                continue
+            if self.private[position]:
+                private_locations.append(self.locations[position])
+            elif not private_only:
+                public_locations.append(self.locations[position])
+        return {
+            "account_id": self.account_id,
+            "private": private_locations,
+            "public": public_locations,
+        }
+
+    def limits(self, purpose: Optional[str] = "load") -> Dict[str, Dict[str, int]]:
+        """Limits of the locations with the purpose, by location id."""
+        result = self.query(purpose)
+        return {location["location_id"]: location["limits"] for location in result["private"] + result["public"]}
+
+    def __len__(self) -> int:
+        return len(self.locations)
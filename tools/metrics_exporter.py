@@ -0,0 +1,152 @@
+"""
+Prometheus metrics endpoint for long-running deployments.
+Renders the instrumentation collected by tools.instrumentation in the Prometheus text format.
+The endpoint runs on the server event loop, the same loop that updates the metrics, so no locks are needed.
+"""
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.version import __version__
+from tools.instrumentation import Histogram, Metrics, gauges, metrics
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "bzm_mcp"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _tool_labels(key: str) -> Dict[str, str]:
+    tool, _, action = key.partition(".")
+    return {"tool": tool, "action": action}
+
+
+def _endpoint_labels(key: str) -> Dict[str, str]:
+    method, _, endpoint = key.partition(" ")
+    return {"method": method, "endpoint": endpoint}
+
+
+def _header(lines: List[str], name: str, metric_type: str, description: str) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def _histogram(lines: List[str], name: str, labels: Dict[str, str], histogram: Histogram) -> None:
+    accumulated = 0
+    for bound, bucket_count in zip(list(histogram.buckets) + [float("inf")], histogram.counts):
+        accumulated += bucket_count
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': _format_value(float(bound))})} {accumulated}")
+    lines.append(f"{name}_sum{_labels(labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def _counters(lines: List[str], name: str, description: str,
+              samples: Iterable[Tuple[Dict[str, str], float]]) -> None:
+    _header(lines, name, "counter", description)
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels)} {_format_value(value)}")
+
+
+def render_prometheus(source: Metrics = metrics) -> str:
+    lines: List[str] = []
+
+    _header(lines, f"{PREFIX}_info", "gauge", "BlazeMeter MCP server information")
+    lines.append(f"{PREFIX}_info{_labels({'version': __version__})} 1")
+    _header(lines, f"{PREFIX}_start_time_seconds", "gauge", "Start time of the metrics collection")
+    lines.append(f"{PREFIX}_start_time_seconds {_format_value(source.started)}")
+
+    _header(lines, f"{PREFIX}_tool_duration_seconds", "histogram", "Latency of the tool invocations")
+    for key, histogram in source.tool_latency.items():
+        _histogram(lines, f"{PREFIX}_tool_duration_seconds", _tool_labels(key), histogram)
+
+    _header(lines, f"{PREFIX}_tool_upstream_calls", "histogram", "Upstream requests per tool invocation")
+    for key, histogram in source.tool_upstream_calls.items():
+        _histogram(lines, f"{PREFIX}_tool_upstream_calls", _tool_labels(key), histogram)
+
+    _counters(lines, f"{PREFIX}_tool_errors_total", "Tool invocations that returned an error",
+              ((_tool_labels(key), value) for key, value in source.tool_errors.items()))
+
+    _header(lines, f"{PREFIX}_upstream_request_duration_seconds", "histogram",
+            "Latency of the upstream requests (BlazeMeter API and help webpages)")
+    for key, histogram in source.endpoint_latency.items():
+        _histogram(lines, f"{PREFIX}_upstream_request_duration_seconds", _endpoint_labels(key), histogram)
+
+    _counters(lines, f"{PREFIX}_upstream_requests_total", "Upstream requests by response status code",
+              (({**_endpoint_labels(key), "status": status}, value)
+               for (key, status), value in source.endpoint_statuses.items()))
+    _counters(lines, f"{PREFIX}_upstream_received_bytes_total", "Bytes received from upstream",
+              ((_endpoint_labels(key), value) for key, value in source.endpoint_bytes_in.items()))
+    _counters(lines, f"{PREFIX}_upstream_sent_bytes_total", "Bytes sent to upstream",
+              ((_endpoint_labels(key), value) for key, value in source.endpoint_bytes_out.items()))
+
+    _header(lines, f"{PREFIX}_upstream_in_flight_requests", "gauge", "Upstream requests waiting for a response")
+    lines.append(f"{PREFIX}_upstream_in_flight_requests {source.in_flight_requests}")
+
+    _header(lines, f"{PREFIX}_event_loop_lag_seconds", "histogram",
+            "Delay of the event loop on the periodic lag measurements, the time it was blocked")
+    _histogram(lines, f"{PREFIX}_event_loop_lag_seconds", {}, source.loop_lag)
+    _counters(lines, f"{PREFIX}_worker_tasks_total",
+              "CPU bound transforms, run in the worker pool or in the event loop",
+              (({"mode": mode}, value) for mode, value in source.worker_tasks.items()))
+
+    _counters(lines, f"{PREFIX}_cache_hits_total", "Cache hits",
+              (({"cache": name}, value) for name, value in source.cache_hits.items()))
+    _counters(lines, f"{PREFIX}_cache_misses_total", "Cache misses",
+              (({"cache": name}, value) for name, value in source.cache_misses.items()))
+
+    for name, (description, callback) in sorted(gauges.items()):
+        _header(lines, f"{PREFIX}_{name}", "gauge", description)
+        lines.append(f"{PREFIX}_{name} {_format_value(callback())}")
+
+    return "\n".join(lines) + "\n"
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=10)
+        while True:  # Discard the headers
+            header = await asyncio.wait_for(reader.readline(), timeout=10)
+            if header in (b"\r\n", b"\n", b""):
+                break
+        parts = request_line.decode("latin-1").split()
+        path = parts[1].split("?")[0] if len(parts) > 1 else ""
+        if len(parts) > 1 and parts[0] == "GET" and path == "/metrics":
+            status, content_type, body = "200 OK", CONTENT_TYPE, render_prometheus().encode("utf-8")
+        else:
+            status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", b"Not Found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError) as e:
+        logger.debug(f"Metrics connection error: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: str, port: int) -> Optional[asyncio.Server]:
+    """Serve GET /metrics on the current event loop."""
+    try:
+        server = await asyncio.start_server(_handle_connection, host, port)
+    except OSError as e:
+        logger.error(f"Metrics endpoint can't listen on {host}:{port}: {e}")
+        return None
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return server
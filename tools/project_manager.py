@@ -1,16 +1,17 @@
 import traceback
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 import httpx
 from mcp.server.fastmcp import Context
 
-from config.blazemeter import TOOLS_PREFIX, PROJECTS_ENDPOINT
+from config.blazemeter import TOOLS_PREFIX, PROJECTS_ENDPOINT, MAX_BATCH_CONCURRENCY
 from config.token import BzmToken
 from formatters.project import format_projects
 from models.manager import Manager
 from models.result import BaseResult
 from tools import bridge
-from tools.utils import api_request
+from tools.instrumentation import instrument_tool
+from tools.utils import api_request, gather_limited, batch_ids, batch_error
 
 
 class ProjectManager(Manager):
@@ -18,12 +19,14 @@ class ProjectManager(Manager):
     def __init__(self, token: Optional[BzmToken], ctx: Context):
         super().__init__(token, ctx)
 
-    async def read(self, project_id: int) -> BaseResult:
+    async def read(self, project_id: int, fresh: bool = False) -> BaseResult:
         project_result = await api_request(
             self.token,
             "GET",
             f"{PROJECTS_ENDPOINT}/{project_id}",
-            result_formatter=format_projects
+            result_formatter=format_projects,
+            cache=True,
+            fresh=fresh
         )
 
         if project_result.error:
@@ -39,6 +42,61 @@ class ProjectManager(Manager):
         project_element.tests_count = await bridge.count_project_tests(self.token, self.ctx, project_id)
         return project_result
 
+    async def read_many(self, project_ids: List[int], max_concurrency: int = MAX_BATCH_CONCURRENCY,
+                        fresh: bool = False) -> BaseResult:
+        """
+        Read many projects concurrently. Each workspace is validated once for all its projects.
+        Results keep the input order, with an error for each project that can't be read.
+                refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
+        """
+        unique_ids = batch_ids(project_ids)
+        project_results = await gather_limited(
+            (api_request(self.token, "GET", f"{PROJECTS_ENDPOINT}/{project_id}", result_formatter=format_projects,
+                         cache=True, fresh=fresh)
+             for project_id in unique_ids),
+            max_concurrency, return_exceptions=True)
+        projects = dict(zip(unique_ids, project_results))
+
+        workspace_ids = list({project_result.result[0].workspace_id for project_result in project_results
+                              if isinstance(project_result, BaseResult) and not project_result.error})
+        workspace_results = await gather_limited(
+            (bridge.read_workspace(self.token, self.ctx, workspace_id) for workspace_id in workspace_ids),
+            max_concurrency, return_exceptions=True)
+        workspaces = dict(zip(workspace_ids, workspace_results))
+
+        # Get the amount of tests of the allowed projects
+        allowed_ids = []
+        for project_id in unique_ids:
+            project_result = projects[project_id]
+            if isinstance(project_result, BaseResult) and not project_result.error:
+                workspace_result = workspaces[project_result.result[0].workspace_id]
+                if isinstance(workspace_result, BaseResult) and not workspace_result.error:
+                    allowed_ids.append(project_id)
+        tests_counts = await gather_limited(
+            (bridge.count_project_tests(self.token, self.ctx, project_id) for project_id in allowed_ids),
+            max_concurrency, return_exceptions=True)
+        tests_counts = dict(zip(allowed_ids, tests_counts))
+
+        results = []
+        for project_id in project_ids:
+            project_result = projects[project_id]
+            if isinstance(project_result, Exception) or project_result.error:
+                results.append({"project_id": project_id, "error": batch_error(project_result)})
+                continue
+            project_element = project_result.result[0]
+            if project_id not in tests_counts:
+                results.append({"project_id": project_id,
+                                "error": batch_error(workspaces[project_element.workspace_id])})
+            elif isinstance(tests_counts[project_id], Exception):
+                results.append({"project_id": project_id, "error": batch_error(tests_counts[project_id])})
+            else:
+                project_element.tests_count = tests_counts[project_id]
+                results.append({"project_id": project_id, "result": project_element})
+        return BaseResult(
+            result=results,
+            total=len(results)
+        )
+
     async def list(self, workspace_id: int, limit: int = 50, offset: int = 0) -> BaseResult:
 
         # Check if it's valid or allowed
@@ -72,6 +130,10 @@ def register(mcp, token: Optional[BzmToken]):
         - read: Read a Project. Obtain information about a particular project.
             args(dict): Dictionary with the following required parameters:
                 project_id (int): The id of the project to get information.
+                refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
+        - read_many: Read many projects in a single call. Prefer it over several 'read' calls.
+            args(dict): Dictionary with the following required parameters:
+                project_id_list (list[int]): The ids of the projects to read (max 50). Results keep this order, with an error for each project that can't be read.
         - list: List all projects. 
             args(dict): Dictionary with the following required parameters:
                 workspace_id (int): The id of the workspace to list projects from.
@@ -82,12 +144,15 @@ def register(mcp, token: Optional[BzmToken]):
         - Reading also allows you to obtain the number of tests the project has without having to use a list to count.
         """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_project", ("read", "read_many", "list"))
     async def project(action: str, args: Dict[str, Any], ctx: Context) -> BaseResult:
         project_manager = ProjectManager(token, ctx)
         try:
             match action:
                 case "read":
-                    return await project_manager.read(args["project_id"])
+                    return await project_manager.read(args["project_id"], args.get("refresh", False))
+                case "read_many":
+                    return await project_manager.read_many(args["project_id_list"], fresh=args.get("refresh", False))
                 case "list":
                     limit = args.get("limit", 10)
                     offset = args.get("offset", 0)
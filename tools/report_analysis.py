@@ -0,0 +1,115 @@
+"""
+Aggregation of the errors report of an execution.
+Messages and labels are normalized (ids, numbers, timestamps and query values masked), so errors
+that only differ by those values share a signature. Groups are counted in a single pass
+with bounded memory: when the groups limit is reached, the smallest group is replaced
+(Space-Saving algorithm), which keeps the counts of the top groups exact or overestimated by
+at most the reported error.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ERROR_GROUPS_LIMIT = 5000
+
+_MASKS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?\b"), "<timestamp>"),
+    (re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b"), "<email>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{16,}\b"), "<hex>"),
+    (re.compile(r"([?&][^=&#\s]+=)[^&#\s]*"), r"\1<*>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_message(message: Optional[str]) -> str:
+    """Signature of an error message or label, with the variable parts masked."""
+    if not message:
+        return ""
+    for pattern, replacement in _MASKS:
+        message = pattern.sub(replacement, message)
+    return _SPACES.sub(" ", message).strip()
+
+
+class _ErrorGroup:
+    __slots__ = ("count", "overestimation", "samples")
+
+    def __init__(self, count: int, overestimation: int):
+        self.count = count
+        self.overestimation = overestimation
+        self.samples: List[str] = []
+
+
+class ErrorReportAnalyzer:
+
+    def __init__(self, max_samples: int = 3, max_groups: int = ERROR_GROUPS_LIMIT):
+        self.max_samples = max_samples
+        self.max_groups = max_groups
+        self.groups: Dict[Tuple[str, str, str, str], _ErrorGroup] = {}
+        self.total = 0
+        self.evicted = 0
+        self._signatures: Dict[str, str] = {}  # Memo of the labels signatures, bounded by max_groups
+
+    def _signature(self, text: Optional[str]) -> str:
+        signature = self._signatures.get(text)
+        if signature is None:
+            signature = normalize_message(text)
+            if len(self._signatures) < self.max_groups:
+                self._signatures[text] = signature
+        return signature
+
+    def add(self, error_type: str, label: Optional[str], response_code: Any, message: Optional[str],
+            count: int = 1) -> None:
+        count = int(count or 1)
+        self.total += count
+        key = (error_type, self._signature(label), str(response_code or ""), normalize_message(message))
+        group = self.groups.get(key)
+        if group is None:
+            overestimation = 0
+            if len(self.groups) >= self.max_groups:
+                # Replace the smallest group, the new group inherits its count as possible overestimation
+                smallest_key = min(self.groups, key=lambda group_key: self.groups[group_key].count)
+                overestimation = self.groups.pop(smallest_key).count
+                self.evicted += 1
+            group = self.groups[key] = _ErrorGroup(overestimation, overestimation)
+        group.count += count
+        if message and len(group.samples) < self.max_samples and message not in group.samples:
+            group.samples.append(message)
+
+    def add_row(self, row: Dict[str, Any]) -> None:
+        """Add a row of the errorsreport/data endpoint, with the errors of a label."""
+        label = row.get("name") or row.get("labelId")
+        for error in row.get("errors") or []:
+            self.add("error", label, error.get("rc"), error.get("m"), error.get("count"))
+        for assertion in row.get("assertions") or []:
+            self.add("assertion", label, assertion.get("name"), assertion.get("failureMessage"),
+                     assertion.get("failures"))
+        for resource in row.get("failedEmbeddedResources") or []:
+            self.add("embedded_resource", label, resource.get("rc"), resource.get("m"), resource.get("count"))
+
+    def add_report(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.add_row(row)
+
+    def top(self, top_k: int = 10) -> Dict[str, Any]:
+        groups = sorted(self.groups.items(), key=lambda item: item[1].count, reverse=True)[:top_k]
+        top_groups = []
+        for (error_type, label, response_code, signature), group in groups:
+            top_group = {
+                "type": error_type,
+                "label": label,
+                "response_code": response_code,
+                "signature": signature,
+                "count": group.count,
+                "percent": round(group.count * 100 / self.total, 2) if self.total else 0,
+                "samples": group.samples,
+            }
+            if group.overestimation:
+                top_group["max_count_error"] = group.overestimation
+            top_groups.append(top_group)
+        return {
+            "total_errors": self.total,
+            "groups": len(self.groups),
+            "evicted_groups": self.evicted,
+            "top": top_groups,
+        }
@@ -1,15 +1,49 @@
-from typing import Optional
+import asyncio
+import base64
+import json
+import os
+import time
+from datetime import datetime
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from mcp.server.fastmcp import Context
 
-from config.blazemeter import EXECUTIONS_ENDPOINT
+from config.blazemeter import EXECUTIONS_ENDPOINT, MAX_BATCH_CONCURRENCY
 from config.token import BzmToken
+from formatters.execution import format_executions_detailed
+from models.execution import TestExecutionDetailed
 from models.manager import Manager
+from models.result import BaseResult
 from tools import bridge
-from tools.utils import api_request
+from tools.instrumentation import record_cache
+from tools.report_analysis import ErrorReportAnalyzer
+from tools.result_cache import iter_rows, result_cache
+from tools.results_store import REPORTS, get_results_store
+from tools.timeline import DOWNSAMPLING_METHODS, downsample
+from tools.trend import metric_trend, moving_average, outliers
+from tools.utils import api_request, api_request_stream, gather_limited, batch_error, get_date_time_iso
+from tools.workers import offload
+
+
+REPORT_CACHE_TTL_SECONDS = 60
+REPORT_CACHE_MAX_ENTRIES = 16
+REPORT_PAGE_LIMIT = 50
+REPORT_MAX_PAGE_LIMIT = 500
+TIMELINE_MAX_POINTS = 300
+TIMELINE_MAX_POINTS_LIMIT = 2000
+TERMINAL_EXECUTION_STATUSES = {"pass", "fail", "unset", "abort", "error", "noData"}
+TREND_MAX_EXECUTIONS = 50
+RESULTS_STORE_MAX_INGEST = 500
+RESULTS_STORE_ERROR_GROUPS = 100
+RESULTS_STORE_DISABLED = ("The local results store is disabled, "
+                          "set the BZM_MCP_RESULTS_DB environment variable with the database file to enable it.")
+TREND_METRICS = ("avg_rt", "p90_rt", "p95_rt", "p99_rt", "throughput", "error_rate")
 
 
 class ReportManager(Manager):
+    reports = OrderedDict()  # Static to share between instances, (token id, master id, report) -> (timestamp, rows)
 
     def __init__(self, token: Optional[BzmToken], ctx: Context):
         super().__init__(token, ctx)
@@ -20,39 +54,530 @@ class ReportManager(Manager):
         if execution_result.error:
             return execution_result
 
-        return await api_request(
-            self.token,
-            "GET",
-            f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/default/summary")
+        return await self._immutable_report(
+            _is_ended(execution_result.result[0]["result"]), master_id, "summary",
+            lambda: api_request(
+                self.token,
+                "GET",
+                f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/default/summary")
+        )
+
+    async def _immutable_report(self, ended: bool, master_id: int, report: str,
+                                download: Callable[[], Awaitable[BaseResult]], refresh: bool = False) -> BaseResult:
+        """
+        Report of an ended execution, from the disk cache when it was already downloaded.
+        Reports of running executions are always downloaded.
+        """
+        if not ended:
+            return await download()
+        token_id = self.token.id if self.token else None
+        cached = None if refresh else await result_cache.get(token_id, master_id, report)
+        if cached is not None:
+            return BaseResult(result=cached["result"], total=cached["total"])
+        report_result = await download()
+        if not report_result.error:
+            await result_cache.store(token_id, master_id, report, {
+                "result": report_result.result,
+                "total": report_result.total,
+            })
+        return report_result
+
+    async def _read_report(self, master_id: int, report: str, refresh: bool = False) -> BaseResult:
+        """
+        Rows of a report, kept REPORT_CACHE_TTL_SECONDS to serve the following pages from memory.
+        The execution is validated only when the report is downloaded.
+        """
+        cache_key = (self.token.id if self.token else None, master_id, report)
+        cached = ReportManager.reports.get(cache_key)
+        is_fresh = cached is not None and time.time() - cached[0] < REPORT_CACHE_TTL_SECONDS and not refresh
+        record_cache("reports", is_fresh)
+        if is_fresh:
+            ReportManager.reports.move_to_end(cache_key)
+            return BaseResult(result=cached[1])
 
-    async def read_error(self, master_id: int):
+        # Check if it's valid or allowed
+        execution_result = await bridge.read_execution(self.token, self.ctx, master_id)
+        if execution_result.error:
+            return execution_result
+
+        report_result = await self._immutable_report(
+            _is_ended(execution_result.result[0]["result"]), master_id, report,
+            lambda: api_request_stream(
+                self.token,
+                "GET",
+                f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/{report}/data"
+            ),
+            refresh
+        )
+        if report_result.error:
+            return report_result
+        ReportManager.reports[cache_key] = (time.time(), report_result.result)
+        ReportManager.reports.move_to_end(cache_key)
+        while len(ReportManager.reports) > REPORT_CACHE_MAX_ENTRIES:
+            ReportManager.reports.popitem(last=False)
+        return report_result
+
+    async def read_error(self, master_id: int, limit: int = REPORT_PAGE_LIMIT, cursor: Optional[str] = None,
+                         sort: Optional[str] = None, label: Optional[str] = None,
+                         response_code: Optional[str] = None, refresh: bool = False) -> BaseResult:
         """
         Get error report for a given master_id with client-side paging.
         Always returns paged results for AI efficiency.
         """
+        report_result = await self._read_report(master_id, "errorsreport", refresh)
+        if report_result.error:
+            return report_result
+
+        # Paged in the worker pool when the report is large
+        return await offload(_page, report_result.result, limit, cursor, sort,
+                             partial(_error_row_matches, label=label, response_code=response_code),
+                             _errors_sort_value, query=("errorsreport", label, response_code),
+                             rows=len(report_result.result))
+
+    async def read_request_stats(self, master_id: int, limit: int = REPORT_PAGE_LIMIT,
+                                 cursor: Optional[str] = None, sort: Optional[str] = None,
+                                 label: Optional[str] = None, refresh: bool = False) -> BaseResult:
+        """
+        Get request statistics report for a given master_id with client-side paging.
+        Always returns paged results for AI efficiency.
+        """
+        report_result = await self._read_report(master_id, "aggregatereport", refresh)
+        if report_result.error:
+            return report_result
+
+        return await offload(_page, report_result.result, limit, cursor, sort,
+                             partial(_row_matches, label=label), _row_sort_value, query=("aggregatereport", label),
+                             rows=len(report_result.result))
+
+    async def read_timeline(self, master_id: int, max_points: int = TIMELINE_MAX_POINTS, method: str = "lttb",
+                            metric: str = "avg_rt", labels: Optional[List[str]] = None,
+                            start_offset: Optional[int] = None, end_offset: Optional[int] = None) -> BaseResult:
+        """
+        Get the timeline KPIs of the labels, downsampled to max_points by the shape of the metric series.
+        max_points is limited to TIMELINE_MAX_POINTS_LIMIT.
+        The time window offsets are seconds since the start of the test, the same window for all the labels.
+        """
+        if method not in DOWNSAMPLING_METHODS:
+            return BaseResult(
+                error=f"Invalid downsampling method {method}, valid methods: {', '.join(DOWNSAMPLING_METHODS)}"
+            )
+
+        max_points = min(max_points, TIMELINE_MAX_POINTS_LIMIT)
+        if isinstance(labels, str):
+            labels = [labels]
+
         # Check if it's valid or allowed
         execution_result = await bridge.read_execution(self.token, self.ctx, master_id)
         if execution_result.error:
             return execution_result
 
-        return await api_request(
+        created = execution_result.result[0]["result"].created
+        test_start = datetime.fromisoformat(created).timestamp() if created else None
+        series = []
+
+        def add_label(row: Dict[str, Any]) -> None:
+            if labels and not any(_label_matches(row, label) for label in labels):
+                return
+            points = row.get("kpis") or []
+            if points and (start_offset is not None or end_offset is not None):
+                # Without the start of the test, the window starts at the first point of the label
+                first_timestamp = test_start if test_start is not None else points[0]["ts"]
+                window_start = first_timestamp + (start_offset or 0)
+                window_end = first_timestamp + end_offset if end_offset is not None else None
+                points = [point for point in points
+                          if point["ts"] >= window_start and (window_end is None or point["ts"] <= window_end)]
+            series.append({
+                "label_id": row.get("labelId"),
+                "label_name": row.get("labelName"),
+                "points_total": len(points),
+                "points": downsample(points, max_points, metric, method),
+            })
+
+        # Each label is downsampled as it arrives, without keeping the full series
+        timeline_result = await api_request_stream(
             self.token,
             "GET",
-            f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/errorsreport/data"
+            f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/timeline/kpis",
+            item_consumer=add_label
+        )
+        if timeline_result.error:
+            return timeline_result
+        return BaseResult(
+            result=series,
+            total=len(series)
         )
 
-    async def read_request_stats(self, master_id: int):
+    async def analyze_errors(self, master_id: int, top_k: int = 10, max_samples: int = 3) -> BaseResult:
         """
-        Get request statistics report for a given master_id with client-side paging.
-        Always returns paged results for AI efficiency.
+        Group the errors report by type, label, response code and normalized message,
+        returning the top_k groups with their counts and sample messages.
         """
         # Check if it's valid or allowed
         execution_result = await bridge.read_execution(self.token, self.ctx, master_id)
         if execution_result.error:
             return execution_result
 
-        return await api_request(
+        writer = None
+        if _is_ended(execution_result.result[0]["result"]):
+            # The report of an ended execution is analyzed from the disk cache, or stored while it's analyzed
+            token_id = self.token.id if self.token else None
+            path = result_cache.locate(token_id, master_id, "errorsreport")
+            if path is not None:
+                try:
+                    return BaseResult(
+                        result=[await offload(_analyze_stored_errors, path, max_samples, top_k,
+                                              size=os.path.getsize(path))]
+                    )
+                except (OSError, ValueError, EOFError):
+                    result_cache.discard(token_id, master_id, "errorsreport")
+            writer = result_cache.writer(token_id, master_id, "errorsreport")
+
+        analyzer = ErrorReportAnalyzer(max_samples=max_samples)
+
+        def add_row(row: Dict[str, Any]) -> None:
+            analyzer.add_row(row)
+            if writer is not None:
+                writer.add(row)
+
+        # The report rows are analyzed as they arrive, without keeping them
+        try:
+            error_result = await api_request_stream(
+                self.token,
+                "GET",
+                f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/errorsreport/data",
+                item_consumer=add_row
+            )
+        except BaseException:
+            if writer is not None:
+                writer.cancel()
+            raise
+        if error_result.error:
+            if writer is not None:
+                writer.cancel()
+            return error_result
+        if writer is not None:
+            await writer.close(error_result.total)
+        return BaseResult(
+            result=[analyzer.top(top_k)]
+        )
+
+    async def read_trend(self, test_id: int, last: int = 10, window: int = 3, label: Optional[str] = None,
+                         max_concurrency: int = MAX_BATCH_CONCURRENCY) -> BaseResult:
+        """
+        Trend of the KPIs across the last executions of a test, from the summary report or the
+        request statistics of a label. Returns a table with a row by execution, oldest first, and
+        for each metric its slope, moving average and outlier executions.
+        """
+        # Check if it's valid or allowed, once for all the executions of the test
+        test_result = await bridge.read_test(self.token, self.ctx, test_id)
+        if test_result.error:
+            return test_result
+
+        executions_result = await api_request(
             self.token,
             "GET",
-            f"{EXECUTIONS_ENDPOINT}/{master_id}/reports/aggregatereport/data"
+            f"{EXECUTIONS_ENDPOINT}",
+            result_formatter=format_executions_detailed,
+            params={"testId": test_id, "limit": max(1, min(last, TREND_MAX_EXECUTIONS)), "skip": 0,
+                    "sort[]": "-updated"}
+        )
+        if executions_result.error:
+            return executions_result
+        executions = list(reversed(executions_result.result))
+
+        def read_report(execution: TestExecutionDetailed):
+            reports_endpoint = f"{EXECUTIONS_ENDPOINT}/{execution.execution_id}/reports"
+            if label is None:
+                return self._immutable_report(
+                    _is_ended(execution), execution.execution_id, "summary",
+                    lambda: api_request(self.token, "GET", f"{reports_endpoint}/default/summary"))
+            return self._immutable_report(
+                _is_ended(execution), execution.execution_id, "aggregatereport",
+                lambda: api_request_stream(self.token, "GET", f"{reports_endpoint}/aggregatereport/data"))
+
+        requests = (read_report(execution) for execution in executions)
+        report_results = await gather_limited(requests, max_concurrency, return_exceptions=True)
+
+        rows = []
+        errors = []
+        for execution, report_result in zip(executions, report_results):
+            values = None
+            if isinstance(report_result, Exception) or report_result.error:
+                errors.append({"execution_id": execution.execution_id, "error": batch_error(report_result)})
+            else:
+                values = (_summary_metrics(report_result.result) if label is None
+                          else _label_metrics(report_result.result, label))
+                if values is None:
+                    errors.append({"execution_id": execution.execution_id, "error": "No report data"})
+            rows.append([execution.execution_id, execution.created]
+                        + [values.get(metric) if values else None for metric in TREND_METRICS])
+
+        trends = {}
+        for column, metric in enumerate(TREND_METRICS, start=2):
+            series = [row[column] for row in rows]
+            trends[metric] = {
+                **metric_trend(series, window),
+                "moving_average": [round(value, 2) if value is not None else None
+                                   for value in moving_average(series, window)],
+                "outliers": [row[0] for row, is_outlier in zip(rows, outliers(series)) if is_outlier],
+            }
+        return BaseResult(
+            result=[{
+                "label": label or "ALL",
+                "columns": ["execution_id", "created", *TREND_METRICS],
+                "rows": [[*row[:2], *(round(value, 2) if value is not None else None for value in row[2:])]
+                         for row in rows],
+                "trends": trends,
+                "errors": errors,
+            }],
+            total=len(rows)
+        )
+
+    async def ingest_results(self, test_id: int, max_concurrency: int = MAX_BATCH_CONCURRENCY) -> BaseResult:
+        """
+        Store the reports of the ended executions of a test in the local results store.
+        Only the executions updated after the last ingestion of the test are downloaded, at most
+        RESULTS_STORE_MAX_INGEST by call, the oldest first. The rest are pending for the next call.
+        """
+        store = get_results_store()
+        if store is None:
+            return BaseResult(error=RESULTS_STORE_DISABLED)
+
+        # Check if it's valid or allowed, once for all the executions of the test
+        test_result = await bridge.read_test(self.token, self.ctx, test_id)
+        if test_result.error:
+            return test_result
+
+        token_id = self.token.id
+        last_updated = store.last_updated(token_id, test_id)
+        new_executions = []
+        while True:
+            executions_result = await api_request(
+                self.token,
+                "GET",
+                f"{EXECUTIONS_ENDPOINT}",
+                params={"testId": test_id, "limit": 50, "skip": len(new_executions), "sort[]": "-updated"}
+            )
+            if executions_result.error:
+                return executions_result
+            page = [execution for execution in executions_result.result
+                    if (execution.get("updated") or 0) > last_updated]
+            new_executions.extend(page)
+            # Sorted by updated, the rest of the executions were already ingested
+            if len(page) < len(executions_result.result) or not executions_result.has_more:
+                break
+        # The oldest ones first, the ingestion mark can't advance over executions left for the next call
+        new_executions.sort(key=lambda execution: execution.get("updated") or 0)
+        batch_size = RESULTS_STORE_MAX_INGEST
+        # Executions updated at the same time than the last one of the batch go in it too
+        while (batch_size < len(new_executions) and (new_executions[batch_size].get("updated") or 0)
+               == (new_executions[batch_size - 1].get("updated") or 0)):
+            batch_size += 1
+        pending = len(new_executions) - min(batch_size, len(new_executions))
+        new_executions = new_executions[:batch_size]
+        # Running executions are ingested when they end, as their updated timestamp changes
+        ended_executions = [execution for execution in new_executions if execution.get("ended")]
+
+        async def read_reports(master_id: int):
+            analyzer = ErrorReportAnalyzer(max_samples=0)
+            reports_endpoint = f"{EXECUTIONS_ENDPOINT}/{master_id}/reports"
+            reports = await asyncio.gather(
+                api_request(self.token, "GET", f"{reports_endpoint}/default/summary"),
+                api_request_stream(self.token, "GET", f"{reports_endpoint}/aggregatereport/data"),
+                api_request_stream(self.token, "GET", f"{reports_endpoint}/errorsreport/data",
+                                   item_consumer=analyzer.add_row)
+            )
+            for report_result in reports:
+                if report_result.error:
+                    return report_result
+            return reports[0], reports[1], analyzer.top(RESULTS_STORE_ERROR_GROUPS)["top"]
+
+        reports_results = await gather_limited(
+            (read_reports(execution["id"]) for execution in ended_executions),
+            max_concurrency, return_exceptions=True)
+
+        errors = []
+        ingested_until = last_updated
+        # From the oldest, the ingestion mark only advances while there are no failed executions
+        for execution, reports_result in sorted(zip(ended_executions, reports_results),
+                                                key=lambda item: item[0].get("updated") or 0):
+            if isinstance(reports_result, Exception) or isinstance(reports_result, BaseResult):
+                errors.append({"execution_id": execution["id"], "error": batch_error(reports_result)})
+                continue
+            summary_result, aggregate_result, error_groups = reports_result
+            store.add_execution(
+                token_id,
+                {
+                    "execution_id": execution["id"], "test_id": test_id, "project_id": execution.get("projectId"),
+                    "name": execution.get("name"), "created": execution.get("created"),
+                    "updated": execution.get("updated"), "ended": execution.get("ended"),
+                    "status": execution.get("reportStatus", "unset"),
+                },
+                _summary_metrics(summary_result.result),
+                [_aggregate_metrics(row) for row in aggregate_result.result],
+                error_groups
+            )
+            if not errors:
+                ingested_until = execution.get("updated") or ingested_until
+        store.set_last_updated(token_id, test_id, ingested_until)
+        return BaseResult(
+            result=[{
+                "test_id": test_id,
+                "ingested": len(ended_executions) - len(errors),
+                "running": len(new_executions) - len(ended_executions),
+                "ingested_until": get_date_time_iso(ingested_until) if ingested_until else None,
+                "pending": pending,
+                "errors": errors,
+            }],
+            info=[f"{pending} executions are left, ingest again to continue."] if pending else None
         )
+
+    async def query_results(self, report: str = "summary", test_id: Optional[int] = None,
+                            label: Optional[str] = None, status: Optional[str] = None,
+                            start: Optional[str] = None, end: Optional[str] = None, limit: int = 100) -> BaseResult:
+        """
+        Query the reports of the executions in the local results store, without calls to BlazeMeter.
+        start and end are ISO 8601 dates, compared with the creation of the executions.
+        """
+        store = get_results_store()
+        if store is None:
+            return BaseResult(error=RESULTS_STORE_DISABLED)
+        if report not in REPORTS:
+            return BaseResult(error=f"Invalid report {report}, valid reports: {', '.join(REPORTS)}")
+        try:
+            start_timestamp = int(datetime.fromisoformat(start).timestamp()) if start else None
+            end_timestamp = int(datetime.fromisoformat(end).timestamp()) if end else None
+        except ValueError as e:
+            return BaseResult(error=f"Invalid date: {e}")
+
+        table = store.query(self.token.id if self.token else "", report, test_id, label, status, start_timestamp, end_timestamp,
+                            max(1, min(limit, REPORT_MAX_PAGE_LIMIT)))
+        for row in table["rows"]:
+            row[2] = get_date_time_iso(row[2])
+        return BaseResult(
+            result=[table],
+            total=len(table["rows"])
+        )
+
+
+def _is_ended(execution: TestExecutionDetailed) -> bool:
+    """If the execution has ended, so its reports don't change anymore."""
+    return execution.ended is not None and execution.execution_status in TERMINAL_EXECUTION_STATUSES
+
+
+def _summary_metrics(summary_result: List[Dict[str, Any]]) -> Optional[Dict[str, Optional[float]]]:
+    summaries = (summary_result[0].get("summary") or []) if summary_result else []
+    summary = next((item for item in summaries if item.get("id") == "ALL"), summaries[0] if summaries else None)
+    if not summary:
+        return None
+    hits = summary.get("hits")
+    return {
+        "avg_rt": summary.get("avg"),
+        "p90_rt": summary.get("tp90"),
+        "p95_rt": summary.get("tp95"),
+        "p99_rt": summary.get("tp99"),
+        "throughput": summary.get("hits_avg"),
+        "hits": hits,
+        "failed": summary.get("failed"),
+        "error_rate": (summary.get("failed") or 0) * 100 / hits if hits else None,
+        "max_users": summary_result[0].get("maxUsers"),
+        "duration": summary.get("duration"),
+    }
+
+
+def _label_metrics(report_rows: List[Dict[str, Any]], label: str) -> Optional[Dict[str, Optional[float]]]:
+    row = next((row for row in report_rows if _label_matches(row, label)), None)
+    return _aggregate_metrics(row) if row else None
+
+
+def _aggregate_metrics(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "label_id": row.get("labelId"),
+        "label_name": row.get("labelName"),
+        "samples": row.get("samples"),
+        "avg_rt": row.get("avgResponseTime"),
+        "p90_rt": row.get("90line"),
+        "p95_rt": row.get("95line"),
+        "p99_rt": row.get("99line"),
+        "throughput": row.get("avgThroughput"),
+        "errors_count": row.get("errorsCount"),
+        "error_rate": row.get("errorsRate"),
+    }
+
+
+def _analyze_stored_errors(path: str, max_samples: int, top_k: int) -> Dict[str, Any]:
+    analyzer = ErrorReportAnalyzer(max_samples=max_samples)
+    for row in iter_rows(path):
+        analyzer.add_row(row)
+    return analyzer.top(top_k)
+
+
+def _row_matches(row: Dict[str, Any], label: Optional[str] = None) -> bool:
+    return label is None or _label_matches(row, label)
+
+
+def _error_row_matches(row: Dict[str, Any], label: Optional[str] = None, response_code: Optional[str] = None) -> bool:
+    if response_code is not None and not any(
+            str(error.get("rc")) == str(response_code)
+            for error in (row.get("errors") or []) + (row.get("failedEmbeddedResources") or [])):
+        return False
+    return _row_matches(row, label)
+
+
+def _row_sort_value(row: Dict[str, Any], key: str) -> Any:
+    return row.get(key)
+
+
+def _label_matches(row: Dict[str, Any], label: str) -> bool:
+    label = label.lower()
+    return any(label in str(row.get(key) or "").lower() for key in ("labelName", "name", "labelId"))
+
+
+def _errors_sort_value(row: Dict[str, Any], key: str) -> Any:
+    # The errors report rows are sorted by their total of errors, assertions failures or embedded resources errors
+    if key == "errors":
+        return (sum(error.get("count") or 0 for error in row.get("errors") or [])
+                + sum(assertion.get("failures") or 0 for assertion in row.get("assertions") or [])
+                + sum(resource.get("count") or 0 for resource in row.get("failedEmbeddedResources") or []))
+    return row.get(key)
+
+
+def _encode_cursor(offset: int, query: Tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps([offset, list(query)]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, query: Tuple) -> int:
+    try:
+        offset, cursor_query = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    if cursor_query != list(query):
+        raise ValueError("The cursor belongs to a different query, use the same sort and filters of the first page")
+    return offset
+
+
+def _page(rows: List[Dict[str, Any]], limit: int, cursor: Optional[str], sort: Optional[str],
+          matches: Callable[[Dict[str, Any]], bool], sort_value: Callable[[Dict[str, Any], str], Any],
+          query: Tuple) -> BaseResult:
+    """Page of the rows matching the filters, sorted by a key ('-key' for descending)."""
+    query = query + (sort,)
+    limit = max(1, min(limit, REPORT_MAX_PAGE_LIMIT))
+    try:
+        offset = _decode_cursor(cursor, query) if cursor else 0
+    except ValueError as e:
+        return BaseResult(error=str(e))
+    selected = [row for row in rows if matches(row)]
+    if sort:
+        key = sort.lstrip("-")
+        # Rows without the key go last in both directions
+        present = [row for row in selected if sort_value(row, key) is not None]
+        missing = [row for row in selected if sort_value(row, key) is None]
+        selected = sorted(present, key=lambda row: sort_value(row, key), reverse=sort.startswith("-")) + missing
+    page = selected[offset:offset + limit]
+    has_more = offset + limit < len(selected)
+    return BaseResult(
+        result=page,
+        total=len(selected),
+        has_more=has_more,
+        info=[f"Use cursor={_encode_cursor(offset + limit, query)} to get the next page."] if has_more else None
+    )
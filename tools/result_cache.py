@@ -0,0 +1,191 @@
+"""
+Disk cache of the reports of ended executions. Their summary, errors and aggregate reports
+don't change anymore, so they are kept without expiration, gzip compressed, until the
+total size exceeds the limit and the least recently used reports are removed.
+Files are named by a hash of the API key id, the execution and the report, so they are
+isolated by API key. Reports of running executions are never stored.
+The rows of a streamed report are stored as they are downloaded, compressed in the worker pool
+in gzip members of RESULT_CACHE_MEMBER_BYTES, and read back one at a time without loading the report.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.blazemeter import CACHE_DIR, RESULT_CACHE_MAX_BYTES
+from tools.file_utils import atomic_write
+from tools.instrumentation import record_cache, register_gauge
+from tools.json_stream import ResultArrayParser
+from tools.workers import offload
+
+RESULT_CACHE_EXTENSION = ".json.gz"
+RESULT_CACHE_MEMBER_BYTES = 1024 * 1024
+RESULT_CACHE_READ_BYTES = 64 * 1024
+
+
+def _compress(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6)
+
+
+def _encode(content: Dict[str, Any]) -> bytes:
+    return _compress(json.dumps(content, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    return json.loads(gzip.decompress(data))
+
+
+def iter_rows(path: str) -> Iterator[Any]:
+    """Rows of a stored report, decompressed and parsed as they are read."""
+    parser = ResultArrayParser()
+    with gzip.open(path, "rb") as file:
+        while chunk := file.read(RESULT_CACHE_READ_BYTES):
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class ResultCache:
+
+    def __init__(self, directory: str, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._files: Optional["OrderedDict[str, int]"] = None  # File name -> size, least recently used first
+        self.size = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.max_bytes > 0
+
+    @staticmethod
+    def file_name(token_id: str, master_id: int, report: str) -> str:
+        return hashlib.sha256(f"{token_id}:{master_id}:{report}".encode("utf-8")).hexdigest() + RESULT_CACHE_EXTENSION
+
+    def _index(self) -> "OrderedDict[str, int]":
+        # Loaded on first use from the files of previous runs, ordered by their last access
+        if self._files is None:
+            files = []
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(RESULT_CACHE_EXTENSION) and entry.is_file():
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.name, stat.st_size))
+            self._files = OrderedDict((name, size) for _, name, size in sorted(files))
+            self.size = sum(self._files.values())
+        return self._files
+
+    def locate(self, token_id: str, master_id: int, report: str) -> Optional[str]:
+        """Path of a stored report, marked as the most recently used, None if it isn't stored."""
+        path = None
+        name = self.file_name(token_id, master_id, report)
+        if self.enabled and name in self._index():
+            path = os.path.join(self.directory, name)
+            try:
+                os.utime(path)
+                self._files.move_to_end(name)
+            except OSError:
+                self._remove(name)
+                path = None
+        record_cache("results", path is not None)
+        return path
+
+    async def get(self, token_id: str, master_id: int, report: str) -> Optional[Dict[str, Any]]:
+        path = self.locate(token_id, master_id, report)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            return await offload(_decode, data, size=len(data))
+        except (OSError, ValueError, EOFError, gzip.BadGzipFile):
+            self.discard(token_id, master_id, report)
+            return None
+
+    async def store(self, token_id: str, master_id: int, report: str, content: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        rows = content.get("result")
+        data = await offload(_encode, content, rows=len(rows) if isinstance(rows, list) else 0)
+        self._write(self.file_name(token_id, master_id, report), [data])
+
+    def writer(self, token_id: str, master_id: int, report: str) -> Optional["ResultCacheWriter"]:
+        """Writer of the rows of a report as they are downloaded, None when the cache is disabled."""
+        if not self.enabled:
+            return None
+        return ResultCacheWriter(self, self.file_name(token_id, master_id, report))
+
+    def discard(self, token_id: str, master_id: int, report: str) -> None:
+        self._remove(self.file_name(token_id, master_id, report))
+
+    def _write(self, name: str, members: List[bytes]) -> None:
+        files = self._index()
+        size = sum(len(member) for member in members)
+        if size > self.max_bytes:
+            return
+        try:
+            atomic_write(os.path.join(self.directory, name), *members)
+        except OSError:
+            return
+        self.size += size - files.pop(name, 0)
+        files[name] = size
+        while self.size > self.max_bytes and files:
+            self._remove(next(iter(files)))
+
+    def _remove(self, name: str) -> None:
+        self.size -= self._index().pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for name in list(self._index()):
+            self._remove(name)
+        self._files = None
+        self.size = 0
+
+
+class ResultCacheWriter:
+    """
+    Rows of a report written as {"result": [...], "total": ...}, compressed in the worker pool in
+    gzip members while the download continues. The file is only stored when the report is complete.
+    """
+
+    def __init__(self, cache: ResultCache, name: str):
+        self.cache = cache
+        self.name = name
+        self.rows = 0
+        self._pending: List[str] = ['{"result":[']
+        self._pending_size = 0
+        self._members: List[asyncio.Future] = []
+
+    def add(self, row: Any) -> None:
+        text = json.dumps(row, separators=(",", ":"))
+        self._pending.append("," + text if self.rows else text)
+        self._pending_size += len(text) + 1
+        self.rows += 1
+        if self._pending_size >= RESULT_CACHE_MEMBER_BYTES:
+            self._flush()
+
+    def _flush(self) -> None:
+        data = "".join(self._pending).encode("utf-8")
+        self._pending = []
+        self._pending_size = 0
+        self._members.append(asyncio.ensure_future(offload(_compress, data, size=len(data))))
+
+    async def close(self, total: Optional[int] = None) -> None:
+        """Store the written rows, with the report total (the rows by default)."""
+        self._pending.append(f'],"total":{json.dumps(self.rows if total is None else total)}}}')
+        self._flush()
+        self.cache._write(self.name, await asyncio.gather(*self._members))
+
+    def cancel(self) -> None:
+        for member in self._members:
+            member.cancel()
+
+
+result_cache = ResultCache(os.path.join(CACHE_DIR, "results") if CACHE_DIR else "")
+register_gauge("result_cache_bytes", "Compressed size of the ended executions reports stored on disk",
+               lambda: result_cache.size)
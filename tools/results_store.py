@@ -0,0 +1,159 @@
+"""
+Local SQLite store of the results of ended executions, for analytics without downloading the reports again.
+Ended executions are immutable, so they are ingested once: the summary, the request statistics rows and the
+error groups are kept in typed tables with a column by metric, indexed by test, label, time and status.
+The ingestion is incremental, only the executions updated after the last ingested one are downloaded.
+Rows are isolated by API key id. Disabled unless BZM_MCP_RESULTS_DB sets the database file.
+"""
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.blazemeter import RESULTS_DB_PATH
+
+SUMMARY_COLUMNS = ("avg_rt", "p90_rt", "p95_rt", "p99_rt", "throughput", "hits", "failed", "error_rate",
+                   "max_users", "duration")
+LABEL_COLUMNS = ("label_id", "label_name", "samples", "avg_rt", "p90_rt", "p95_rt", "p99_rt", "throughput",
+                 "errors_count", "error_rate")
+ERROR_COLUMNS = ("type", "label", "response_code", "signature", "count")
+EXECUTION_COLUMNS = ("execution_id", "test_id", "project_id", "name", "created", "updated", "ended", "status")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    token_id TEXT NOT NULL, execution_id INTEGER NOT NULL, test_id INTEGER NOT NULL, project_id INTEGER,
+    name TEXT, created INTEGER, updated INTEGER, ended INTEGER, status TEXT,
+    PRIMARY KEY (token_id, execution_id)
+);
+CREATE INDEX IF NOT EXISTS executions_test ON executions (token_id, test_id, created);
+CREATE INDEX IF NOT EXISTS executions_status ON executions (token_id, status, created);
+CREATE TABLE IF NOT EXISTS summaries (
+    token_id TEXT NOT NULL, execution_id INTEGER NOT NULL,
+    avg_rt REAL, p90_rt REAL, p95_rt REAL, p99_rt REAL, throughput REAL, hits INTEGER, failed INTEGER,
+    error_rate REAL, max_users INTEGER, duration INTEGER,
+    PRIMARY KEY (token_id, execution_id)
+);
+CREATE TABLE IF NOT EXISTS labels (
+    token_id TEXT NOT NULL, execution_id INTEGER NOT NULL, label_id TEXT NOT NULL, label_name TEXT,
+    samples INTEGER, avg_rt REAL, p90_rt REAL, p95_rt REAL, p99_rt REAL, throughput REAL, errors_count INTEGER,
+    error_rate REAL,
+    PRIMARY KEY (token_id, execution_id, label_id)
+);
+CREATE INDEX IF NOT EXISTS labels_name ON labels (token_id, label_name, execution_id);
+CREATE TABLE IF NOT EXISTS error_groups (
+    token_id TEXT NOT NULL, execution_id INTEGER NOT NULL, type TEXT, label TEXT, response_code TEXT,
+    signature TEXT, count INTEGER
+);
+CREATE INDEX IF NOT EXISTS error_groups_execution ON error_groups (token_id, execution_id);
+CREATE INDEX IF NOT EXISTS error_groups_label ON error_groups (token_id, label, execution_id);
+CREATE TABLE IF NOT EXISTS ingestions (
+    token_id TEXT NOT NULL, test_id INTEGER NOT NULL, updated INTEGER NOT NULL,
+    PRIMARY KEY (token_id, test_id)
+);
+"""
+
+REPORTS = {
+    "summary": ("summaries", SUMMARY_COLUMNS),
+    "labels": ("labels", LABEL_COLUMNS),
+    "errors": ("error_groups", ERROR_COLUMNS),
+}
+
+
+class ResultsStore:
+
+    def __init__(self, path: str):
+        self.path = path
+        # Shared by the tool calls, the lock serializes their transactions
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def last_updated(self, token_id: str, test_id: int) -> int:
+        """Updated timestamp of the last ingested execution of the test, 0 if none."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT updated FROM ingestions WHERE token_id = ? AND test_id = ?", (token_id, test_id)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def add_execution(self, token_id: str, execution: Dict[str, Any], summary: Optional[Dict[str, Any]],
+                      labels: Iterable[Dict[str, Any]], error_groups: Iterable[Dict[str, Any]]) -> None:
+        """Store an ended execution with its reports, replacing it if it was already stored."""
+        execution_id = execution["execution_id"]
+        with self._lock, self._connection:
+            for table in ("summaries", "labels", "error_groups"):
+                self._connection.execute(f"DELETE FROM {table} WHERE token_id = ? AND execution_id = ?",
+                                         (token_id, execution_id))
+            self._insert("executions", token_id, EXECUTION_COLUMNS, [execution], replace=True)
+            if summary:
+                self._insert("summaries", token_id, ("execution_id",) + SUMMARY_COLUMNS,
+                             [{**summary, "execution_id": execution_id}])
+            self._insert("labels", token_id, ("execution_id",) + LABEL_COLUMNS,
+                         [{**label, "execution_id": execution_id} for label in labels])
+            self._insert("error_groups", token_id, ("execution_id",) + ERROR_COLUMNS,
+                         [{**group, "execution_id": execution_id} for group in error_groups])
+
+    def set_last_updated(self, token_id: str, test_id: int, updated: int) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO ingestions (token_id, test_id, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (token_id, test_id) DO UPDATE SET updated = MAX(updated, excluded.updated)",
+                (token_id, test_id, updated))
+
+    def _insert(self, table: str, token_id: str, columns: tuple, rows: List[Dict[str, Any]],
+                replace: bool = False) -> None:
+        if not rows:
+            return
+        statement = (f"INSERT {'OR REPLACE ' if replace else ''}INTO {table} (token_id, {', '.join(columns)}) "
+                     f"VALUES ({', '.join('?' * (len(columns) + 1))})")
+        self._connection.executemany(statement, [(token_id, *(row.get(column) for column in columns))
+                                                 for row in rows])
+
+    def query(self, token_id: str, report: str = "summary", test_id: Optional[int] = None,
+              label: Optional[str] = None, status: Optional[str] = None, start: Optional[int] = None,
+              end: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Rows of a report of the stored executions, newest first, as a table of columns and rows.
+        The label filter matches the label name or id containing the text.
+        """
+        table, columns = REPORTS[report]
+        conditions = ["e.token_id = ?"]
+        parameters: List[Any] = [token_id]
+        for condition, value in (("e.test_id = ?", test_id), ("e.status = ?", status),
+                                 ("e.created >= ?", start), ("e.created <= ?", end)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        if label is not None and report != "summary":
+            label_column = "r.label" if report == "errors" else "r.label_name"
+            conditions.append(f"({label_column} LIKE ? ESCAPE '\\'"
+                              + (" OR r.label_id LIKE ? ESCAPE '\\')" if report == "labels" else ")"))
+            pattern = "%" + label.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            parameters.extend([pattern] * (2 if report == "labels" else 1))
+        order = "e.created DESC, e.execution_id DESC" + (", r.count DESC" if report == "errors" else "")
+        statement = (f"SELECT e.execution_id, e.test_id, e.created, e.status, "
+                     f"{', '.join('r.' + column for column in columns)} "
+                     f"FROM executions e JOIN {table} r ON r.token_id = e.token_id "
+                     f"AND r.execution_id = e.execution_id "
+                     f"WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT ?")
+        parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(statement, parameters).fetchall()
+        return {
+            "columns": ["execution_id", "test_id", "created", "status", *columns],
+            "rows": [list(row) for row in rows],
+        }
+
+
+_store: Optional[ResultsStore] = None
+
+
+def get_results_store() -> Optional[ResultsStore]:
+    """The results store of the server, None when it's not enabled."""
+    global _store
+    if _store is None and RESULTS_DB_PATH:
+        _store = ResultsStore(RESULTS_DB_PATH)
+    return _store
@@ -9,15 +9,20 @@ from typing import Optional, List
 import httpx
 from mcp.server.fastmcp import Context
 
-from config.blazemeter import TESTS_ENDPOINT, TOOLS_PREFIX
+from config.blazemeter import TESTS_ENDPOINT, PROJECTS_ENDPOINT, TOOLS_PREFIX, MAX_BATCH_CONCURRENCY, \
+    MAX_BULK_TESTS
 from config.path_mapper import PathMapperFactory
 from config.token import BzmToken
+from formatters.project import format_projects
 from formatters.test import format_tests
 from models.manager import Manager
 from models.performance_test import PerformanceTestObject
 from models.result import BaseResult
 from tools import bridge
-from tools.utils import api_request
+from tools.http_cache import http_cache
+from tools.instrumentation import instrument_tool
+from tools.load_planner import allocate_users, plan_load
+from tools.utils import api_request, gather_limited, batch_ids, batch_error
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +33,15 @@ class TestManager(Manager):
         super().__init__(token, ctx)
         self.path_mapper = PathMapperFactory.create_strategy()
 
-    async def read(self, test_id: int) -> BaseResult:
+    async def read(self, test_id: int, fresh: bool = False) -> BaseResult:
 
         test_result = await api_request(
             self.token,
             "GET",
             f"{TESTS_ENDPOINT}/{test_id}",
-            result_formatter=format_tests
+            result_formatter=format_tests,
+            cache=True,
+            fresh=fresh
         )
         if test_result.error:
             return test_result
@@ -46,6 +53,45 @@ class TestManager(Manager):
             else:
                 return test_result
 
+    async def read_many(self, test_ids: List[int], max_concurrency: int = MAX_BATCH_CONCURRENCY,
+                        fresh: bool = False) -> BaseResult:
+        """
+        Read many tests concurrently. Each project is validated once for all its tests.
+        Results keep the input order, with an error for each test that can't be read.
+                refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
+        """
+        unique_ids = batch_ids(test_ids)
+        test_results = await gather_limited(
+            (api_request(self.token, "GET", f"{TESTS_ENDPOINT}/{test_id}", result_formatter=format_tests, cache=True,
+                         fresh=fresh)
+             for test_id in unique_ids),
+            max_concurrency, return_exceptions=True)
+        tests = dict(zip(unique_ids, test_results))
+
+        project_ids = list({test_result.result[0].project_id for test_result in test_results
+                            if isinstance(test_result, BaseResult) and not test_result.error})
+        project_results = await gather_limited(
+            (bridge.read_project(self.token, self.ctx, project_id) for project_id in project_ids),
+            max_concurrency, return_exceptions=True)
+        projects = dict(zip(project_ids, project_results))
+
+        results = []
+        for test_id in test_ids:
+            test_result = tests[test_id]
+            if isinstance(test_result, Exception) or test_result.error:
+                results.append({"test_id": test_id, "error": batch_error(test_result)})
+                continue
+            test = test_result.result[0]
+            project_result = projects[test.project_id]
+            if isinstance(project_result, Exception) or project_result.error:
+                results.append({"test_id": test_id, "error": batch_error(project_result)})
+            else:
+                results.append({"test_id": test_id, "result": test})
+        return BaseResult(
+            result=results,
+            total=len(results)
+        )
+
     async def create(self, test_name: str, project_id: int) -> BaseResult:
 
         # Check if it's valid or allowed
@@ -63,13 +109,16 @@ class TestManager(Manager):
                 "scriptType": "jmeter"
             }
         }
-        return await api_request(
+        create_result = await api_request(
             self.token,
             "POST",
             f"{TESTS_ENDPOINT}",
             result_formatter=format_tests,
             json=test_body
         )
+        # The project has a new test, its cached reads are outdated
+        http_cache.invalidate(self.token.id, f"{PROJECTS_ENDPOINT}/{project_id}")
+        return create_result
 
     @staticmethod
     def _validate_files(file_paths: List[str], valid_files: List[str], invalid_files: List[str]):
@@ -294,52 +343,201 @@ class TestManager(Manager):
             del test_data_override["rampUp"]
 
         # Recalculate location concurrency
-        concurrency = test_data_override.get("concurrency", 1)
-        locations_concurrency = {}
         if "locationsPercents" in test_data_override:
-            for location, percent in test_data_override["locationsPercents"].items():
-                locations_concurrency[location] = int(percent * concurrency / 100)
-
-            for location, users in locations_concurrency.items():
-                if users == 0:
-                    locations_concurrency[location] = 1  # Default behaviour on BlazeMeter
-                break
-
-            test_data_override["locations"] = locations_concurrency
+            test_data_override["locations"] = allocate_users(test_data_override.get("concurrency", 1),
+                                                             test_data_override["locationsPercents"])
 
         return test_data_override
 
-    async def configure(self, performance_test: PerformanceTestObject) -> BaseResult:
-        if not performance_test.is_valid():
-            raise ValueError("PerformanceTestObject must have a valid test_id")
-
-        # Check if it's valid or allowed
-        test_data = await self.read(performance_test.test_id)
-        if test_data.error:
-            return test_data
-
-        test_override_executions = test_data.result[0].override_executions
+    @classmethod
+    def _merge_override_executions(cls, test_override_executions: List[Dict[str, Any]],
+                                   configuration: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
         test_data_override = {}
         # Flat the overrides if more then one exists
         for override in test_override_executions:
             test_data_override.update(override)
-        configuration = performance_test.get_configuration()
         test_data_override.update(configuration)
 
         # Normalize Override
-        test_data_override = self._normalize_configuration_override(test_data_override, test_data_override)
+        test_data_override = cls._normalize_configuration_override(test_data_override, test_data_override)
+
+        return [test_data_override] if test_data_override else None
+
+    async def _plan_locations(self, override_executions: Optional[List[Dict[str, Any]]], workspace_id: int,
+                              adjust: bool = False) -> BaseResult:
+        """Fit the users of each location to the workspace locations limits, reporting the engines needed."""
+        if not override_executions or not override_executions[0].get("locationsPercents"):
+            return BaseResult(result=override_executions)
+        index_result = await bridge.read_location_index(self.token, self.ctx, workspace_id)
+        if index_result.error:
+            return index_result
+
+        override = override_executions[0]
+        plan = plan_load(override.get("concurrency", 1), override["locationsPercents"],
+                         index_result.result[0].limits(), adjust)
+        if plan.error:
+            return BaseResult(
+                error=f"Invalid load distribution: {plan.error}. Change the concurrency or locations, "
+                      f"or use adjust_plan=true to fit the load to the locations limits."
+            )
+        override["locations"] = plan.users
+        override["locationsPercents"] = {location: percent for location, percent in override["locationsPercents"].items()
+                                         if location in plan.users}
+        if "concurrency" in override or plan.concurrency != 1:
+            override["concurrency"] = plan.concurrency
+        return BaseResult(
+            result=override_executions,
+            info=plan.summary()
+        )
+
+    async def configure(self, performance_test: PerformanceTestObject, adjust_plan: bool = False) -> BaseResult:
+        if not performance_test.is_valid():
+            raise ValueError("PerformanceTestObject must have a valid test_id")
+
+        # Check if it's valid or allowed, the current overrides are merged with the new configuration
+        test_data = await self.read(performance_test.test_id, fresh=True)
+        if test_data.error:
+            return test_data
+
+        override_executions = self._merge_override_executions(test_data.result[0].override_executions,
+                                                              performance_test.get_configuration())
+        project_result = await api_request(
+            self.token,
+            "GET",
+            f"{PROJECTS_ENDPOINT}/{test_data.result[0].project_id}",
+            result_formatter=format_projects,
+            cache=True
+        )
+        if project_result.error:
+            return project_result
+        plan_result = await self._plan_locations(override_executions, project_result.result[0].workspace_id,
+                                                 adjust_plan)
+        if plan_result.error:
+            return plan_result
 
-        override_executions = [test_data_override] if test_data_override else None
         configuration_body = {
             "overrideExecutions": override_executions
         }
 
-        return await api_request(
+        configure_result = await api_request(
             self.token,
             "PATCH",
             f"{TESTS_ENDPOINT}/{performance_test.test_id}",
             result_formatter=format_tests,
             json=configuration_body)
+        configure_result.info = plan_result.info
+        return configure_result
+
+    async def _project_test_ids(self, project_id: int, offset: int = 0) -> BaseResult:
+        """Ids of up to MAX_BULK_TESTS tests of a project from the offset, and the total of the project."""
+        test_ids = []
+        total = 0
+        while len(test_ids) < MAX_BULK_TESTS:
+            # Only the first page validates the project
+            tests_result = await self.list(project_id, limit=min(50, MAX_BULK_TESTS - len(test_ids)),
+                                           offset=offset + len(test_ids), control_ai_consent=not test_ids)
+            if tests_result.error:
+                return tests_result
+            total = tests_result.total or 0
+            test_ids.extend(test.test_id for test in tests_result.result)
+            if not tests_result.has_more or not tests_result.result:
+                break
+        return BaseResult(
+            result=test_ids,
+            total=max(total, offset + len(test_ids))
+        )
+
+    async def configure_bulk(self, configuration: Dict[str, Any], test_ids: Optional[List[int]] = None,
+                             project_id: Optional[int] = None, adjust_plan: bool = False,
+                             offset: int = 0, max_concurrency: int = MAX_BATCH_CONCURRENCY) -> BaseResult:
+        """
+        Apply the same override configuration to many tests, or to all the tests of a project.
+        The current overrides are read concurrently and merged locally, the tests already configured
+        are not updated. Results keep the order of the tests, with the status of each one.
+        A project is configured up to MAX_BULK_TESTS tests from the offset by call.
+        """
+        warnings = None
+        if project_id is not None:
+            project_tests = await self._project_test_ids(project_id, offset)
+            if project_tests.error:
+                return project_tests
+            test_ids = project_tests.result
+            skipped = project_tests.total - offset - len(test_ids)
+            if skipped > 0:
+                warnings = [f"The project has {project_tests.total} tests, {skipped} were not configured. "
+                            f"Call configure_bulk again with offset={offset + len(test_ids)} to continue."]
+        if not test_ids:
+            return BaseResult(
+                error="A test_id_list or a project_id with tests is required"
+            )
+        unique_ids = batch_ids(test_ids, MAX_BULK_TESTS)
+
+        test_results = await gather_limited(
+            (api_request(self.token, "GET", f"{TESTS_ENDPOINT}/{test_id}", result_formatter=format_tests,
+                         cache=True, fresh=True)
+             for test_id in unique_ids),
+            max_concurrency, return_exceptions=True)
+        tests = dict(zip(unique_ids, test_results))
+
+        # Check if it's valid or allowed, once for each project
+        project_ids = list({test_result.result[0].project_id for test_result in test_results
+                            if isinstance(test_result, BaseResult) and not test_result.error})
+        project_results = await gather_limited(
+            (bridge.read_project(self.token, self.ctx, test_project_id) for test_project_id in project_ids),
+            max_concurrency, return_exceptions=True)
+        projects = dict(zip(project_ids, project_results))
+
+        reports = {}
+        merged = {}
+        for test_id in unique_ids:
+            test_result = tests[test_id]
+            if isinstance(test_result, Exception) or test_result.error:
+                reports[test_id] = {"test_id": test_id, "status": "error", "error": batch_error(test_result)}
+                continue
+            test = test_result.result[0]
+            project_result = projects[test.project_id]
+            if isinstance(project_result, Exception) or project_result.error:
+                reports[test_id] = {"test_id": test_id, "status": "error", "error": batch_error(project_result)}
+                continue
+            merged[test_id] = (test, self._merge_override_executions(test.override_executions, dict(configuration)),
+                               project_result.result[0].workspace_id)
+
+        # The load of all the tests is planned before sending the updates
+        plan_results = await gather_limited(
+            (self._plan_locations(override_executions, workspace_id, adjust_plan)
+             for _, override_executions, workspace_id in merged.values()),
+            max_concurrency, return_exceptions=True)
+
+        updates = {}
+        for (test_id, (test, override_executions, _)), plan_result in zip(merged.items(), plan_results):
+            if isinstance(plan_result, Exception) or plan_result.error:
+                reports[test_id] = {"test_id": test_id, "status": "error", "error": batch_error(plan_result)}
+            elif (override_executions or []) == test.override_executions:
+                reports[test_id] = {"test_id": test_id, "status": "unchanged"}
+            else:
+                updates[test_id] = override_executions
+
+        update_results = await gather_limited(
+            (api_request(self.token, "PATCH", f"{TESTS_ENDPOINT}/{test_id}", result_formatter=format_tests,
+                         json={"overrideExecutions": override_executions})
+             for test_id, override_executions in updates.items()),
+            max_concurrency, return_exceptions=True)
+        for test_id, update_result in zip(updates, update_results):
+            if isinstance(update_result, Exception) or update_result.error:
+                reports[test_id] = {"test_id": test_id, "status": "error", "error": batch_error(update_result)}
+            else:
+                reports[test_id] = {"test_id": test_id, "status": "updated",
+                                    "override_executions": update_result.result[0].override_executions}
+
+        results = [reports[test_id] for test_id in unique_ids]
+        statuses = [report["status"] for report in results]
+        return BaseResult(
+            result=results,
+            total=len(results),
+            info=[f"Updated: {statuses.count('updated')}, unchanged: {statuses.count('unchanged')}, "
+                  f"errors: {statuses.count('error')}"],
+            warning=warnings
+        )
 
 
 def register(mcp, token: Optional[BzmToken]):
@@ -351,6 +549,10 @@ def register(mcp, token: Optional[BzmToken]):
         - read: Read a test. Get the detailed information of a test.
             args(dict): Dictionary with the following required parameters:
                 test_id (int): The only required parameter. The id of the test to read.
+                refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
+        - read_many: Read many tests in a single call. Prefer it over several 'read' calls.
+            args(dict): Dictionary with the following required parameters:
+                test_id_list (list[int]): The ids of the tests to read (max 50). Results keep this order, with an error for each test that can't be read.
         - create: Create a new test. Do not create a test if the user has not confirmed the location for validation of workspace, project and account.
             args(dict): Dictionary with the following required parameters:
                 test_name (str): The required name of the test to create.
@@ -370,11 +572,23 @@ def register(mcp, token: Optional[BzmToken]):
                 ramp-up (str, disable=""): The length of time the test will take to ramp-up to full concurrency. Values can be provided in m (minutes) only. Can be empty.
                 steps (int, default=1, disable=-1): The number of ramp-up steps. Can be empty.
                 executor (str, default=jmeter): The script type you are running. Includes the following options: (gatling,grinder,jmeter,locust,pbench,selenium,siege).
+                adjust_plan (bool, default=False): See configure_locations.
         - configure_locations: Configure the distribution of a test for given test id. The test id is the only required parameter. 
                      The test will be configured based on the following parameters only if user confirms the configuration:
             args(dict): Dictionary with the following parameters:
                 test_id (int): The only required parameter. The id of the test to configure.
                 locations (list[str]): List of all locations with their percentage distribution of user load in a key value format "location_id=percent_value". Example: ["us-east4-a=25", "us-east1-b=25", "us-west1-a=25", "us-central1-a=25"]
+                adjust_plan (bool, default=False): The users of each location are validated against the location limits (max concurrency, max engines and users per engine).
+                    By default a configuration exceeding them is rejected. With true, the exceeding users are moved to other locations, or the concurrency is reduced.
+                Returns the users and engines planned for each location in the info.
+        - configure_bulk: Apply the same load and/or locations configuration to many tests in a single call.
+                     The tests will be configured only if user confirms the configuration.
+            args(dict): Dictionary with the following parameters:
+                test_id_list (list[int]): The ids of the tests to configure. Not required if project_id is provided.
+                project_id (int): Configure all the tests of this project instead of test_id_list.
+                offset (int, default=0): With project_id, the first test to configure. Up to 500 tests are configured by call, a warning tells the offset to continue.
+                Any parameter of configure_load (iterations, hold-for, concurrency, ramp-up, steps, executor) and configure_locations (locations, adjust_plan).
+                Returns the status of each test: updated, unchanged (already configured) or error.
         - upload_assets: Upload main script test as well as multiple related assets to a test. Supports .zip, .csv, .jmx, .yaml and other file types.
             args(dict): Dictionary with the following required parameters:
                 test_id (int): The id of the test to upload assets to.
@@ -382,22 +596,31 @@ def register(mcp, token: Optional[BzmToken]):
                 main_script (str, optional): Path to the main script file. If provided, will update test configuration to use this script.
         """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_tests", ("read", "read_many", "create", "list", "configure_load",
+                                               "configure_locations", "configure_bulk", "upload_assets"))
     async def tests(action: str, args: Dict[str, Any], ctx: Context) -> BaseResult:
         test_manager = TestManager(token, ctx)
         try:
             match action:
                 case "read":
-                    return await test_manager.read(args["test_id"])
+                    return await test_manager.read(args["test_id"], args.get("refresh", False))
+                case "read_many":
+                    return await test_manager.read_many(args["test_id_list"], fresh=args.get("refresh", False))
                 case "create":
                     return await test_manager.create(args["test_name"], args["project_id"])
                 case "list":
                     return await test_manager.list(args["project_id"], args.get("limit", 50), args.get("offset", 0))
                 case "configure_load":
                     performance_test = PerformanceTestObject.from_args(args)
-                    return await test_manager.configure(performance_test)
+                    return await test_manager.configure(performance_test, args.get("adjust_plan", False))
                 case "configure_locations":
                     performance_test = PerformanceTestObject.from_args(args)
-                    return await test_manager.configure(performance_test)
+                    return await test_manager.configure(performance_test, args.get("adjust_plan", False))
+                case "configure_bulk":
+                    performance_test = PerformanceTestObject.from_args(args)
+                    return await test_manager.configure_bulk(performance_test.get_configuration(),
+                                                             args.get("test_id_list"), args.get("project_id"),
+                                                             args.get("adjust_plan", False), args.get("offset", 0))
                 case "upload_assets":
                     return BaseResult(
                         result=[await test_manager.upload_assets(
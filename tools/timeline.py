@@ -0,0 +1,84 @@
+"""
+Downsampling of the timeline report series.
+Largest-Triangle-Three-Buckets (LTTB) keeps the visual shape of the series, min/max bucketing
+keeps the extreme values of every bucket (spikes of response time or errors).
+Both are single pass over plain lists, numpy is not a dependency of the server.
+"""
+from typing import List, Sequence
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+# Fewest points each method downsamples to, with less they return the whole series
+MIN_POINTS = {"lttb": 3, "minmax": 4}
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Indexes of the points selected by Largest-Triangle-Three-Buckets, first and last always included."""
+    size = len(xs)
+    if threshold >= size or threshold < 3:
+        return list(range(size))
+
+    every = (size - 2) / (threshold - 2)
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        # Average of the next bucket, the third vertex of the triangles
+        average_start = int((bucket + 1) * every) + 1
+        average_end = min(int((bucket + 2) * every) + 1, size)
+        average_length = average_end - average_start
+        average_x = sum(xs[average_start:average_end]) / average_length
+        average_y = sum(ys[average_start:average_end]) / average_length
+
+        previous_x = xs[previous]
+        previous_y = ys[previous]
+        bucket_start = int(bucket * every) + 1
+        bucket_end = int((bucket + 1) * every) + 1
+        max_area = -1.0
+        max_index = bucket_start
+        for index in range(bucket_start, bucket_end):
+            # Double of the triangle area, only compared
+            area = abs((previous_x - average_x) * (ys[index] - previous_y)
+                       - (previous_x - xs[index]) * (average_y - previous_y))
+            if area > max_area:
+                max_area = area
+                max_index = index
+        selected.append(max_index)
+        previous = max_index
+    selected.append(size - 1)
+    return selected
+
+
+def minmax(ys: Sequence[float], threshold: int) -> List[int]:
+    """Indexes of the minimum and maximum points of threshold / 2 buckets, first and last always included."""
+    size = len(ys)
+    if threshold >= size or threshold < 4:
+        return list(range(size))
+
+    buckets = (threshold - 2) // 2
+    every = (size - 2) / buckets
+    selected = [0]
+    for bucket in range(buckets):
+        bucket_start = int(bucket * every) + 1
+        bucket_end = int((bucket + 1) * every) + 1
+        min_index = max_index = bucket_start
+        for index in range(bucket_start + 1, bucket_end):
+            if ys[index] < ys[min_index]:
+                min_index = index
+            elif ys[index] > ys[max_index]:
+                max_index = index
+        selected.extend(sorted({min_index, max_index}))
+    selected.append(size - 1)
+    return selected
+
+
+def downsample(points: List[dict], max_points: int, metric: str, method: str = "lttb",
+               time_key: str = "ts") -> List[dict]:
+    """Select at most max_points of the points, by the shape of the metric series (at least the method minimum)."""
+    max_points = max(max_points, MIN_POINTS.get(method, MIN_POINTS["lttb"]))
+    if len(points) <= max_points:
+        return points
+    ys = [float(point.get(metric) or 0) for point in points]
+    if method == "minmax":
+        indexes = minmax(ys, max_points)
+    else:
+        indexes = lttb([float(point.get(time_key) or 0) for point in points], ys, max_points)
+    return [points[index] for index in indexes]
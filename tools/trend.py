@@ -0,0 +1,80 @@
+"""
+Trend statistics of a metric across executions: least squares slope, moving average and
+outliers by modified z-score (median absolute deviation), robust to the outliers themselves.
+Each function is a single pass over a plain list, None values (missing reports) are skipped.
+"""
+from statistics import median
+from typing import Dict, List, Optional, Sequence
+
+OUTLIER_Z_SCORE = 3.5
+# Relative change over the series considered as a trend, below it the metric is stable
+TREND_THRESHOLD_PERCENT = 5.0
+
+
+def slope(values: Sequence[Optional[float]]) -> Optional[float]:
+    """Least squares slope by execution."""
+    points = [(index, value) for index, value in enumerate(values) if value is not None]
+    if len(points) < 2:
+        return None
+    count = len(points)
+    mean_x = sum(index for index, _ in points) / count
+    mean_y = sum(value for _, value in points) / count
+    covariance = sum((index - mean_x) * (value - mean_y) for index, value in points)
+    variance = sum((index - mean_x) ** 2 for index, _ in points)
+    return covariance / variance
+
+
+def moving_average(values: Sequence[Optional[float]], window: int = 3) -> List[Optional[float]]:
+    averages = []
+    total = 0.0
+    present: List[float] = []
+    for value in values:
+        if value is not None:
+            present.append(value)
+            total += value
+            if len(present) > window:
+                total -= present[-window - 1]
+        available = min(len(present), window)
+        averages.append(total / available if available else None)
+    return averages
+
+
+def outliers(values: Sequence[Optional[float]], threshold: float = OUTLIER_Z_SCORE) -> List[bool]:
+    present = [value for value in values if value is not None]
+    if len(present) < 3:
+        return [False] * len(values)
+    center = median(present)
+    deviation = median(abs(value - center) for value in present)
+    if deviation == 0:
+        return [value is not None and value != center for value in values]
+    return [value is not None and 0.6745 * abs(value - center) / deviation > threshold for value in values]
+
+
+def metric_trend(values: Sequence[Optional[float]], window: int = 3) -> Dict[str, Optional[float]]:
+    """Summary of a metric series in chronological order."""
+    metric_slope = slope(values)
+    present = [value for value in values if value is not None]
+    mean = sum(present) / len(present) if present else None
+    change_percent = None
+    direction = "unknown"
+    if metric_slope is not None and mean:
+        # Change along the whole series estimated by the slope, relative to the mean
+        change_percent = metric_slope * (len(values) - 1) * 100 / mean
+        if abs(change_percent) < TREND_THRESHOLD_PERCENT:
+            direction = "stable"
+        else:
+            direction = "increasing" if change_percent > 0 else "decreasing"
+    averages = moving_average(values, window)
+    return {
+        "first": present[0] if present else None,
+        "last": present[-1] if present else None,
+        "mean": _round(mean),
+        "slope_per_execution": _round(metric_slope),
+        "change_percent": _round(change_percent),
+        "direction": direction,
+        "moving_average_last": _round(averages[-1] if averages else None),
+    }
+
+
+def _round(value: Optional[float], digits: int = 2) -> Optional[float]:
+    return round(value, digits) if value is not None else None
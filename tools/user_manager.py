@@ -1,32 +1,216 @@
+import asyncio
+import time
 import traceback
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 from mcp.server.fastmcp import Context
 from pydantic import Field
 
-from config.blazemeter import TOOLS_PREFIX, USER_ENDPOINT
+from config.blazemeter import TOOLS_PREFIX, USER_ENDPOINT, ACCOUNTS_ENDPOINT, WORKSPACES_ENDPOINT, \
+    PROJECTS_ENDPOINT, TESTS_ENDPOINT, MAX_BATCH_CONCURRENCY
 from config.token import BzmToken
+from formatters.account import format_accounts
+from formatters.project import format_projects
+from formatters.test import format_tests
 from formatters.user import format_users
+from formatters.workspace import format_workspaces
 from models.manager import Manager
 from models.result import BaseResult
-from tools.utils import api_request
+from tools import bridge
+from tools.instrumentation import instrument_tool, record_cache
+from tools.utils import api_request, batch_error
+
+SNAPSHOT_TTL_SECONDS = 300
+SNAPSHOT_MAX_CHILDREN = 50
+SNAPSHOT_MAX_REQUESTS = 500  # List requests of a snapshot, the deeper levels are not listed beyond it
+# Levels of the snapshot hierarchy below the user
+SNAPSHOT_LEVELS = ["accounts", "workspaces", "projects", "tests"]
 
 
 class UserManager(Manager):
+    snapshots = {}  # Static to share between different instance of UserManager, token id -> (timestamp, snapshot)
 
     def __init__(self, token: Optional[BzmToken], ctx: Context):
         super().__init__(token, ctx)
 
-    async def read(self) -> BaseResult:
+    async def read(self, fresh: bool = False) -> BaseResult:
         return await api_request(
             self.token,
             "GET",
             f"{USER_ENDPOINT}",
-            result_formatter=format_users
+            result_formatter=format_users,
+            cache=True,
+            fresh=fresh
+        )
+
+    async def snapshot(self, max_depth: int = 4, max_children: int = SNAPSHOT_MAX_CHILDREN,
+                       max_concurrency: int = MAX_BATCH_CONCURRENCY,
+                       refresh: bool = False, search: Optional[str] = None) -> BaseResult:
+        """
+        Crawl concurrently the user -> accounts -> workspaces -> projects -> tests hierarchy.
+        Accounts without AI consent are listed but not crawled.
+        The snapshot is cached for SNAPSHOT_TTL_SECONDS for follow-up lookups.
+        At most SNAPSHOT_MAX_REQUESTS lists are read, the elements not expanded beyond it are reported.
+        """
+        if not self.token:
+            return await self.read()  # Reports the missing token error
+
+        max_depth = max(0, min(max_depth, len(SNAPSHOT_LEVELS)))
+        max_children = max(1, min(max_children, SNAPSHOT_MAX_CHILDREN))
+        max_concurrency = max(1, min(max_concurrency, MAX_BATCH_CONCURRENCY))
+        cache_key = (self.token.id, max_depth, max_children)
+        cached = UserManager.snapshots.get(cache_key)
+        is_fresh = cached is not None and time.time() - cached[0] < SNAPSHOT_TTL_SECONDS
+        record_cache("snapshot", is_fresh and not refresh)
+        if is_fresh and not refresh:
+            snapshot_timestamp, snapshot = cached
+        else:
+            user_result = await self.read()
+            if user_result.error:
+                return user_result
+            user = user_result.result[0]
+            crawler = _SnapshotCrawler(self.token, self.ctx, max_depth, max_children, max_concurrency)
+            snapshot = {
+                "user": {
+                    "user_id": user.user_id,
+                    "display_name": user.display_name,
+                    "default_project_id": user.default_project_id,
+                },
+                "accounts": await crawler.crawl(),
+                "not_expanded": crawler.not_expanded,
+            }
+            snapshot_timestamp = time.time()
+            UserManager.snapshots[cache_key] = (snapshot_timestamp, snapshot)
+
+        info = [f"Snapshot taken {round(time.time() - snapshot_timestamp)} seconds ago. Use refresh=true to update it."]
+        warning = None
+        if snapshot["not_expanded"]:
+            warning = [f"{snapshot['not_expanded']} elements were not expanded, the snapshot reached its limit of "
+                       f"{SNAPSHOT_MAX_REQUESTS} requests. Use a lower max_depth or max_children."]
+        if search:
+            return BaseResult(
+                result=_search_snapshot(snapshot, search),
+                info=info,
+                warning=warning
+            )
+        return BaseResult(
+            result=[snapshot],
+            info=info,
+            warning=warning
         )
 
 
+class _SnapshotCrawler:
+
+    def __init__(self, token: BzmToken, ctx: Context, max_depth: int, max_children: int, max_concurrency: int):
+        self.token = token
+        self.ctx = ctx
+        self.max_depth = max_depth
+        self.max_children = max_children
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.requests_left = SNAPSHOT_MAX_REQUESTS
+        self.not_expanded = 0
+
+    async def _list(self, endpoint: str, formatter, parent_parameter: Optional[str] = None,
+                    parent_id: Optional[int] = None) -> BaseResult:
+        parameters = {
+            "limit": self.max_children,
+            "skip": 0,
+            "sort[]": "-updated"
+        }
+        if parent_parameter:
+            parameters[parent_parameter] = parent_id
+        async with self.semaphore:
+            return await api_request(self.token, "GET", endpoint, result_formatter=formatter, params=parameters)
+
+    async def _children(self, node: Dict[str, Any], depth: int, endpoint: str, formatter,
+                        parent_parameter: Optional[str], parent_id: Optional[int], builder) -> None:
+        level = SNAPSHOT_LEVELS[depth - 1]
+        if self.requests_left <= 0:
+            node[f"{level}_error"] = "Not listed, the snapshot reached its limit of requests"
+            self.not_expanded += 1
+            return
+        self.requests_left -= 1
+        try:
+            children_result = await self._list(endpoint, formatter, parent_parameter, parent_id)
+        except Exception as e:
+            node[f"{level}_error"] = batch_error(e)
+            return
+        if children_result.error:
+            node[f"{level}_error"] = children_result.error
+            return
+        if children_result.has_more:
+            node[f"{level}_total"] = children_result.total
+        # An error crawling a child is reported in its node, the rest of the snapshot is kept
+        children = await asyncio.gather(*(builder(child, depth) for child in children_result.result),
+                                        return_exceptions=True)
+        node[level] = [{**_snapshot_node(level, child), "error": batch_error(result)}
+                       if isinstance(result, Exception) else result
+                       for child, result in zip(children_result.result, children)]
+
+    async def crawl(self) -> List[Dict[str, Any]]:
+        if self.max_depth < 1:
+            return []
+        root = {}
+        await self._children(root, 1, ACCOUNTS_ENDPOINT, format_accounts, None, None, self._account)
+        if "accounts_error" in root:
+            return [{"error": root["accounts_error"]}]
+        return root["accounts"]
+
+    async def _account(self, account, depth: int) -> Dict[str, Any]:
+        node = _snapshot_node("accounts", account)
+        # Same AI consent validation as the account read action
+        async with self.semaphore:
+            account_result = await bridge.read_account(self.token, self.ctx, account.account_id)
+        node["ai_consent"] = account_result.error is None
+        if account_result.error is None and depth < self.max_depth:
+            await self._children(node, depth + 1, WORKSPACES_ENDPOINT, format_workspaces, "accountId",
+                                 account.account_id, self._workspace)
+        return node
+
+    async def _workspace(self, workspace, depth: int) -> Dict[str, Any]:
+        node = _snapshot_node("workspaces", workspace)
+        if depth < self.max_depth:
+            await self._children(node, depth + 1, PROJECTS_ENDPOINT, format_projects, "workspaceId",
+                                 workspace.workspace_id, self._project)
+        return node
+
+    async def _project(self, project, depth: int) -> Dict[str, Any]:
+        node = _snapshot_node("projects", project)
+        if depth < self.max_depth:
+            await self._children(node, depth + 1, TESTS_ENDPOINT, format_tests, "projectId",
+                                 project.project_id, self._test)
+        return node
+
+    @staticmethod
+    async def _test(test, depth: int) -> Dict[str, Any]:
+        return _snapshot_node("tests", test)
+
+
+def _snapshot_node(level: str, entity) -> Dict[str, Any]:
+    """Id and name of an element of a snapshot level ('accounts' -> account_id and account_name)."""
+    name = level[:-1]
+    return {f"{name}_id": getattr(entity, f"{name}_id"), f"{name}_name": getattr(entity, f"{name}_name")}
+
+
+def _search_snapshot(snapshot: Dict[str, Any], search: str) -> List[Dict[str, Any]]:
+    """Find the snapshot nodes with a name containing the search text, with the ids of their parents."""
+    search = search.lower()
+    matches = []
+    stack = [(node, {}) for node in snapshot["accounts"]]
+    while stack:
+        node, parents = stack.pop()
+        entity_ids = {key: value for key, value in node.items() if key.endswith("_id")}
+        names = [value for key, value in node.items() if key.endswith("_name")]
+        if any(search in str(name).lower() for name in names):
+            matches.append({**parents, **{key: value for key, value in node.items() if key.endswith(("_id", "_name"))}})
+        for level in SNAPSHOT_LEVELS:
+            for child in reversed(node.get(level, [])):
+                stack.append((child, {**parents, **entity_ids}))
+    return matches
+
+
 def register(mcp, token: Optional[BzmToken]):
     @mcp.tool(
         name=f"{TOOLS_PREFIX}_user",
@@ -34,10 +218,21 @@ def register(mcp, token: Optional[BzmToken]):
             Operations on user information.
             Actions:
             - read: Read a current user information from BlazeMeter.
+                args(dict): Dictionary with the following optional parameters:
+                    refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
+            - snapshot: Get in a single call the hierarchy of the user: accounts -> workspaces -> projects -> tests.
+                        Accounts without AI consent are listed but not expanded. The snapshot is cached for 5 minutes.
+                args(dict): Dictionary with the following optional parameters:
+                    max_depth (int, default=4, valid=[1 to 4]): 1=accounts, 2=workspaces, 3=projects, 4=tests.
+                    max_children (int, default=50, valid=[1 to 50]): Maximum children listed for each element.
+                    refresh (bool, default=False): Ignore the cached snapshot.
+                    search (str, optional): Return only the elements whose name contains this text, with their parents ids.
             Hints:
-            - For default account, workspace and project, use the 'read' action. 
+            - For default account, workspace and project, use the 'read' action.
+            - Use 'snapshot' instead of listing accounts, workspaces, projects and tests one by one.
         """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_user", ("read", "snapshot"))
     async def user(
             action: str = Field(description="The action id to execute"),
             args: Dict[str, Any] = Field(description="Dictionary with parameters"),
@@ -48,7 +243,11 @@ def register(mcp, token: Optional[BzmToken]):
         try:
             match action:
                 case "read":
-                    return await user_manager.read()
+                    return await user_manager.read(args.get("refresh", False))
+                case "snapshot":
+                    return await user_manager.snapshot(args.get("max_depth", 4), args.get("max_children", 50),
+                                                       refresh=args.get("refresh", False),
+                                                       search=args.get("search"))
                 case _:
                     return BaseResult(
                         error=f"Action {action} not found in user manager tool"
@@ -1,17 +1,25 @@
 """
 Simple utilities for BlazeMeter MCP tools.
 """
+import asyncio
+import json
 import platform
 from datetime import datetime
 
-from typing import Optional, Callable
+from functools import lru_cache
+from typing import Optional, Callable, Dict, Type, TypeVar, List, Any, Awaitable, Iterable
 
 import httpx
+from pydantic import BaseModel, TypeAdapter
 
-from config.blazemeter import BZM_API_BASE_URL
+from config.blazemeter import BZM_API_BASE_URL, STRICT_VALIDATION, MAX_BATCH_SIZE
 from config.token import BzmToken
 from config.version import __version__
 from models.result import BaseResult, HttpBaseResult
+from tools.http_cache import http_cache, is_cacheable
+from tools.instrumentation import track_request, record_cache
+from tools.json_stream import ResultArrayParser
+from tools.workers import offload
 
 so = platform.system()       # "Windows", "Linux", "Darwin"
 version = platform.version() # kernel / build version
@@ -27,13 +35,45 @@ timeout = httpx.Timeout(
     pool=60.0
 )
 
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+_shared_clients: Dict[str, httpx.AsyncClient] = {}
+_shared_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def shared_client(base_url: str = "") -> httpx.AsyncClient:
+    """
+    Pooled client of the running event loop, connections are kept alive and reused by the following requests.
+    """
+    global _shared_clients_loop
+    loop = asyncio.get_running_loop()
+    if _shared_clients_loop is not loop:
+        # Clients are bound to the event loop where their connections were opened
+        _shared_clients.clear()
+        _shared_clients_loop = loop
+    client = _shared_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = _shared_clients[base_url] = httpx.AsyncClient(base_url=base_url, http2=True, timeout=timeout)
+    return client
+
+
+async def close_shared_clients() -> None:
+    for client in list(_shared_clients.values()):
+        await client.aclose()
+    _shared_clients.clear()
+
+
 async def api_request(token: Optional[BzmToken], method: str, endpoint: str,
                       result_formatter: Callable = None,
                       result_formatter_params: Optional[dict] = None,
+                      cache: bool = False, fresh: bool = False,
                       **kwargs) -> BaseResult:
     """
     Make an authenticated request to the BlazeMeter API.
     Handles authentication errors gracefully.
+    GET requests with cache=True are served from the HTTP cache when possible,
+    fresh=True always validates them with BlazeMeter. Any other method invalidates
+    the cached reads of the changed entity.
     """
     if not token:
         return BaseResult(
@@ -44,30 +84,128 @@ async def api_request(token: Optional[BzmToken], method: str, endpoint: str,
     headers["Authorization"] = token.as_basic_auth()
     headers["User-Agent"] = user_agent
 
-    async with (httpx.AsyncClient(base_url=BZM_API_BASE_URL, http2=True, timeout=timeout) as client):
-        try:
+    cache_key = None
+    cache_entry = None
+    if method == "GET" and cache:
+        cache_key = http_cache.key(token.id, endpoint, kwargs.get("params"))
+        cache_entry = http_cache.get(cache_key)
+        if cache_entry is not None and not fresh and cache_entry.is_fresh():
+            record_cache("http", True)
+            return await _offload_api_result(cache_entry.body, result_formatter, result_formatter_params)
+        if cache_entry is not None:
+            headers.update(cache_entry.validators())
+    elif method != "GET":
+        http_cache.invalidate(token.id, endpoint)
+
+    client = shared_client(BZM_API_BASE_URL)
+    try:
+        with track_request(method, endpoint) as tracker:
             resp = await client.request(method, endpoint, headers=headers, **kwargs)
-            resp.raise_for_status()
-            response_dict = resp.json()
-            result = response_dict.get("result", [])
-            default_total = 0
-            if not isinstance(result, list):  # Generalize result always as a list
-                result = [result]
-                default_total = 1
-            final_result = result_formatter(result, result_formatter_params) if result_formatter else result
+            tracker.response(resp)
+        if cache_entry is not None and resp.status_code == 304:
+            record_cache("http", True)
+            http_cache.revalidated(cache_key, cache_entry, resp.headers)
+            return await _offload_api_result(cache_entry.body, result_formatter, result_formatter_params)
+        resp.raise_for_status()
+        response_dict = await offload(json.loads, resp.content, size=len(resp.content))
+        if method != "GET":
+            # Again after the change, for the reads stored meanwhile
+            http_cache.invalidate(token.id, endpoint)
+        if cache_key is not None:
+            record_cache("http", False)
+            if is_cacheable(resp):
+                http_cache.store(cache_key, response_dict, resp.headers)
+        return await _offload_api_result(response_dict, result_formatter, result_formatter_params)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in [401, 403]:
+            return BaseResult(
+                error="Invalid credentials"
+            )
+        raise
+
+
+async def _offload_api_result(response_dict: dict, result_formatter: Callable = None,
+                              result_formatter_params: Optional[dict] = None) -> BaseResult:
+    # Formatted in the worker pool when there are many rows
+    result = response_dict.get("result")
+    rows = len(result) if isinstance(result, list) and result_formatter else 0
+    return await offload(_api_result, response_dict, result_formatter, result_formatter_params, rows=rows)
+
+
+def _api_result(response_dict: dict, result_formatter: Callable = None,
+                result_formatter_params: Optional[dict] = None) -> BaseResult:
+    result = response_dict.get("result", [])
+    default_total = 0
+    if not isinstance(result, list):  # Generalize result always as a list
+        result = [result]
+        default_total = 1
+    final_result = result_formatter(result, result_formatter_params) if result_formatter else result
+    return BaseResult(
+        result=final_result,
+        error=response_dict.get("error", None),
+        total=response_dict.get("total", default_total),
+        has_more=response_dict.get("total", 0) - (
+                response_dict.get("skip", 0) + response_dict.get("limit", 0)) > 0
+    )
+
+
+async def api_request_stream(token: Optional[BzmToken], method: str, endpoint: str,
+                             item_consumer: Optional[Callable[[Any], None]] = None,
+                             result_formatter: Callable = None,
+                             result_formatter_params: Optional[dict] = None,
+                             **kwargs) -> BaseResult:
+    """
+    Make an authenticated request to the BlazeMeter API, parsing the result array as the body arrives.
+    With item_consumer each result item is passed to it and not kept, the result is empty.
+    Without it the items are kept and formatted at the end, without holding the whole body.
+    """
+    if not token:
+        return await api_request(token, method, endpoint)  # Reports the missing token error
+
+    headers = kwargs.pop("headers", {})
+    headers["Authorization"] = token.as_basic_auth()
+    headers["User-Agent"] = user_agent
+    if method != "GET":
+        http_cache.invalidate(token.id, endpoint)
+
+    parser = ResultArrayParser()
+    items = []
+    client = shared_client(BZM_API_BASE_URL)
+    try:
+        with track_request(method, endpoint) as tracker:
+            async with client.stream(method, endpoint, headers=headers, **kwargs) as resp:
+                if resp.is_error:
+                    await resp.aread()
+                    tracker.response(resp)
+                    resp.raise_for_status()
+                async for chunk in resp.aiter_bytes():
+                    for item in parser.feed(chunk):
+                        if item_consumer:
+                            item_consumer(item)
+                        else:
+                            items.append(item)
+                tracker.response(resp)
+        for item in parser.close():
+            if item_consumer:
+                item_consumer(item)
+            else:
+                items.append(item)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in [401, 403]:
             return BaseResult(
-                result=final_result,
-                error=response_dict.get("error", None),
-                total=response_dict.get("total", default_total),
-                has_more=response_dict.get("total", 0) - (
-                        response_dict.get("skip", 0) + response_dict.get("limit", 0)) > 0
+                error="Invalid credentials"
             )
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code in [401, 403]:
-                return BaseResult(
-                    error="Invalid credentials"
-                )
-            raise
+        raise
+
+    fields = parser.fields
+    final_result = await offload(result_formatter, items, result_formatter_params,
+                                 rows=len(items)) if result_formatter else items
+    return BaseResult(
+        result=final_result,
+        error=fields.get("error", None),
+        total=fields.get("total", 0 if parser.result_is_list else 1),
+        has_more=fields.get("total", 0) - (fields.get("skip", 0) + fields.get("limit", 0)) > 0
+    )
 
 
 async def http_request(method: str, endpoint: str,
@@ -81,26 +219,75 @@ async def http_request(method: str, endpoint: str,
     headers = kwargs.pop("headers", {})
     headers["User-Agent"] = user_agent
 
-    async with (httpx.AsyncClient(base_url="", http2=True, timeout=timeout) as client):
-        try:
+    client = shared_client("")
+    try:
+        with track_request(method, endpoint) as tracker:
             resp = await client.request(method, endpoint, headers=headers, **kwargs)
-            resp.raise_for_status()
-            result = resp.text
-            error = None
-            final_result = result_formatter(result, result_formatter_params) if result_formatter else result
+            tracker.response(resp)
+        if resp.status_code == 304:
+            # Conditional request of a content the caller already has
+            return HttpBaseResult(headers=dict(resp.headers))
+        resp.raise_for_status()
+        result = resp.text
+        error = None
+        final_result = result_formatter(result, result_formatter_params) if result_formatter else result
+        return HttpBaseResult(
+            result=final_result,
+            error=error,
+            headers=dict(resp.headers),
+        )
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in [401, 403]:
             return HttpBaseResult(
-                result=final_result,
-                error=error,
+                error="Invalid credentials"
             )
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code in [401, 403]:
-                return HttpBaseResult(
-                    error="Invalid credentials"
-                )
-            raise
+        raise
 
 def get_date_time_iso(timestamp: int) -> Optional[str]:
     if timestamp is None:
         return None
     else:
         return datetime.fromtimestamp(timestamp).isoformat()
+
+
+@lru_cache(maxsize=None)
+def _models_adapter(model: Type[ModelType]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def validate_models(model: Type[ModelType], rows: List[dict[str, Any]]) -> List[ModelType]:
+    """
+    Validate all the formatted rows of a response in a single batch.
+    With STRICT_VALIDATION the type coercion is disabled, to detect formatters drift in tests.
+    """
+    return _models_adapter(model).validate_python(rows, strict=STRICT_VALIDATION)
+
+
+async def gather_limited(awaitables: Iterable[Awaitable], limit: int, return_exceptions: bool = False) -> List[Any]:
+    """
+    Like asyncio.gather, but running at most 'limit' awaitables at the same time.
+    Results keep the input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run_limited(awaitable: Awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(run_limited(awaitable) for awaitable in awaitables),
+                                return_exceptions=return_exceptions)
+
+
+def batch_ids(ids: List[int], max_size: int = MAX_BATCH_SIZE) -> List[int]:
+    """Unique ids keeping the input order, limited to max_size."""
+    unique_ids = list(dict.fromkeys(ids))
+    if len(unique_ids) > max_size:
+        raise ValueError(f"A maximum of {max_size} different ids can be processed in a single call")
+    return unique_ids
+
+
+def batch_error(error: Any) -> str:
+    """Error message of a batch element that can be a BaseResult with error or an exception."""
+    if isinstance(error, BaseResult):
+        return error.error
+    return f"{type(error).__name__}: {error}"
@@ -0,0 +1,62 @@
+"""
+Warm-up of the server on startup, before the first tool call: resolves the BlazeMeter hosts,
+opens the pooled connections and reads the user, with its default account, workspace and project,
+into the HTTP cache, and loads the help table of contents.
+Failures are ignored, the tools read everything again on demand.
+"""
+import asyncio
+import logging
+from typing import Optional
+from urllib.parse import urlsplit
+
+from config.blazemeter import HELP_INDEX_URL, USER_ENDPOINT
+from config.token import BzmToken
+from tools import utils
+from tools.utils import api_request
+
+logger = logging.getLogger(__name__)
+
+
+async def resolve_hosts() -> None:
+    loop = asyncio.get_running_loop()
+    hosts = {urlsplit(utils.BZM_API_BASE_URL).hostname, urlsplit(HELP_INDEX_URL).hostname}
+    await asyncio.gather(*(loop.getaddrinfo(host, 443) for host in hosts if host), return_exceptions=True)
+
+
+async def prefetch_user(token: Optional[BzmToken]) -> None:
+    if not token:
+        return
+    from tools.account_manager import AccountManager
+    from tools.project_manager import ProjectManager
+    from tools.workspace_manager import WorkspaceManager
+
+    # Raw response, it shares the cache entry with UserManager.read and keeps the default project parents
+    user_result = await api_request(token, "GET", USER_ENDPOINT, cache=True)
+    if user_result.error or not user_result.result:
+        return
+    default_project = user_result.result[0].get("defaultProject") or {}
+    reads = []
+    if default_project.get("accountId"):
+        reads.append(AccountManager(token, None).read(default_project["accountId"]))
+    if default_project.get("workspaceId"):
+        reads.append(WorkspaceManager(token, None).read(default_project["workspaceId"]))
+    if default_project.get("id"):
+        reads.append(ProjectManager(token, None).read(default_project["id"]))
+    await asyncio.gather(*reads, return_exceptions=True)
+
+
+async def prefetch_help() -> None:
+    from tools.help_manager import HelpManager
+    await HelpManager(None, None)._ensure_help_tree()
+
+
+async def warm_up(token: Optional[BzmToken]) -> None:
+    try:
+        await resolve_hosts()
+        results = await asyncio.gather(prefetch_user(token), prefetch_help(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug("Warm-up failed: %r", result)
+        logger.debug("Warm-up completed")
+    except Exception:
+        logger.debug("Warm-up failed", exc_info=True)
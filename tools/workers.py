@@ -0,0 +1,63 @@
+"""
+Worker pool of the CPU bound transforms: help pages conversion and TOC parsing, JSON parsing and formatters
+of large responses, and reports post-processing. In the event loop, a 2 MB help page or a large report
+stalls every other concurrent tool call, so the transforms of large inputs are run in the pool.
+Small inputs are transformed in the event loop, where it's cheaper than handing them to a worker.
+With the thread pool the loop keeps answering while a transform runs, with the process pool the transforms
+also run in parallel, but their inputs and outputs are pickled.
+The event loop lag monitor measures the stalls that remain.
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from config.blazemeter import WORKER_POOL, WORKER_POOL_SIZE, OFFLOAD_MIN_BYTES, OFFLOAD_MIN_ROWS, \
+    LOOP_LAG_INTERVAL
+from tools.instrumentation import metrics
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Optional[Executor]:
+    """The worker pool, None when the transforms run in the event loop."""
+    global _executor
+    if _executor is None and WORKER_POOL in ("thread", "process") and WORKER_POOL_SIZE > 0:
+        if WORKER_POOL == "process":
+            _executor = ProcessPoolExecutor(max_workers=WORKER_POOL_SIZE)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=WORKER_POOL_SIZE, thread_name_prefix="bzm-mcp-worker")
+    return _executor
+
+
+def should_offload(size: int = 0, rows: int = 0) -> bool:
+    return size >= OFFLOAD_MIN_BYTES or rows >= OFFLOAD_MIN_ROWS
+
+
+async def offload(func: Callable, *args, size: int = 0, rows: int = 0, **kwargs) -> Any:
+    """
+    Run a CPU bound transform in the worker pool when its input is large (size in bytes or rows),
+    in the event loop otherwise. With the process pool, func and its arguments must be picklable
+    (module functions, partial of module functions, no lambdas or closures).
+    """
+    executor = get_executor() if should_offload(size, rows) else None
+    metrics.record_worker_task(executor is not None)
+    if executor is None:
+        return func(*args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+def shutdown_workers() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def monitor_loop_lag(interval: float = LOOP_LAG_INTERVAL) -> None:
+    """Measure how late a periodic timer wakes up, the time the event loop was blocked, until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        metrics.record_loop_lag(max(0.0, loop.time() - start - interval))
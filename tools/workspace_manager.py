@@ -1,3 +1,4 @@
+import time
 import traceback
 from typing import Any, Dict, Optional
 
@@ -7,14 +8,19 @@ from pydantic import Field
 
 from config.blazemeter import WORKSPACES_ENDPOINT, TOOLS_PREFIX
 from config.token import BzmToken
-from formatters.workspace import format_workspaces, format_workspaces_detailed, format_workspaces_locations
+from formatters.workspace import format_workspaces, format_workspaces_detailed
 from models.manager import Manager
 from models.result import BaseResult
 from tools import bridge
+from tools.instrumentation import instrument_tool, record_cache
+from tools.location_index import LocationIndex
 from tools.utils import api_request
 
+LOCATION_INDEX_TTL_SECONDS = 300
+
 
 class WorkspaceManager(Manager):
+    location_indexes = {}  # Static to share between instances, (token id, workspace id) -> (timestamp, index)
 
     # Note: It's allowed to list all the user workspaces without AI consent
     # the format_workspaces only expose minimum information to user
@@ -23,13 +29,15 @@ class WorkspaceManager(Manager):
     def __init__(self, token: Optional[BzmToken], ctx: Context):
         super().__init__(token, ctx)
 
-    async def read(self, workspace_id: int) -> BaseResult:
+    async def read(self, workspace_id: int, fresh: bool = False) -> BaseResult:
 
         workspace_result = await api_request(
             self.token,
             "GET",
             f"{WORKSPACES_ENDPOINT}/{workspace_id}",
-            result_formatter=format_workspaces_detailed
+            result_formatter=format_workspaces_detailed,
+            cache=True,
+            fresh=fresh
         )
         if workspace_result.error:
             return workspace_result
@@ -64,25 +72,51 @@ class WorkspaceManager(Manager):
             params=parameters
         )
 
-    async def read_locations(self, workspace_id: int, purpose: str = "load") -> BaseResult:
+    async def read_location_index(self, workspace_id: int, refresh: bool = False) -> BaseResult:
+        cache_key = (self.token.id if self.token else None, workspace_id)
+        cached = WorkspaceManager.location_indexes.get(cache_key)
+        is_fresh = cached is not None and time.time() - cached[0] < LOCATION_INDEX_TTL_SECONDS and not refresh
+        record_cache("location_index", is_fresh)
+        if is_fresh:
+            return BaseResult(result=[cached[1]])
 
-        locations_result = await api_request(
+        workspace_result = await api_request(
             self.token,
             "GET",
             f"{WORKSPACES_ENDPOINT}/{workspace_id}",
-            result_formatter=format_workspaces_locations,
-            result_formatter_params={"purpose": purpose}
+            cache=True,
+            fresh=refresh
+        )
+        if workspace_result.error:
+            return workspace_result
+        location_index = LocationIndex.from_workspace(workspace_result.result[0])
+        now = time.time()
+        for key in [key for key, (timestamp, _) in WorkspaceManager.location_indexes.items()
+                    if now - timestamp >= LOCATION_INDEX_TTL_SECONDS]:
+            del WorkspaceManager.location_indexes[key]
+        WorkspaceManager.location_indexes[cache_key] = (now, location_index)
+        return BaseResult(result=[location_index])
+
+    async def read_locations(self, workspace_id: int, purpose: Optional[str] = "load",
+                             min_threads_per_engine: int = 0, min_engines: int = 0,
+                             private_only: bool = False, refresh: bool = False) -> BaseResult:
+        """
+        Locations of the workspace matching the filters. The locations are indexed
+        for LOCATION_INDEX_TTL_SECONDS, follow-up queries don't download the workspace again.
+        """
+        index_result = await self.read_location_index(workspace_id, refresh)
+        if index_result.error:
+            return index_result
+        location_index = index_result.result[0]
+
+        # Check if it's valid or allowed
+        account_result = await bridge.read_account(self.token, self.ctx, location_index.account_id)
+        if account_result.error:
+            return account_result
+
+        return BaseResult(
+            result=[location_index.query(purpose, min_threads_per_engine, min_engines, private_only)]
         )
-        if locations_result.error:
-            return locations_result
-        else:
-            # Check if it's valid or allowed
-            account_result = await bridge.read_account(self.token, self.ctx,
-                                                       locations_result.result[0]["account_id"])
-            if account_result.error:
-                return account_result
-            else:
-                return locations_result
 
 
 def register(mcp, token: Optional[BzmToken]):
@@ -94,6 +128,7 @@ def register(mcp, token: Optional[BzmToken]):
                 - read: Read a workspace. Get the detailed information of a workspace.
                     args(dict): Dictionary with the following required parameters:
                         workspace_id (int): The id of the workspace.
+                        refresh (bool, default=False): Read it again from BlazeMeter instead of the copy cached in the last minutes.
                 - list: List all workspaces. 
                     args(dict): Dictionary with the following required parameters:
                         account_id (int): The id of the account to list the workspaces from
@@ -103,10 +138,16 @@ def register(mcp, token: Optional[BzmToken]):
                     args(dict): Dictionary with the following required parameters:
                         workspace_id (int): The id of the workspace.
                         purpose (str, default="load", valid=["load", "functional", "grid", "mock"]): The purpose filter.
+                    args(dict): Dictionary with the following optional filters:
+                        min_threads_per_engine (int, default=0): Only locations supporting at least this concurrency per engine.
+                        min_engines (int, default=0): Only locations supporting at least this amount of engines.
+                        private_only (bool, default=False): Only private locations.
+                        refresh (bool, default=False): The locations are cached for 5 minutes, use it to get them again from BlazeMeter.
                 Hints:
                 - For available locations and available billing usage use the 'read' action for a particular workspace.
                 """
     )
+    @instrument_tool(f"{TOOLS_PREFIX}_workspaces", ("read", "list", "read_locations"))
     async def workspace(
             action: str = Field(description="The action id to execute"),
             args: Dict[str, Any] = Field(description="Dictionary with parameters"),
@@ -117,12 +158,16 @@ def register(mcp, token: Optional[BzmToken]):
         try:
             match action:
                 case "read":
-                    return await workspace_manager.read(args["workspace_id"])
+                    return await workspace_manager.read(args["workspace_id"], args.get("refresh", False))
                 case "list":
                     return await workspace_manager.list(args["account_id"], args.get("limit", 50),
                                                         args.get("offset", 0))
                 case "read_locations":
-                    return await workspace_manager.read_locations(args["workspace_id"], args.get("purpose", "load"))
+                    return await workspace_manager.read_locations(args["workspace_id"], args.get("purpose", "load"),
+                                                                  args.get("min_threads_per_engine", 0),
+                                                                  args.get("min_engines", 0),
+                                                                  args.get("private_only", False),
+                                                                  args.get("refresh", False))
                 case _:
                     return BaseResult(
                         error=f"Action {action} not found in workspace manager tool"